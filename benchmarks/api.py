@@ -0,0 +1,603 @@
+# backend/benchmarks/api.py
+#
+# API 부하 테스트입니다. 임시 SQLite(또는 --database-url 로 지정한 로컬 PostgreSQL) DB 에
+# 프로필 규모의 사용자·숙소·항공편·예약을 채운 뒤, FastAPI 앱을 같은 프로세스에서
+# httpx.AsyncClient(ASGITransport) 로 동시 호출해 엔드포인트별 p50/p95/p99 와 처리량을 잽니다.
+# 네트워크와 uvicorn 을 거치지 않으므로 앱·DB 코드의 변화만 드러납니다.
+#
+#   python -m benchmarks.api --profile small                       # 측정만
+#   python -m benchmarks.api --profile small --save-baseline       # benchmarks/baselines/small.json 갱신
+#   python -m benchmarks.api --profile small --compare             # 기준선보다 느려지면 종료 코드 1 (CI)
+#   python -m benchmarks.api --profile large --db /tmp/large.db --reuse   # 채운 DB 재사용
+#
+# 기준선 비교는 p95 가 --tolerance 배율과 --min-delta-ms 를 모두 넘게 늘었거나, 처리량이
+# 같은 배율 이상 줄었을 때 회귀로 봅니다. 기준선은 같은 종류의 머신에서 만든 것과 비교하세요.
+# 5xx 응답이 난 시나리오가 하나라도 있으면 기준선을 저장하지 않고 종료 코드 1 입니다.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+PROFILES = {
+    "small": {
+        "users": 2_000,
+        "accommodations": 5_000,
+        "flights": 20_000,
+        "accommodation_bookings": 200_000,
+        "flight_bookings": 100_000,
+    },
+    "medium": {
+        "users": 20_000,
+        "accommodations": 20_000,
+        "flights": 100_000,
+        "accommodation_bookings": 1_000_000,
+        "flight_bookings": 500_000,
+    },
+    "large": {
+        "users": 100_000,
+        "accommodations": 50_000,
+        "flights": 300_000,
+        "accommodation_bookings": 3_000_000,
+        "flight_bookings": 1_000_000,
+    },
+}
+
+AIRPORTS = 20
+SCHEDULE_DAYS = 60
+BENCH_PASSWORD = "benchmark-password"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--db", help="SQLite 파일 경로 (--reuse 와 함께 재사용)")
+    parser.add_argument(
+        "--reuse", action="store_true", help="DB 에 데이터가 있으면 채우지 않음"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=300, help="엔드포인트별 요청 수"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--only", nargs="+", help="이 이름으로 시작하는 시나리오만 실행"
+    )
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument(
+        "--baseline", help="기본값: benchmarks/baselines/<profile>.json"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # config.Settings 는 import 시점에 환경 변수를 읽으므로 앱 모듈보다 먼저 설정합니다.
+    if args.database_url:
+        url = args.database_url
+    else:
+        path = os.path.abspath(args.db) if args.db else None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="trip-api-bench-", suffix=".db")
+            os.close(fd)
+            os.unlink(path)
+        url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    # 측정 대상이 아닌 느린 SQL 경고 로그가 결과 출력을 가리지 않게 합니다.
+    os.environ.setdefault("SQL_SLOW_QUERY_MS", "60000")
+    return url
+
+
+def prepare_working_directory():
+    # 앱은 배포 환경(Dockerfile)처럼 저장소가 backend/ 로 놓인 상위 디렉터리에서 실행된다고 가정하고
+    # backend/templates, static 을 상대 경로로 찾습니다. 그 배치가 아니면 임시 디렉터리에 맞춰 줍니다.
+    sys.path.insert(0, str(REPO_DIR))
+    if (Path.cwd() / "backend" / "templates").is_dir():
+        return
+    if REPO_DIR.name == "backend":
+        os.chdir(REPO_DIR.parent)
+        return
+    workdir = Path(tempfile.mkdtemp(prefix="trip-api-bench-"))
+    (workdir / "backend").symlink_to(REPO_DIR)
+    (workdir / "static").symlink_to(REPO_DIR / "static")
+    os.chdir(workdir)
+
+
+# --- 데이터 준비 ---
+def flight_booking_rows(count: int, users: int, flights: int, seed: int = 13):
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield {
+            "id": i,
+            "booking_date": date(2025, 5, 1) + timedelta(days=rng.randint(0, 30)),
+            "status": rng.choice(("pending", "confirmed", "confirmed", "cancelled")),
+            "user_id": rng.randint(1, users),
+            "flight_id": rng.randint(1, flights),
+        }
+
+
+def seed_database(volumes: dict, reuse: bool):
+    from sqlalchemy import select, update
+    from sqlalchemy.orm import Session
+
+    import database
+    import migrations
+    import models
+    import rollups
+    import security
+    from benchmarks.common import (
+        accommodation_booking_rows,
+        insert_chunked,
+        seed_catalog,
+    )
+    from benchmarks.itineraries import synthetic_schedule
+
+    engine = database.engine
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        if reuse and db.scalar(select(models.User.id).limit(1)) is not None:
+            return False
+
+    started = time.perf_counter()
+    seed_catalog(engine, volumes["users"], volumes["accommodations"])
+    insert_chunked(
+        engine,
+        models.Flight.__table__,
+        (
+            leg._asdict()
+            for leg in synthetic_schedule(volumes["flights"], AIRPORTS, SCHEDULE_DAYS)
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.AccommodationBooking.__table__,
+        accommodation_booking_rows(
+            volumes["accommodation_bookings"],
+            volumes["users"],
+            volumes["accommodations"],
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.FlightBooking.__table__,
+        flight_booking_rows(
+            volumes["flight_bookings"], volumes["users"], volumes["flights"]
+        ),
+    )
+    with engine.begin() as connection:
+        migrations.fill_booking_prices(connection)
+    with Session(engine) as db:
+        # 1번은 일반 사용자, 2번은 관리자로 로그인해 사용합니다.
+        hashed = security.get_password_hash(BENCH_PASSWORD)
+        for user_id, role in ((1, "user"), (2, "admin")):
+            db.execute(
+                update(models.User)
+                .where(models.User.id == user_id)
+                .values(hashed_password=hashed, role=role)
+            )
+        rollups.rebuild(db)
+        db.commit()
+    print(f"seeded {volumes} in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+# --- 시나리오 ---
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: Callable[[random.Random], str]
+    # None | "login" | "user" | "admin" | "user_cookie" | "admin_cookie"
+    auth: Optional[str] = None
+    body: Optional[Callable[[random.Random], dict]] = None
+    # 실제로 동시에 몰리지 않는 엔드포인트(로그인 해싱, 관리자 일괄 작업)의 동시 요청 수 상한
+    max_concurrency: Optional[int] = None
+    # --requests 에 곱할 비율 (느린 엔드포인트의 실행 시간을 줄입니다)
+    weight: float = 1.0
+
+
+def _day(rng: random.Random, start: date, days: int) -> date:
+    return start + timedelta(days=rng.randrange(days))
+
+
+def build_scenarios(volumes: dict) -> List[Scenario]:
+    accommodations = volumes["accommodations"]
+    flights = volumes["flights"]
+    airports = [f"A{i:02d}" for i in range(AIRPORTS)]
+    schedule_start = date(2025, 6, 1)
+
+    def stay(rng):
+        check_in = _day(rng, date(2024, 1, 1), 700)
+        return check_in, check_in + timedelta(days=rng.randint(1, 7))
+
+    def search_by_dates(rng):
+        check_in, check_out = stay(rng)
+        return f"/api/accommodations/?check_in={check_in}&check_out={check_out}"
+
+    def availability(rng):
+        check_in, check_out = stay(rng)
+        return (
+            f"/api/accommodations/{rng.randint(1, accommodations)}/availability"
+            f"?from={check_in}&to={check_out}"
+        )
+
+    def itineraries(rng):
+        origin, destination = rng.sample(airports, 2)
+        day = _day(rng, schedule_start, SCHEDULE_DAYS - 2)
+        return (
+            f"/api/flights/itineraries?origin={origin}&destination={destination}"
+            f"&departure_date={day}"
+        )
+
+    def flight_window(rng):
+        start = datetime.combine(
+            _day(rng, schedule_start, SCHEDULE_DAYS), datetime.min.time()
+        )
+        return (
+            f"/api/flights/summary?origin={rng.choice(airports)}"
+            f"&departure_from={start.isoformat()}"
+            f"&departure_to={(start + timedelta(days=1)).isoformat()}"
+        )
+
+    def future_stay(rng):
+        # 예약 데이터가 없는 먼 미래라 대부분 성공합니다. (겹치면 409)
+        check_in = _day(rng, date(2030, 1, 1), 3_650)
+        return {
+            "start_date": str(check_in),
+            "end_date": str(check_in + timedelta(days=rng.randint(1, 3))),
+        }
+
+    def export_window(rng):
+        start = _day(rng, date(2024, 1, 1), 700)
+        return f"/api/admin/bookings/export?from={start}&to={start + timedelta(days=2)}"
+
+    def status_batch(rng):
+        ids = rng.sample(range(1, volumes["accommodation_bookings"] + 1), 100)
+        return {"status": "confirmed", "bookings": [{"id": i} for i in ids]}
+
+    return [
+        # accommodations
+        Scenario(
+            "accommodations.list",
+            "GET",
+            lambda r: f"/api/accommodations/?skip={r.randrange(0, 1000)}&limit=20",
+        ),
+        Scenario(
+            "accommodations.summary",
+            "GET",
+            lambda r: f"/api/accommodations/summary?limit=50&sort=price&min_price={r.randrange(30_000, 400_000, 10_000)}",
+        ),
+        Scenario(
+            "accommodations.search_text",
+            "GET",
+            lambda r: f"/api/accommodations/summary?q={r.choice(['서울', '부산', '제주', 'stay'])}&limit=20",
+        ),
+        Scenario("accommodations.search_dates", "GET", search_by_dates),
+        Scenario(
+            "accommodations.detail",
+            "GET",
+            lambda r: f"/api/accommodations/{r.randint(1, accommodations)}",
+        ),
+        Scenario("accommodations.availability", "GET", availability),
+        # flights
+        Scenario(
+            "flights.list",
+            "GET",
+            lambda r: f"/api/flights/?limit=20&skip={r.randrange(0, 1000)}",
+        ),
+        Scenario("flights.summary", "GET", flight_window),
+        Scenario(
+            "flights.detail", "GET", lambda r: f"/api/flights/{r.randint(1, flights)}"
+        ),
+        Scenario("flights.itineraries", "GET", itineraries),
+        # bookings
+        Scenario(
+            "bookings.my_bookings",
+            "GET",
+            lambda r: "/api/bookings/my-bookings",
+            auth="user",
+        ),
+        Scenario(
+            "bookings.itinerary",
+            "GET",
+            lambda r: "/api/bookings/itinerary?limit=100",
+            auth="user",
+        ),
+        Scenario(
+            "bookings.create_accommodation",
+            "POST",
+            lambda r: f"/api/bookings/accommodations/{r.randint(1, accommodations)}",
+            auth="user",
+            body=future_stay,
+        ),
+        Scenario(
+            "bookings.create_flight",
+            "POST",
+            lambda r: f"/api/bookings/flights/{r.randint(1, flights)}",
+            auth="user",
+            body=lambda r: {"booking_date": str(date.today())},
+        ),
+        # auth / users (비밀번호 해싱 풀 크기에 맞춰 동시성을 제한합니다)
+        Scenario(
+            "auth.token",
+            "POST",
+            lambda r: "/api/token",
+            auth="login",
+            max_concurrency=2,
+            weight=0.1,
+        ),
+        Scenario(
+            "users.create",
+            "POST",
+            lambda r: "/api/users/",
+            body=lambda r: {
+                "email": f"bench-{r.getrandbits(64):x}@example.com",
+                "password": "pw-benchmark",
+            },
+            max_concurrency=2,
+            weight=0.1,
+        ),
+        # admin API
+        Scenario(
+            "admin.users",
+            "GET",
+            lambda r: f"/api/admin/users?skip={r.randrange(0, 1000)}&limit=50",
+            auth="admin",
+        ),
+        Scenario(
+            "admin.bookings",
+            "GET",
+            lambda r: f"/api/admin/bookings?skip={r.randrange(0, 10_000)}&limit=100",
+            auth="admin",
+        ),
+        Scenario(
+            "admin.bookings_status",
+            "POST",
+            lambda r: "/api/admin/bookings/status",
+            auth="admin",
+            body=status_batch,
+            max_concurrency=4,
+        ),
+        Scenario("admin.bookings_export", "GET", export_window, auth="admin"),
+        Scenario(
+            "admin.stats_status",
+            "GET",
+            lambda r: "/api/admin/stats/bookings-by-status",
+            auth="admin",
+        ),
+        Scenario(
+            "admin.stats_revenue",
+            "GET",
+            lambda r: "/api/admin/stats/revenue?from=2024-06-01&to=2024-07-01",
+            auth="admin",
+        ),
+        Scenario(
+            "admin.stats_occupancy",
+            "GET",
+            lambda r: "/api/admin/stats/occupancy?from=2024-06-01&to=2024-07-01",
+            auth="admin",
+        ),
+        Scenario(
+            "admin.stats_routes",
+            "GET",
+            lambda r: "/api/admin/stats/routes?from=2025-06-01&to=2025-07-01",
+            auth="admin",
+        ),
+        # HTML pages (쿠키 인증)
+        Scenario("pages.home", "GET", lambda r: "/", auth="user_cookie"),
+        Scenario(
+            "pages.my_bookings", "GET", lambda r: "/my-bookings", auth="user_cookie"
+        ),
+        Scenario(
+            "admin_pages.dashboard",
+            "GET",
+            lambda r: "/admin/dashboard",
+            auth="admin_cookie",
+        ),
+        Scenario(
+            "admin_pages.bookings",
+            "GET",
+            lambda r: "/admin/bookings",
+            auth="admin_cookie",
+        ),
+    ]
+
+
+# --- 실행 ---
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(q * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+async def run_scenario(client, scenario: Scenario, headers: dict, args, rng) -> dict:
+    concurrency = min(args.concurrency, scenario.max_concurrency or args.concurrency)
+    total = max(int(args.requests * scenario.weight), 10)
+    warmup = min(5, total)
+    samples, statuses, cache_hits = [], {}, 0
+    remaining = total + warmup
+
+    async def one():
+        path = scenario.path(rng)
+        kwargs = {"headers": headers}
+        if scenario.auth == "login":
+            kwargs["data"] = {
+                "username": "user1@example.com",
+                "password": BENCH_PASSWORD,
+            }
+        elif scenario.body is not None:
+            kwargs["json"] = scenario.body(rng)
+        started = time.perf_counter()
+        response = await client.request(scenario.method, path, **kwargs)
+        return (time.perf_counter() - started) * 1000, response
+
+    async def worker():
+        nonlocal remaining, cache_hits
+        while remaining > 0:
+            remaining -= 1
+            is_warmup = remaining >= total
+            elapsed_ms, response = await one()
+            if is_warmup:
+                continue
+            samples.append(elapsed_ms)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            cache_hits += response.headers.get("x-cache") == "HIT"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    samples.sort()
+    errors = sum(count for code, count in statuses.items() if code >= 500)
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "rps": round(len(samples) / wall, 1) if wall else 0.0,
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "cache_hit_ratio": round(cache_hits / len(samples), 3) if samples else 0.0,
+    }
+
+
+async def run(args, volumes: dict) -> dict:
+    import httpx
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import security
+    from main import app
+
+    with Session(database.engine) as db:
+        users = {
+            role: db.get(models.User, user_id)
+            for role, user_id in (("user", 1), ("admin", 2))
+        }
+    tokens = {
+        role: security.create_user_access_token(user) for role, user in users.items()
+    }
+    auth_headers = {
+        None: {},
+        "login": {},
+        "user": {"Authorization": f"Bearer {tokens['user']}"},
+        "admin": {"Authorization": f"Bearer {tokens['admin']}"},
+        "user_cookie": {"Cookie": f'access_token="Bearer {tokens["user"]}"'},
+        "admin_cookie": {"Cookie": f'access_token="Bearer {tokens["admin"]}"'},
+    }
+
+    scenarios = build_scenarios(volumes)
+    if args.only:
+        scenarios = [s for s in scenarios if s.name.startswith(tuple(args.only))]
+
+    rng = random.Random(args.seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            print(
+                f"{'scenario':<32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                f"{'rps':>8} {'5xx':>5} {'hit':>5}"
+            )
+            for scenario in scenarios:
+                result = await run_scenario(
+                    client, scenario, auth_headers[scenario.auth], args, rng
+                )
+                results[scenario.name] = result
+                print(
+                    f"{scenario.name:<32} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+                    f"{result['p99_ms']:>8} {result['rps']:>8} {result['errors']:>5} "
+                    f"{result['cache_hit_ratio']:>5}"
+                )
+    return results
+
+
+# --- 기준선 ---
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float):
+    regressions = []
+    for name, base in baseline["results"].items():
+        current = results.get(name)
+        if current is None:
+            continue
+        p95_delta = current["p95_ms"] - base["p95_ms"]
+        if p95_delta > min_delta_ms and current["p95_ms"] > base["p95_ms"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+        if base["rps"] and current["rps"] < base["rps"] / (1 + tolerance):
+            regressions.append(f"{name}: rps {base['rps']} -> {current['rps']}")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(
+                f"{name}: 5xx {base.get('errors', 0)} -> {current['errors']}"
+            )
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    url = configure_environment(args)
+    prepare_working_directory()
+    volumes = PROFILES[args.profile]
+    seed_database(volumes, args.reuse)
+
+    results = asyncio.run(run(args, volumes))
+    report = {
+        "profile": args.profile,
+        "volumes": volumes,
+        "database": url.split(":", 1)[0],
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "python": sys.version.split()[0],
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    failed = [name for name, result in results.items() if result["errors"]]
+    if failed:
+        print(f"5xx 응답이 난 시나리오: {', '.join(failed)}")
+        sys.exit(1)
+
+    baseline_path = Path(args.baseline or BASELINE_DIR / f"{args.profile}.json")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+        )
+        print(f"기준선을 저장했습니다: {baseline_path}")
+    if args.compare:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("기준선 대비 회귀:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"기준선({baseline_path.name}) 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
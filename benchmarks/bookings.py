@@ -0,0 +1,308 @@
+# backend/benchmarks/bookings.py
+#
+# 예약 API 동시성 테스트입니다. 수천 건의 숙소/항공권 예약을 동시에 보내고, 처리량·지연 시간과 함께
+# 결과가 올바른지 검사합니다. 검사에 실패하면 종료 코드 1 입니다.
+#   - 일부 예약은 같은 Idempotency-Key 로 여러 번(동시에) 보냅니다. 타임아웃 뒤 재시도하는 클라이언트입니다.
+#     → 같은 키의 응답은 모두 같은 예약이어야 하고, 예약은 키당 한 건만 생겨야 합니다.
+#   - 일부 숙소·기간(hot slot)에는 서로 다른 사용자가 한꺼번에 몰립니다.
+#     → 슬롯마다 정확히 한 건만 성공하고 나머지는 409 여야 합니다.
+#   - 새로 생긴 숙소 예약끼리 기간이 겹치지 않아야 하고, 롤업 상태 집계가 실제 예약 수와 같아야 합니다.
+#
+#   python -m benchmarks.bookings                                  # 임시 SQLite
+#   python -m benchmarks.bookings --bookings 5000 --concurrency 256 --retry-rate 0.5
+#   python -m benchmarks.bookings --database-url postgresql://localhost/trip_bench
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+from benchmarks.api import (
+    AIRPORTS,
+    SCHEDULE_DAYS,
+    configure_environment,
+    percentile,
+    prepare_working_directory,
+)
+
+USERS = 500
+ACCOMMODATIONS = 1_000
+FLIGHTS = 2_000
+# 일반 예약은 이 날짜 이후, hot slot 은 그 전 날짜를 써서 서로 겹치지 않게 합니다.
+NORMAL_START = date(2040, 1, 1)
+HOT_START = date(2039, 1, 1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--db", help="SQLite 파일 경로")
+    parser.add_argument(
+        "--bookings", type=int, default=3_000, help="서로 다른 예약(키) 수"
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--retry-rate", type=float, default=0.3, help="같은 키로 다시 보내는 예약 비율"
+    )
+    parser.add_argument(
+        "--hot-slots", type=int, default=20, help="여러 사용자가 몰리는 숙소·기간 수"
+    )
+    parser.add_argument("--hot-contenders", type=int, default=10)
+    parser.add_argument(
+        "--flight-share", type=float, default=0.4, help="항공권 예약 비율"
+    )
+    parser.add_argument("--seed", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+# --- 데이터 준비 ---
+def seed_database():
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import rollups
+    from benchmarks.common import insert_chunked, seed_catalog
+    from benchmarks.itineraries import synthetic_schedule
+
+    engine = database.engine
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        if db.scalar(select(func.count(models.User.id))):
+            raise SystemExit("빈 DB 에서 실행하세요. (--db 로 새 파일 경로를 지정)")
+    seed_catalog(engine, USERS, ACCOMMODATIONS)
+    insert_chunked(
+        engine,
+        models.Flight.__table__,
+        (leg._asdict() for leg in synthetic_schedule(FLIGHTS, AIRPORTS, SCHEDULE_DAYS)),
+    )
+    with Session(engine) as db:
+        rollups.rebuild(db)
+        db.commit()
+
+
+def issue_tokens() -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import security
+
+    with Session(database.engine) as db:
+        users = db.scalars(select(models.User)).all()
+        return {user.id: security.create_user_access_token(user) for user in users}
+
+
+# --- 작업 목록 ---
+class Booking(NamedTuple):
+    key: str
+    user_id: int
+    path: str
+    body: dict
+    # 같은 키로 보낼 횟수 (1 = 재시도 없음)
+    copies: int
+    # hot slot 번호 (없으면 None)
+    slot: Optional[int] = None
+
+
+def build_workload(args, rng: random.Random) -> List[Booking]:
+    bookings = []
+    normal = 0
+    for i in range(args.bookings):
+        copies = 1 + (rng.randint(1, 3) if rng.random() < args.retry_rate else 0)
+        user_id = rng.randint(1, USERS)
+        if rng.random() < args.flight_share:
+            path = f"/api/bookings/flights/{rng.randint(1, FLIGHTS)}"
+            body = {"booking_date": str(NORMAL_START + timedelta(days=i % 365))}
+        else:
+            # 숙소마다 3일 간격으로 2박씩 배정해 일반 예약끼리는 겹치지 않습니다.
+            accommodation_id = normal % ACCOMMODATIONS + 1
+            start = NORMAL_START + timedelta(days=(normal // ACCOMMODATIONS) * 3)
+            normal += 1
+            path = f"/api/bookings/accommodations/{accommodation_id}"
+            body = {
+                "start_date": str(start),
+                "end_date": str(start + timedelta(days=2)),
+            }
+        bookings.append(Booking(str(uuid.uuid4()), user_id, path, body, copies))
+
+    for slot in range(args.hot_slots):
+        start = HOT_START + timedelta(days=slot * 3)
+        body = {"start_date": str(start), "end_date": str(start + timedelta(days=2))}
+        path = f"/api/bookings/accommodations/{slot % ACCOMMODATIONS + 1}"
+        for user_id in rng.sample(range(1, USERS + 1), args.hot_contenders):
+            bookings.append(
+                Booking(str(uuid.uuid4()), user_id, path, body, copies=1, slot=slot)
+            )
+    return bookings
+
+
+# --- 실행 ---
+async def fire(args, bookings: List[Booking], tokens: dict):
+    import httpx
+
+    from main import app
+
+    requests = [
+        (booking, copy) for booking in bookings for copy in range(booking.copies)
+    ]
+    random.Random(args.seed).shuffle(requests)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # 예약(키)별 응답 [(상태 코드, 예약 id, 재생 여부)]
+    responses = defaultdict(list)
+    latencies = defaultdict(list)
+
+    async def send(client, booking: Booking):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                booking.path,
+                json=booking.body,
+                headers={
+                    "Authorization": f"Bearer {tokens[booking.user_id]}",
+                    "Idempotency-Key": booking.key,
+                },
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        kind = "flight" if "/flights/" in booking.path else "accommodation"
+        latencies[kind].append(elapsed_ms)
+        booking_id = None
+        if response.status_code == 200:
+            booking_id = response.json()["id"]
+        responses[booking.key].append(
+            (
+                response.status_code,
+                booking_id,
+                response.headers.get("idempotent-replayed") == "true",
+            )
+        )
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(send(client, booking) for booking, _ in requests))
+            wall = time.perf_counter() - started
+    return responses, latencies, wall, len(requests)
+
+
+# --- 검사 ---
+def verify(bookings: List[Booking], responses: dict) -> List[str]:
+    from sqlalchemy import and_, func, select
+    from sqlalchemy.orm import Session, aliased
+
+    import crud
+    import database
+    import models
+
+    problems = []
+    created = {"accommodation": set(), "flight": set()}
+    slot_winners = Counter()
+    for booking in bookings:
+        results = responses[booking.key]
+        ids = {booking_id for status, booking_id, _ in results if status == 200}
+        statuses = {status for status, _, _ in results}
+        if len(statuses) > 1 or len(ids) > 1:
+            problems.append(f"키 {booking.key}: 응답이 서로 다릅니다 {results}")
+        if any(status >= 500 for status in statuses):
+            problems.append(f"키 {booking.key}: 서버 오류 {results}")
+        kind = "flight" if "/flights/" in booking.path else "accommodation"
+        created[kind].update(ids)
+        if booking.slot is not None and ids:
+            slot_winners[booking.slot] += 1
+        elif booking.slot is None and statuses != {200}:
+            problems.append(f"키 {booking.key}: 성공해야 할 예약이 실패 {results}")
+    for slot, winners in slot_winners.items():
+        if winners != 1:
+            problems.append(f"hot slot {slot}: 성공한 예약 {winners}건 (1건이어야 함)")
+
+    with Session(database.engine) as db:
+        counts = {
+            "accommodation": db.scalar(
+                select(func.count(models.AccommodationBooking.id))
+            ),
+            "flight": db.scalar(select(func.count(models.FlightBooking.id))),
+        }
+        for kind, ids in created.items():
+            # 시드 데이터에는 예약이 없으므로 DB 의 예약 수 = 성공한 키 수여야 합니다.
+            if counts[kind] != len(ids):
+                problems.append(
+                    f"{kind} 예약 {counts[kind]}건, 성공한 키 {len(ids)}개 (중복 예약)"
+                )
+        keys = db.scalar(select(func.count()).select_from(models.IdempotencyKey))
+        if keys != sum(len(ids) for ids in created.values()):
+            problems.append(f"저장된 Idempotency-Key {keys}개가 성공 수와 다릅니다")
+
+        a, b = models.AccommodationBooking, aliased(models.AccommodationBooking)
+        overlaps = db.scalar(
+            select(func.count()).where(
+                and_(
+                    a.accommodation_id == b.accommodation_id,
+                    a.id < b.id,
+                    a.start_date < b.end_date,
+                    b.start_date < a.end_date,
+                )
+            )
+        )
+        if overlaps:
+            problems.append(f"기간이 겹치는 숙소 예약 {overlaps}쌍")
+
+        rollup = {
+            row.kind: row.count
+            for row in crud.get_booking_status_counts(db)
+            if row.status == "pending"
+        }
+        for kind in ("accommodation", "flight"):
+            if rollup.get(kind, 0) != counts[kind]:
+                problems.append(
+                    f"롤업 {kind} pending {rollup.get(kind, 0)} != 예약 {counts[kind]}"
+                )
+    return problems
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+    prepare_working_directory()
+    seed_database()
+    tokens = issue_tokens()
+
+    bookings = build_workload(args, random.Random(args.seed))
+    responses, latencies, wall, sent = asyncio.run(fire(args, bookings, tokens))
+
+    statuses = Counter(
+        status for results in responses.values() for status, _, _ in results
+    )
+    replayed = sum(replay for results in responses.values() for _, _, replay in results)
+    print(
+        f"{sent} requests ({len(bookings)} keys) in {wall:.2f}s = {sent / wall:.0f} rps, "
+        f"concurrency {args.concurrency}"
+    )
+    for kind, samples in sorted(latencies.items()):
+        samples.sort()
+        print(
+            f"  {kind:<14} n={len(samples):<6} p50 {percentile(samples, 0.50):.1f}ms "
+            f"p95 {percentile(samples, 0.95):.1f}ms p99 {percentile(samples, 0.99):.1f}ms"
+        )
+    print(f"  statuses {dict(sorted(statuses.items()))}, replayed {replayed}")
+
+    problems = verify(bookings, responses)
+    if problems:
+        print(f"검사 실패 {len(problems)}건:")
+        for line in problems[:20]:
+            print(f"  {line}")
+        sys.exit(1)
+    print("검사 통과: 중복 예약·겹치는 기간·롤업 불일치 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# backend/benchmarks/common.py
+#
+# 벤치마크 스크립트들이 공유하는 준비 코드입니다.
+# 저장소 루트에서 `python -m benchmarks.<이름>` 으로 실행합니다.
+# 실제 운영 DB 를 건드리지 않도록 각 벤치마크는 임시 SQLite 파일에 자체 엔진을 만듭니다.
+
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+from datetime import date, timedelta
+
+# config.Settings 는 필수 환경 변수가 없으면 import 에 실패하므로 벤치마크용 기본값을 채웁니다.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import models  # noqa: E402
+
+CHUNK_SIZE = 50_000
+
+
+def make_engine(path: str = None):
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="trip-bench-", suffix=".db")
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def insert_chunked(engine, table, rows):
+    # executemany 로 CHUNK_SIZE 행씩 넣습니다. rows 는 제너레이터여도 됩니다.
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            with engine.begin() as conn:
+                conn.execute(insert(table), chunk)
+            chunk = []
+    if chunk:
+        with engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+
+
+def random_word(rng: random.Random, length: int = 8) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+LOCATIONS = [
+    "서울 강남구",
+    "서울 마포구",
+    "부산 해운대구",
+    "제주 서귀포시",
+    "강릉 경포",
+    "경주 황리단길",
+]
+
+
+def seed_catalog(engine, users: int, accommodations: int, seed: int = 42):
+    rng = random.Random(seed)
+    insert_chunked(
+        engine,
+        models.User.__table__,
+        (
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "hashed_password": "x",
+                "role": "user",
+            }
+            for i in range(1, users + 1)
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.Accommodation.__table__,
+        (
+            {
+                "id": i,
+                "name": f"{random_word(rng)} stay",
+                "location": rng.choice(LOCATIONS),
+                "price": rng.randrange(30_000, 500_000, 1_000),
+                "description": f"{random_word(rng, 12)} {random_word(rng, 6)}",
+                "owner_id": rng.randint(1, users),
+            }
+            for i in range(1, accommodations + 1)
+        ),
+    )
+
+
+def accommodation_booking_rows(
+    count: int, users: int, accommodations: int, start_id: int = 1, seed: int = 7
+):
+    rng = random.Random(seed + start_id)
+    base = date(2024, 1, 1)
+    for i in range(start_id, start_id + count):
+        start = base + timedelta(days=rng.randint(0, 730))
+        yield {
+            "id": i,
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(1, 7)),
+            "status": rng.choice(("pending", "confirmed", "confirmed", "cancelled")),
+            "user_id": rng.randint(1, users),
+            "accommodation_id": rng.randint(1, accommodations),
+        }
+
+
+def measure(fn, repeat: int = 20, warmup: int = 3) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
@@ -0,0 +1,87 @@
+# backend/benchmarks/itineraries.py
+#
+# 합성 운항 스케줄(기본 10만+ 편)로 여정 검색 그래프의 적재 시간과 검색 처리량을 측정합니다.
+# DB 없이 itinerary.RouteGraph 만 사용합니다.
+#
+#   python -m benchmarks.itineraries --flights 150000 --airports 60 --searches 2000
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import measure
+
+import itinerary  # noqa: E402
+
+
+def synthetic_schedule(flights: int, airports: int, days: int, seed: int = 1):
+    rng = random.Random(seed)
+    codes = [f"A{i:02d}" for i in range(airports)]
+    # 허브 공항 몇 곳에 운항이 몰리는 실제 스케줄 형태를 흉내 냅니다.
+    weights = [8 if i < 5 else 1 for i in range(airports)]
+    start = datetime(2025, 6, 1)
+    for flight_id in range(1, flights + 1):
+        origin, destination = rng.choices(codes, weights=weights, k=2)
+        while destination == origin:
+            destination = rng.choices(codes, weights=weights)[0]
+        departure = start + timedelta(minutes=rng.randrange(days * 24 * 60 // 5) * 5)
+        yield itinerary.Leg(
+            departure_time=departure,
+            id=flight_id,
+            departure_airport=origin,
+            arrival_airport=destination,
+            arrival_time=departure + timedelta(minutes=rng.randint(50, 720)),
+            price=rng.randrange(50_000, 900_000, 1_000),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=150_000)
+    parser.add_argument("--airports", type=int, default=60)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--searches", type=int, default=2_000)
+    parser.add_argument("--max-stops", type=int, default=2)
+    args = parser.parse_args()
+
+    legs = list(synthetic_schedule(args.flights, args.airports, args.days))
+    graph = itinerary.RouteGraph()
+    started = time.perf_counter()
+    graph.load(legs)
+    print(f"load: {len(graph)} flights in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(2)
+    codes = [f"A{i:02d}" for i in range(args.airports)]
+    queries = []
+    for _ in range(args.searches):
+        origin, destination = rng.sample(codes, 2)
+        day = datetime(2025, 6, 1) + timedelta(days=rng.randrange(args.days - 2))
+        queries.append((origin, destination, day, day + timedelta(days=1)))
+
+    found = 0
+    started = time.perf_counter()
+    for origin, destination, earliest, latest in queries:
+        result = graph.search(
+            origin, destination, earliest, latest, max_stops=args.max_stops
+        )
+        found += bool(result["cheapest"])
+    elapsed = time.perf_counter() - started
+    print(
+        f"search: {args.searches} queries in {elapsed:.2f}s "
+        f"({args.searches / elapsed:.0f} queries/s, {found} with results)"
+    )
+
+    # 증분 반영 비용 (create_flight 한 건당)
+    extra = iter(synthetic_schedule(1_000, args.airports, args.days, seed=99))
+
+    def add_one():
+        leg = next(extra)
+        graph.add_flight(leg._replace(id=leg.id + args.flights))
+
+    stats = measure(add_one, repeat=500, warmup=10)
+    print(f"add_flight: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# backend/benchmarks/list_serialization.py
+#
+# 숙소·항공편 목록 응답을 만드는 두 경로의 지연 시간을 비교합니다. (SQL + 직렬화, 캐시 없이)
+#   - orm:  crud.get_accommodations / get_flights 의 ORM 객체를 TypeAdapter 로 from_attributes 검증 후 dump_json
+#   - rows: crud.get_accommodation_rows / get_flight_rows 의 dict 를 response_cache.dump_json 으로 바로 직렬화
+# 두 경로의 JSON 이 같은지도 확인하며, 다르면 종료 코드 1 입니다.
+#
+#   python -m benchmarks.list_serialization
+#   python -m benchmarks.list_serialization --limit 500 --bookings-per-item 50
+#   python -m benchmarks.list_serialization --no-orjson    # pydantic_core.to_json 으로 직렬화
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import List
+
+from benchmarks.common import (
+    accommodation_booking_rows,
+    insert_chunked,
+    make_engine,
+    measure,
+    seed_catalog,
+)
+
+from pydantic import TypeAdapter  # noqa: E402
+
+import crud  # noqa: E402
+import models  # noqa: E402
+import response_cache  # noqa: E402
+import schemas  # noqa: E402
+
+USERS = 1_000
+AIRPORTS = ("ICN", "GMP", "PUS", "CJU", "NRT", "KIX", "HND", "TPE")
+
+
+def flight_rows(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    base = datetime(2040, 1, 1, 6, 0)
+    for i in range(1, count + 1):
+        departure = base + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        origin, destination = rng.sample(AIRPORTS, 2)
+        yield {
+            "id": i,
+            "departure_airport": origin,
+            "arrival_airport": destination,
+            "departure_time": departure,
+            "arrival_time": departure + timedelta(minutes=rng.randint(50, 600)),
+            "price": rng.randrange(50_000, 1_500_000, 1_000),
+        }
+
+
+def flight_booking_rows(count: int, flights: int, seed: int = 5):
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        held = rng.random() < 0.3
+        yield {
+            "id": i,
+            "booking_date": date(2039, 1, 1) + timedelta(days=rng.randint(0, 364)),
+            "status": "pending" if held else rng.choice(("confirmed", "cancelled")),
+            "user_id": rng.randint(1, USERS),
+            "flight_id": rng.randint(1, flights),
+            "fare_class": "economy" if held else None,
+            "hold_expires_at": (
+                datetime(2039, 6, 1, 12, 0, 0, rng.randint(0, 999_999))
+                if held
+                else None
+            ),
+        }
+
+
+def normalized(body: bytes) -> list:
+    # selectinload 는 예약 순서를 보장하지 않으므로 id 순으로 맞춰 비교합니다.
+    items = json.loads(body)
+    for item in items:
+        if "bookings" in item:
+            item["bookings"].sort(key=lambda booking: booking["id"])
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--items", type=int, default=5_000, help="숙소·항공편 각각의 수"
+    )
+    parser.add_argument("--bookings-per-item", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100, help="한 페이지 행 수")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--no-orjson", action="store_true")
+    args = parser.parse_args()
+    if args.no_orjson:
+        response_cache.orjson = None
+
+    engine, Session = make_engine()
+    seed_catalog(engine, users=USERS, accommodations=args.items)
+    insert_chunked(
+        engine,
+        models.AccommodationBooking.__table__,
+        accommodation_booking_rows(
+            args.items * args.bookings_per_item, users=USERS, accommodations=args.items
+        ),
+    )
+    insert_chunked(engine, models.Flight.__table__, flight_rows(args.items))
+    insert_chunked(
+        engine,
+        models.FlightBooking.__table__,
+        flight_booking_rows(args.items * args.bookings_per_item, flights=args.items),
+    )
+
+    cases = [
+        (
+            "accommodations",
+            crud.get_accommodations,
+            crud.get_accommodation_rows,
+            TypeAdapter(List[schemas.Accommodation]),
+            {},
+        ),
+        (
+            "accommodations/summary",
+            crud.get_accommodations,
+            crud.get_accommodation_rows,
+            TypeAdapter(List[schemas.AccommodationSummary]),
+            {"include_bookings": False},
+        ),
+        (
+            "flights",
+            crud.get_flights,
+            crud.get_flight_rows,
+            TypeAdapter(List[schemas.Flight]),
+            {},
+        ),
+        (
+            "flights/summary",
+            crud.get_flights,
+            crud.get_flight_rows,
+            TypeAdapter(List[schemas.FlightSummary]),
+            {"include_bookings": False},
+        ),
+    ]
+
+    encoder = "pydantic_core" if response_cache.orjson is None else "orjson"
+    print(
+        f"{args.items} items x {args.bookings_per_item} bookings each, "
+        f"page of {args.limit}, encoder {encoder}"
+    )
+    print(f"{'endpoint':>24} | {'path':>4} | {'p50 ms':>8} | {'p95 ms':>8} | bytes")
+    mismatches = []
+    with Session() as db:
+        for name, get_objects, get_rows, adapter, options in cases:
+            # 라우터 기본값과 같이 정렬 키 순서로 두 번째 페이지를 읽습니다.
+            filters = dict(options, skip=args.limit, limit=args.limit)
+
+            def orm_path():
+                db.expunge_all()
+                items = get_objects(db, **filters)
+                return adapter.dump_json(
+                    adapter.validate_python(items, from_attributes=True)
+                )
+
+            def rows_path():
+                return response_cache.dump_json(get_rows(db, **filters))
+
+            orm_body, rows_body = orm_path(), rows_path()
+            if normalized(orm_body) != normalized(rows_body):
+                mismatches.append(name)
+            for path, fn, body in (
+                ("orm", orm_path, orm_body),
+                ("rows", rows_path, rows_body),
+            ):
+                stats = measure(fn, repeat=args.repeat)
+                print(
+                    f"{name:>24} | {path:>4} | {stats['p50_ms']:>8} | "
+                    f"{stats['p95_ms']:>8} | {len(body)}"
+                )
+
+    if mismatches:
+        print(f"검사 실패: 두 경로의 응답이 다릅니다: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("검사 통과: 두 경로의 응답이 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# backend/benchmarks/my_bookings.py
+#
+# '내 예약' 조회의 쿼리 수와 지연 시간을 예약 수별로 비교합니다.
+#   - separate: 숙소/항공권 예약을 따로 읽고 행마다 숙소·항공편 관계를 따라가는 기존 방식
+#   - itinerary: crud.get_user_itinerary (UNION ALL 한 번)
+# itinerary 의 쿼리 수가 예약 수와 관계없이 1 이 아니면 종료 코드 1 로 끝납니다.
+#
+#   python -m benchmarks.my_bookings --sizes 1 10 100 1000
+
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from benchmarks.common import insert_chunked, make_engine, measure, seed_catalog
+
+import crud  # noqa: E402
+import models  # noqa: E402
+
+
+def seed_user_bookings(engine, user_id: int, count: int, flights: int, seed: int = 3):
+    rng = random.Random(seed + user_id)
+    base = date(2025, 1, 1)
+    accommodation_rows, flight_rows = [], []
+    for i in range(count):
+        start = base + timedelta(days=rng.randint(0, 365))
+        if i % 2:
+            flight_rows.append(
+                {
+                    "booking_date": start - timedelta(days=30),
+                    "status": "confirmed",
+                    "user_id": user_id,
+                    "flight_id": rng.randint(1, flights),
+                }
+            )
+        else:
+            accommodation_rows.append(
+                {
+                    "start_date": start,
+                    "end_date": start + timedelta(days=rng.randint(1, 5)),
+                    "status": "confirmed",
+                    "user_id": user_id,
+                    "accommodation_id": rng.randint(1, 500),
+                }
+            )
+    insert_chunked(engine, models.AccommodationBooking.__table__, accommodation_rows)
+    insert_chunked(engine, models.FlightBooking.__table__, flight_rows)
+
+
+def seed_flights(engine, count: int, seed: int = 5):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, count + 1):
+        departure = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(525_600))
+        rows.append(
+            {
+                "id": i,
+                "departure_airport": "ICN",
+                "arrival_airport": rng.choice(("NRT", "PVG", "BKK", "SFO")),
+                "departure_time": departure,
+                "arrival_time": departure + timedelta(hours=rng.randint(2, 12)),
+                "price": rng.randrange(100_000, 1_500_000, 1_000),
+            }
+        )
+    insert_chunked(engine, models.Flight.__table__, rows)
+
+
+def separate(db, user_id: int):
+    # 기존 화면과 같은 접근: 두 번 조회한 뒤 행마다 관계를 읽습니다.
+    accommodation_bookings = (
+        db.query(models.AccommodationBooking)
+        .filter(models.AccommodationBooking.user_id == user_id)
+        .all()
+    )
+    flight_bookings = (
+        db.query(models.FlightBooking)
+        .filter(models.FlightBooking.user_id == user_id)
+        .all()
+    )
+    for booking in accommodation_bookings:
+        booking.accommodation.name
+    for booking in flight_bookings:
+        booking.flight.departure_airport
+    return accommodation_bookings, flight_bookings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine, Session = make_engine()
+    seed_catalog(engine, users=len(args.sizes), accommodations=500)
+    seed_flights(engine, 2_000)
+    for user_id, size in enumerate(args.sizes, start=1):
+        seed_user_bookings(engine, user_id, size, flights=2_000)
+
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *a, **kw: statements.append(a[2])
+    )
+
+    itinerary_counts = set()
+    print(
+        f"{'bookings':>8} {'approach':>10} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for user_id, size in enumerate(args.sizes, start=1):
+        for name, fn in (
+            ("separate", separate),
+            ("itinerary", lambda db, uid: crud.get_user_itinerary(db, uid, limit=None)),
+        ):
+            with Session() as db:
+                statements.clear()
+                result = fn(db, user_id)
+                queries = len(statements)
+
+            def run():
+                with Session() as db:
+                    fn(db, user_id)
+
+            stats = measure(run, repeat=args.repeat)
+            if name == "itinerary":
+                itinerary_counts.add(queries)
+                assert len(result) == size, (len(result), size)
+            print(
+                f"{size:>8} {name:>10} {queries:>8} "
+                f"{stats['p50_ms']:>8} {stats['p95_ms']:>8}"
+            )
+
+    if itinerary_counts != {1}:
+        print(f"itinerary 쿼리 수가 일정하지 않습니다: {sorted(itinerary_counts)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# backend/benchmarks/outbox.py
+#
+# 예약 후처리 큐(outbox.py) 테스트입니다. 느리고 가끔 실패하는 후처리 핸들러(메일 발송 흉내)를 등록한 채
+# 예약 수천 건을 동시에 보내고, 예약 응답 지연 시간이 후처리 비용과 무관한지, 그리고 모든 예약의
+# 이벤트가 재시도를 거쳐 결국 전달되는지 확인합니다. 검사에 실패하면 종료 코드 1 입니다.
+#
+#   python -m benchmarks.outbox                                   # 임시 SQLite, 핸들러 이벤트당 5ms, 실패율 10%
+#   python -m benchmarks.outbox --handler-ms 50 --failure-rate 0.3
+#   python -m benchmarks.outbox --workers 0                       # 후처리 없이 (p99 비교 기준)
+#
+# --handler-ms 를 바꿔 가며 돌려도 예약 p99 는 거의 같아야 하고, 늘어나는 것은 drain 시간뿐입니다.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from benchmarks.api import configure_environment, percentile, prepare_working_directory
+from benchmarks.bookings import build_workload, issue_tokens, seed_database
+
+# 전부 끝날 때까지 기다리는 최대 시간(초)
+DRAIN_TIMEOUT = 300
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--db", help="SQLite 파일 경로")
+    parser.add_argument("--bookings", type=int, default=3_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2, help="OUTBOX_WORKERS")
+    parser.add_argument(
+        "--handler-ms", type=float, default=5.0, help="이벤트 하나당 후처리 시간"
+    )
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.1, help="핸들러 호출이 실패할 확률"
+    )
+    parser.add_argument("--flight-share", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+    # benchmarks.bookings 의 작업 목록을 그대로 쓰되, 같은 키 재시도와 hot slot 은 뺍니다.
+    args.retry_rate, args.hot_slots, args.hot_contenders = 0.0, 0, 0
+    return args
+
+
+def install_handlers(args, delivered: Counter):
+    import outbox
+
+    rng = random.Random(args.seed)
+
+    async def slow_handler(events):
+        await asyncio.sleep(args.handler_ms / 1000 * len(events))
+        if rng.random() < args.failure_rate:
+            raise ConnectionError("downstream unavailable")
+        for item in events:
+            delivered[(item.topic, item.payload["id"])] += 1
+
+    for topic in (outbox.ACCOMMODATION_BOOKING_CREATED, outbox.FLIGHT_BOOKING_CREATED):
+        outbox.handler(topic)(slow_handler)
+
+
+async def run(args, bookings, tokens):
+    import httpx
+    from sqlalchemy import func, select
+
+    import database
+    import models
+    import outbox
+    from main import app
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = Counter()
+    created = set()
+
+    async def send(client, booking):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                booking.path,
+                json=booking.body,
+                headers={"Authorization": f"Bearer {tokens[booking.user_id]}"},
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            topic = (
+                outbox.FLIGHT_BOOKING_CREATED
+                if "/flights/" in booking.path
+                else outbox.ACCOMMODATION_BOOKING_CREATED
+            )
+            created.add((topic, response.json()["id"]))
+
+    async def remaining() -> int:
+        async with database.AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).select_from(models.OutboxEvent))
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    drain = None
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(send(client, booking) for booking in bookings))
+            wall = time.perf_counter() - started
+        if args.workers:
+            # 예약이 끝난 뒤 남은 이벤트를 모두 처리할 때까지 기다립니다.
+            while await remaining() and time.perf_counter() - started < DRAIN_TIMEOUT:
+                await asyncio.sleep(0.05)
+            drain = time.perf_counter() - started
+        stats = outbox.pool.stats()
+    return latencies, statuses, created, wall, drain, stats, await remaining()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+    os.environ["OUTBOX_WORKERS"] = str(args.workers)
+    # 재시도를 벤치마크 시간 안에 끝내도록 백오프와 확인 주기를 줄입니다.
+    os.environ["OUTBOX_RETRY_BASE_SECONDS"] = "0.05"
+    os.environ["OUTBOX_RETRY_MAX_SECONDS"] = "1"
+    os.environ["OUTBOX_POLL_SECONDS"] = "0.2"
+    os.environ["SEAT_HOLD_SWEEP_SECONDS"] = "0"
+    prepare_working_directory()
+    seed_database()
+    tokens = issue_tokens()
+
+    delivered = Counter()
+    install_handlers(args, delivered)
+    bookings = build_workload(args, random.Random(args.seed))
+    latencies, statuses, created, wall, drain, stats, left = asyncio.run(
+        run(args, bookings, tokens)
+    )
+
+    latencies.sort()
+    print(
+        f"{len(bookings)} bookings in {wall:.2f}s = {len(bookings) / wall:.0f} rps, "
+        f"concurrency {args.concurrency}, outbox workers {args.workers}, "
+        f"handler {args.handler_ms}ms/event, failure rate {args.failure_rate}"
+    )
+    print(
+        f"  booking p50 {percentile(latencies, 0.50):.1f}ms "
+        f"p95 {percentile(latencies, 0.95):.1f}ms p99 {percentile(latencies, 0.99):.1f}ms, "
+        f"statuses {dict(sorted(statuses.items()))}"
+    )
+    problems = []
+    if any(status >= 500 for status in statuses):
+        problems.append("서버 오류 응답이 있습니다.")
+    if args.workers:
+        duplicates = sum(1 for count in delivered.values() if count > 1)
+        print(
+            f"  outbox drained {drain:.2f}s after start: delivered {len(delivered)}, "
+            f"duplicates {duplicates}, stats {stats}"
+        )
+        missing = created - delivered.keys()
+        if missing:
+            problems.append(f"전달되지 않은 예약 이벤트 {len(missing)}건")
+        if left:
+            problems.append(f"outbox 에 남은 이벤트 {left}건 (failed 포함)")
+    elif left != len(created):
+        problems.append(f"기록된 이벤트 {left}건 != 생성된 예약 {len(created)}건")
+    if problems:
+        print(f"검사 실패 {len(problems)}건:")
+        for line in problems:
+            print(f"  {line}")
+        sys.exit(1)
+    print("검사 통과: 모든 예약 이벤트가 전달됨")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# backend/benchmarks/pagination.py
+#
+# crud.get_all_accommodation_bookings 로 깊은 페이지를 읽을 때 OFFSET 과 키셋(커서) 방식의
+# 지연 시간을 비교합니다.
+#
+#   python -m benchmarks.pagination --bookings 1000000 --page 1000 --limit 100
+
+import argparse
+
+from benchmarks.common import (
+    accommodation_booking_rows,
+    insert_chunked,
+    make_engine,
+    measure,
+    seed_catalog,
+)
+
+import crud  # noqa: E402
+import models  # noqa: E402
+import pagination  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine, Session = make_engine()
+    seed_catalog(engine, users=1_000, accommodations=5_000)
+    insert_chunked(
+        engine,
+        models.AccommodationBooking.__table__,
+        accommodation_booking_rows(args.bookings, users=1_000, accommodations=5_000),
+    )
+
+    skip = (args.page - 1) * args.limit
+    with Session() as db:
+        # 키셋 방식은 직전 페이지 마지막 행의 커서를 들고 다음 페이지를 요청합니다.
+        previous = crud.get_all_accommodation_bookings(db, skip=skip - 1, limit=1)
+        cursor = pagination.encode_cursor("id", [previous[0].id])
+
+        def by_offset():
+            db.expunge_all()
+            return crud.get_all_accommodation_bookings(db, skip=skip, limit=args.limit)
+
+        def by_cursor():
+            db.expunge_all()
+            return crud.get_all_accommodation_bookings(
+                db, cursor=cursor, limit=args.limit
+            )
+
+        assert [b.id for b in by_offset()] == [b.id for b in by_cursor()]
+        results = {
+            "offset": measure(by_offset, repeat=args.repeat),
+            "keyset": measure(by_cursor, repeat=args.repeat),
+        }
+
+    print(f"page {args.page} (limit {args.limit}) of {args.bookings} bookings")
+    for name, stats in results.items():
+        print(f"{name:>7}: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
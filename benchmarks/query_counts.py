@@ -0,0 +1,230 @@
+# backend/benchmarks/query_counts.py
+#
+# 목록 API 의 SQL 문장 수 회귀 검사입니다. 사용자·숙소·항공편·예약 행 수를 단계별로 늘려 가며
+# 각 목록 엔드포인트를 한 페이지에 모든 행이 담기도록 호출하고, 요청 하나가 실행한 문장 수를 셉니다.
+# 관계를 행마다 따로 읽는(N+1) 코드가 들어오면 행 수에 따라 문장 수가 늘어나므로,
+# 엔드포인트별 문장 수가 단계마다 같지 않으면 종료 코드 1 입니다.
+#
+#   python -m benchmarks.query_counts
+#   python -m benchmarks.query_counts --sizes 10 100 1000 --bookings-per-item 5
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from benchmarks.api import configure_environment, prepare_working_directory
+
+ENDPOINTS = (
+    "/api/accommodations/",
+    "/api/accommodations/summary",
+    "/api/flights/",
+    "/api/flights/summary",
+    "/api/admin/users",
+    "/api/admin/bookings",
+)
+AIRPORTS = ("ICN", "GMP", "PUS", "CJU", "NRT", "KIX")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--db", help="SQLite 파일 경로")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500],
+        help="단계별 사용자·숙소·항공편 수",
+    )
+    parser.add_argument("--bookings-per-item", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=17)
+    return parser.parse_args(argv)
+
+
+# --- 데이터 준비 ---
+def grow_database(previous: int, size: int, bookings_per_item: int, rng):
+    """id previous+1 ~ size 의 사용자·숙소·항공편과 그 예약을 추가합니다."""
+    import database
+    import models
+    from benchmarks.common import insert_chunked
+
+    engine = database.engine
+    new_ids = range(previous + 1, size + 1)
+    insert_chunked(
+        engine,
+        models.User.__table__,
+        (
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "hashed_password": "x",
+                # 1번 사용자로 관리자 API 를 호출합니다.
+                "role": "admin" if i == 1 else "user",
+            }
+            for i in new_ids
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.Accommodation.__table__,
+        (
+            {
+                "id": i,
+                "name": f"stay {i}",
+                "location": "서울 강남구",
+                "price": rng.randrange(30_000, 500_000, 1_000),
+                "description": None,
+                "owner_id": rng.randint(1, size),
+            }
+            for i in new_ids
+        ),
+    )
+    departures = {
+        i: datetime(2040, 1, 1) + timedelta(minutes=rng.randrange(525_600))
+        for i in new_ids
+    }
+    insert_chunked(
+        engine,
+        models.Flight.__table__,
+        (
+            {
+                "id": i,
+                "departure_airport": rng.choice(AIRPORTS),
+                "arrival_airport": rng.choice(AIRPORTS),
+                "departure_time": departures[i],
+                "arrival_time": departures[i] + timedelta(hours=2),
+                "price": rng.randrange(50_000, 1_500_000, 1_000),
+            }
+            for i in new_ids
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.AccommodationBooking.__table__,
+        (
+            {
+                "start_date": date(2040, 1, 1) + timedelta(days=n * 10),
+                "end_date": date(2040, 1, 3) + timedelta(days=n * 10),
+                "status": "confirmed",
+                "user_id": rng.randint(1, size),
+                "accommodation_id": i,
+            }
+            for i in new_ids
+            for n in range(bookings_per_item)
+        ),
+    )
+    insert_chunked(
+        engine,
+        models.FlightBooking.__table__,
+        (
+            {
+                "booking_date": date(2039, 12, 1),
+                "status": "confirmed",
+                "user_id": rng.randint(1, size),
+                "flight_id": i,
+            }
+            for i in new_ids
+            for _ in range(bookings_per_item)
+        ),
+    )
+
+
+def admin_token() -> str:
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import security
+
+    with Session(database.engine) as db:
+        return security.create_user_access_token(db.get(models.User, 1))
+
+
+# --- 실행 ---
+async def count_statements(args) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    import database
+    import models
+    import response_cache
+    from main import app
+
+    statements = []
+
+    def record(conn, cursor, statement, *rest):
+        statements.append(statement)
+
+    # 읽기 복제본을 쓰지 않으면 두 엔진이 같은 객체입니다.
+    engines = {
+        database.async_engine.sync_engine,
+        database.async_read_engine.sync_engine,
+    }
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+
+    rng = random.Random(args.seed)
+    counts = defaultdict(dict)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            previous = 0
+            for size in args.sizes:
+                models.Base.metadata.create_all(database.engine)
+                grow_database(previous, size, args.bookings_per_item, rng)
+                previous = size
+                headers = {"Authorization": f"Bearer {admin_token()}"}
+                for path in ENDPOINTS:
+                    # 한 페이지에 모든 행이 담기도록 합니다. (admin/bookings 는 숙소 예약 수)
+                    params = {"limit": size * max(args.bookings_per_item, 1)}
+                    # 인증 정보 캐시를 채우고, 응답 캐시는 비워서 DB 를 거치게 합니다.
+                    await client.get(path, params=params, headers=headers)
+                    response_cache.backend.bump(
+                        [response_cache.ACCOMMODATIONS, response_cache.FLIGHTS]
+                    )
+                    statements.clear()
+                    response = await client.get(path, params=params, headers=headers)
+                    if response.status_code != 200:
+                        raise SystemExit(
+                            f"{path}: HTTP {response.status_code} {response.text[:200]}"
+                        )
+                    counts[path][size] = (len(statements), len(response.json()))
+    return counts
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+    # 백그라운드 작업의 쿼리가 섞이지 않게 합니다.
+    os.environ["OUTBOX_WORKERS"] = "0"
+    os.environ["SEAT_HOLD_SWEEP_SECONDS"] = "0"
+    prepare_working_directory()
+
+    counts = asyncio.run(count_statements(args))
+
+    print(f"{'endpoint':>28} | " + " | ".join(f"{size:>12}" for size in args.sizes))
+    regressions = []
+    for path in ENDPOINTS:
+        cells = [
+            f"{counts[path][size][0]:>3}q / {counts[path][size][1]:>5}r"
+            for size in args.sizes
+        ]
+        print(f"{path:>28} | " + " | ".join(f"{cell:>12}" for cell in cells))
+        if len({counts[path][size][0] for size in args.sizes}) != 1:
+            regressions.append(path)
+    if regressions:
+        print(
+            f"검사 실패: 행 수에 따라 SQL 문장 수가 늘어납니다: {', '.join(regressions)}"
+        )
+        sys.exit(1)
+    print("검사 통과: 모든 목록 엔드포인트의 SQL 문장 수가 행 수와 무관합니다.")
+
+
+if __name__ == "__main__":
+    main()
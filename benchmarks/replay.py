@@ -0,0 +1,277 @@
+# backend/benchmarks/replay.py
+#
+# capture.py 형식(JSONL)으로 캡처한 요청을 원래 순서와 간격대로 다시 보내 운영 부하 모양을 재현합니다.
+# 기본은 main.app 을 같은 프로세스에서 httpx.ASGITransport 로 호출하고, --base-url 을 주면 실행 중인
+# 서버로 보냅니다. 결과는 라우트 템플릿별 p50/p95/p99·처리량이며 benchmarks.api 와 같은 JSON
+# 형식이라 --save-baseline / --compare 로 스키마·쿼리 변경 전후를 비교할 수 있습니다.
+#
+#   python -m benchmarks.replay captures/2025-10-01.jsonl --db ./staging-copy.db \
+#       --user-email user1@example.com --admin-email admin@example.com --speedup 10 --concurrency 64
+#
+#   --speedup 1 은 캡처된 간격 그대로, 10 은 10배 빠르게, 0 은 간격 없이 최대한 빨리 보냅니다.
+#   --duration 초가 지나면 멈추고, --loop 를 주면 그때까지 파일을 반복합니다.
+# 인증이 필요한 요청은 캡처에 토큰이 없으므로 --user-email / --admin-email 사용자로 새로 발급해 보냅니다.
+# (/api/admin, /admin 경로는 관리자, 나머지는 일반 사용자)
+# 쓰기 요청도 그대로 재생하므로 운영 DB 가 아닌 복사본에 실행하세요.
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.api import (
+    BASELINE_DIR,
+    compare,
+    configure_environment,
+    percentile,
+    prepare_working_directory,
+)
+
+ADMIN_PREFIXES = ("/api/admin", "/admin")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("capture", help="capture.py 형식의 JSONL 파일")
+    parser.add_argument("--database-url")
+    parser.add_argument("--db", help="SQLite 파일 경로")
+    parser.add_argument("--base-url", help="지정하면 실행 중인 서버로 보냅니다.")
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, help="최대 실행 시간(초)")
+    parser.add_argument("--loop", action="store_true")
+    parser.add_argument("--user-email")
+    parser.add_argument("--admin-email")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument(
+        "--baseline", help="기본값: benchmarks/baselines/replay-<파일명>.json"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    if not args.database_url and not args.db and not args.base_url:
+        parser.error("--db, --database-url, --base-url 중 하나가 필요합니다.")
+    if args.loop and not args.duration:
+        parser.error("--loop 는 --duration 과 함께 써야 합니다.")
+    return args
+
+
+def issue_tokens(user_email: Optional[str], admin_email: Optional[str]) -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import security
+
+    tokens = {}
+    with Session(database.engine) as db:
+        for role, email in (("user", user_email), ("admin", admin_email)):
+            if not email:
+                continue
+            user = db.scalar(select(models.User).where(models.User.email == email))
+            if user is None:
+                raise SystemExit(f"사용자를 찾을 수 없습니다: {email}")
+            tokens[role] = security.create_user_access_token(user)
+    return tokens
+
+
+def build_request(record: dict, tokens: dict) -> dict:
+    headers = {}
+    if record.get("content_type"):
+        headers["content-type"] = record["content_type"]
+    role = "admin" if record["path"].startswith(ADMIN_PREFIXES) else "user"
+    token = tokens.get(role)
+    if token and record.get("auth") == "bearer":
+        headers["authorization"] = f"Bearer {token}"
+    elif token and record.get("auth") == "cookie":
+        headers["cookie"] = f'access_token="Bearer {token}"'
+    # 같은 키로 캡처된 재시도는 원래처럼 저장된 응답으로 돌아옵니다.
+    if record.get("idempotency_key"):
+        headers["idempotency-key"] = record["idempotency_key"]
+    url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+    content = record.get("body")
+    return {
+        "method": record["method"],
+        "url": url,
+        "headers": headers,
+        "content": content.encode() if content is not None else None,
+    }
+
+
+class RouteStats:
+    def __init__(self):
+        self.samples: List[float] = []
+        self.captured: List[float] = []
+        self.statuses: Dict[int, int] = {}
+
+    def add(self, elapsed_ms: float, status: int, captured_ms: Optional[float]):
+        self.samples.append(elapsed_ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if captured_ms is not None:
+            self.captured.append(captured_ms)
+
+    def report(self, wall: float) -> dict:
+        samples = sorted(self.samples)
+        captured = sorted(self.captured)
+        return {
+            "requests": len(samples),
+            "p50_ms": round(percentile(samples, 0.50), 3),
+            "p95_ms": round(percentile(samples, 0.95), 3),
+            "p99_ms": round(percentile(samples, 0.99), 3),
+            "rps": round(len(samples) / wall, 1) if wall else 0.0,
+            "errors": sum(c for code, c in self.statuses.items() if code >= 500),
+            "statuses": {str(code): c for code, c in sorted(self.statuses.items())},
+            # 캡처 당시(운영) 처리 시간 - 재생 결과와 나란히 비교하기 위한 값
+            "captured_p50_ms": round(percentile(captured, 0.50), 3),
+            "captured_p95_ms": round(percentile(captured, 0.95), 3),
+        }
+
+
+async def replay(args, records: List[dict], tokens: dict) -> dict:
+    import httpx
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=None)
+        lifespan = None
+    else:
+        from main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://replay",
+            timeout=None,
+        )
+        lifespan = app.router.lifespan_context(app)
+
+    stats: Dict[str, RouteStats] = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    tasks = set()
+    # 동시 실행 한도 때문에 예정보다 늦게 출발한 요청 수 (부하가 재현되지 않았다는 신호)
+    late = 0
+
+    async def send(record: dict):
+        request = build_request(record, tokens)
+        started = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599
+        finally:
+            semaphore.release()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        key = f"{record['method']} {record.get('route') or record['path']}"
+        stats.setdefault(key, RouteStats()).add(
+            elapsed_ms, status, record.get("duration_ms")
+        )
+
+    started = time.perf_counter()
+    deadline = started + args.duration if args.duration else None
+    try:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        first_ts = records[0].get("ts", 0)
+        span = records[-1].get("ts", 0) - first_ts
+        offset = 0.0
+        stopped = False
+        while not stopped:
+            for record in records:
+                if args.speedup > 0:
+                    ts = record.get("ts", 0) - first_ts
+                    delay = started + (offset + ts) / args.speedup - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                if deadline and time.perf_counter() >= deadline:
+                    stopped = True
+                    break
+                if semaphore.locked():
+                    late += 1
+                await semaphore.acquire()
+                task = asyncio.create_task(send(record))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if not args.loop:
+                break
+            # 다음 바퀴는 마지막 요청 직후부터 같은 간격으로 이어집니다.
+            offset += span + 0.001
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    wall = time.perf_counter() - started
+
+    results = {key: route.report(wall) for key, route in sorted(stats.items())}
+    return {"wall_seconds": round(wall, 3), "late_starts": late, "results": results}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    capture_path = Path(args.capture).resolve()
+    # 앱 설정(config)은 --base-url 로 보낼 때도 import 되므로 환경을 똑같이 맞춥니다.
+    url = configure_environment(args)
+    prepare_working_directory()
+
+    import capture
+
+    records = list(capture.read_records(str(capture_path)))
+    if not records:
+        raise SystemExit(f"재생할 요청 기록이 없습니다: {capture_path}")
+    # --base-url 이면 원격 서버와 같은 SECRET_KEY/DB 를 --db·환경 변수로 맞춰야 토큰이 통합니다.
+    tokens = issue_tokens(args.user_email, args.admin_email)
+
+    summary = asyncio.run(replay(args, records, tokens))
+    results = summary["results"]
+    print(
+        f"{'route':<58} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'rps':>7} {'5xx':>4} {'prod p95':>9}"
+    )
+    for key, result in results.items():
+        print(
+            f"{key[:58]:<58} {result['requests']:>6} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['p99_ms']:>8} {result['rps']:>7} "
+            f"{result['errors']:>4} {result['captured_p95_ms']:>9}"
+        )
+    print(
+        f"{len(records)} records, {summary['wall_seconds']}s, "
+        f"late starts: {summary['late_starts']}"
+    )
+
+    report = {
+        "capture": capture_path.name,
+        "target": args.base_url or url.split(":", 1)[0],
+        "speedup": args.speedup,
+        "concurrency": args.concurrency,
+        **summary,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    baseline_path = Path(
+        args.baseline or BASELINE_DIR / f"replay-{capture_path.stem}.json"
+    )
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+        )
+        print(f"기준선을 저장했습니다: {baseline_path}")
+    if args.compare:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("기준선 대비 회귀:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"기준선({baseline_path.name}) 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
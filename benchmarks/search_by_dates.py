@@ -0,0 +1,87 @@
+# backend/benchmarks/search_by_dates.py
+#
+# 날짜 조건 숙소 검색(crud.get_accommodations 의 NOT EXISTS anti-join)이
+# 예약 행 수가 늘어도 지연 시간이 거의 일정하게 유지되는지 확인합니다.
+# 첫 페이지에서 멈추면 탐색 비용이 가려지므로 기본값은 조건에 맞는 숙소 전체를 한 번에 읽습니다.
+# orm 은 목록 API(ORM 객체), rows 는 요약 API(Core 행) 경로로, rows 쪽이 탐색 비용에 더 가깝습니다.
+#
+#   python -m benchmarks.search_by_dates --accommodations 5000 --steps 10000,100000,1000000
+
+import argparse
+from datetime import date
+
+from benchmarks.common import (
+    accommodation_booking_rows,
+    insert_chunked,
+    make_engine,
+    measure,
+    seed_catalog,
+)
+
+import crud  # noqa: E402
+import models  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--accommodations", type=int, default=5_000)
+    parser.add_argument("--steps", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument(
+        "--limit", type=int, help="한 번에 읽는 숙소 수 (기본값: 전체 숙소 수)"
+    )
+    args = parser.parse_args()
+
+    limit = args.limit or args.accommodations
+    engine, Session = make_engine()
+    seed_catalog(engine, users=args.users, accommodations=args.accommodations)
+
+    check_in, check_out = date(2025, 3, 1), date(2025, 3, 4)
+    inserted = 0
+    print(
+        f"{'bookings':>10} | {'path':>4} | {'p50 ms':>8} | {'p95 ms':>8} | "
+        f"{'max ms':>8} | results"
+    )
+    for target in (int(step) for step in args.steps.split(",")):
+        insert_chunked(
+            engine,
+            models.AccommodationBooking.__table__,
+            accommodation_booking_rows(
+                target - inserted,
+                users=args.users,
+                accommodations=args.accommodations,
+                start_id=inserted + 1,
+            ),
+        )
+        inserted = target
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+        filters = dict(
+            check_in=check_in,
+            check_out=check_out,
+            max_price=300_000,
+            include_bookings=False,
+            limit=limit,
+        )
+        with Session() as db:
+            for path, search in (
+                ("orm", crud.get_accommodations),
+                ("rows", crud.get_accommodation_rows),
+            ):
+
+                def run():
+                    db.expunge_all()
+                    return search(db, **filters)
+
+                found = len(run())
+                stats = measure(run, repeat=args.repeat)
+                print(
+                    f"{inserted:>10} | {path:>4} | {stats['p50_ms']:>8} | "
+                    f"{stats['p95_ms']:>8} | {stats['max_ms']:>8} | {found}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# backend/benchmarks/seats.py
+#
+# 좌석 재고 경합 테스트입니다. 정원이 한정된 항공편 하나에 구매자 수천 명이 동시에 예약을 보내고,
+# 초당 좌석 예약 수(bookings/sec)와 지연 시간을 잰 뒤 초과 판매가 없는지 검사합니다.
+#   - 성공한 예약 일부는 확정(confirm)하고 일부는 취소(cancel)해 좌석이 재고로 돌아오는 경로도 함께 돕니다.
+#   - 마지막으로 남은 보류를 만료시키고 스위퍼(seats.release_expired_holds)가 배치로 푸는 속도를 잽니다.
+#   - 검사: 재고 행이 음수가 아니고, 남은 좌석 + 살아 있는 예약 = 정원이며, 롤업 상태 집계가 실제와 같아야 합니다.
+# 검사에 실패하면 종료 코드 1 입니다.
+#
+#   python -m benchmarks.seats                                     # 임시 SQLite
+#   python -m benchmarks.seats --buyers 5000 --capacity 1000 --shards 1   # shard 수에 따른 차이
+#   python -m benchmarks.seats --database-url postgresql://localhost/trip_bench
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from benchmarks.api import configure_environment, percentile, prepare_working_directory
+
+USERS = 500
+FARE_CLASS = "economy"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--db", help="SQLite 파일 경로")
+    parser.add_argument("--buyers", type=int, default=3_000, help="예약 요청 수")
+    parser.add_argument("--capacity", type=int, default=1_000, help="항공편 정원")
+    parser.add_argument("--shards", type=int, help="재고 행 수 (SEAT_INVENTORY_SHARDS)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--confirm-rate", type=float, default=0.5, help="성공한 예약 중 확정 비율"
+    )
+    parser.add_argument(
+        "--cancel-rate", type=float, default=0.1, help="성공한 예약 중 취소 비율"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+# --- 데이터 준비 ---
+def seed_database(capacity: int) -> int:
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import seats
+    from benchmarks.common import seed_catalog
+
+    engine = database.engine
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        if db.scalar(select(func.count(models.User.id))):
+            raise SystemExit("빈 DB 에서 실행하세요. (--db 로 새 파일 경로를 지정)")
+    seed_catalog(engine, USERS, 0)
+    with Session(engine) as db:
+        departure = datetime(2040, 1, 1, 9, 0)
+        flight = models.Flight(
+            departure_airport="ICN",
+            arrival_airport="NRT",
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+            price=150_000,
+        )
+        db.add(flight)
+        db.flush()
+        seats.add_fare(db, flight.id, FARE_CLASS, capacity)
+        db.commit()
+        return flight.id
+
+
+def issue_tokens() -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import security
+
+    with Session(database.engine) as db:
+        users = db.scalars(select(models.User)).all()
+        return {user.id: security.create_user_access_token(user) for user in users}
+
+
+# --- 실행 ---
+async def fire(args, flight_id: int, tokens: dict):
+    import httpx
+
+    from main import app
+
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = Counter()
+    follow_ups = Counter()
+
+    async def buy(client, user_id: int):
+        headers = {"Authorization": f"Bearer {tokens[user_id]}"}
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                f"/api/bookings/flights/{flight_id}",
+                json={"booking_date": "2040-01-01", "fare_class": FARE_CLASS},
+                headers=headers,
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+            if response.status_code != 200:
+                return
+            # 결제하거나 마음을 바꿔 취소하는 구매자. 나머지는 보류 상태로 남습니다.
+            roll = rng.random()
+            if roll < args.confirm_rate:
+                action = "confirm"
+            elif roll < args.confirm_rate + args.cancel_rate:
+                action = "cancel"
+            else:
+                return
+            booking_id = response.json()["id"]
+            response = await client.post(
+                f"/api/bookings/flights/{booking_id}/{action}", headers=headers
+            )
+            follow_ups[(action, response.status_code)] += 1
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            users = [rng.randint(1, USERS) for _ in range(args.buyers)]
+            started = time.perf_counter()
+            await asyncio.gather(*(buy(client, user_id) for user_id in users))
+            wall = time.perf_counter() - started
+    return latencies, statuses, follow_ups, wall
+
+
+def sweep_expired_holds() -> tuple:
+    """남은 보류를 모두 만료시킨 뒤 스위퍼가 배치로 푸는 시간을 잽니다."""
+    from sqlalchemy import update
+    from sqlalchemy.orm import Session
+
+    import database
+    import models
+    import seats
+
+    with Session(database.engine) as db:
+        db.execute(
+            update(models.FlightBooking)
+            .where(models.FlightBooking.status == "pending")
+            .values(hold_expires_at=datetime(2000, 1, 1))
+        )
+        db.commit()
+
+    async def run():
+        released, batches = 0, 0
+        while True:
+            count = await seats.sweep_once()
+            if not count:
+                return released, batches
+            released += count
+            batches += 1
+
+    started = time.perf_counter()
+    released, batches = asyncio.run(run())
+    return released, batches, time.perf_counter() - started
+
+
+# --- 검사 ---
+def verify(flight_id: int, capacity: int) -> list:
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    import crud
+    import database
+    import models
+
+    problems = []
+    booking = models.FlightBooking
+    inventory = models.FlightSeatInventory
+    with Session(database.engine) as db:
+        negative = db.scalar(
+            select(func.count()).where(
+                inventory.flight_id == flight_id, inventory.available < 0
+            )
+        )
+        if negative:
+            problems.append(f"음수 재고 행 {negative}개")
+        available = db.scalar(
+            select(func.sum(inventory.available)).where(
+                inventory.flight_id == flight_id
+            )
+        )
+        active = db.scalar(
+            select(func.count()).where(
+                booking.flight_id == flight_id, booking.status != "cancelled"
+            )
+        )
+        if available + active != capacity:
+            problems.append(
+                f"남은 좌석 {available} + 살아 있는 예약 {active} != 정원 {capacity}"
+            )
+        if active > capacity:
+            problems.append(f"초과 판매: 예약 {active}건, 정원 {capacity}")
+        pending = db.scalar(select(func.count()).where(booking.status == "pending"))
+        if pending:
+            problems.append(f"스위퍼 후에도 보류 중인 예약 {pending}건")
+
+        actual = dict(
+            db.execute(
+                select(booking.status, func.count()).group_by(booking.status)
+            ).all()
+        )
+        rollup = {
+            row.status: row.count
+            for row in crud.get_booking_status_counts(db)
+            if row.kind == "flight"
+        }
+        if rollup != actual:
+            problems.append(f"롤업 상태 집계 {rollup} != 실제 {actual}")
+    return problems
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+    if args.shards:
+        os.environ["SEAT_INVENTORY_SHARDS"] = str(args.shards)
+    # 스위퍼는 마지막 단계에서 직접 돌려 시간을 잽니다.
+    os.environ["SEAT_HOLD_SWEEP_SECONDS"] = "0"
+    prepare_working_directory()
+    flight_id = seed_database(args.capacity)
+    tokens = issue_tokens()
+
+    from config import settings
+
+    latencies, statuses, follow_ups, wall = asyncio.run(fire(args, flight_id, tokens))
+    latencies.sort()
+    booked = statuses.get(200, 0)
+    print(
+        f"{args.buyers} buyers → capacity {args.capacity} "
+        f"({settings.SEAT_INVENTORY_SHARDS} shards), concurrency {args.concurrency}"
+    )
+    print(
+        f"  {wall:.2f}s: {booked / wall:.0f} bookings/s, {args.buyers / wall:.0f} rps, "
+        f"p50 {percentile(latencies, 0.50):.1f}ms p95 {percentile(latencies, 0.95):.1f}ms "
+        f"p99 {percentile(latencies, 0.99):.1f}ms"
+    )
+    print(f"  statuses {dict(sorted(statuses.items()))}")
+    print(f"  follow-ups {dict(sorted(follow_ups.items()))}")
+
+    released, batches, seconds = sweep_expired_holds()
+    if released:
+        print(
+            f"  sweeper: released {released} holds in {batches} batches, "
+            f"{seconds * 1000:.0f}ms ({released / seconds:.0f} holds/s)"
+        )
+
+    problems = verify(flight_id, args.capacity)
+    if any(status >= 500 for status in statuses) or any(
+        status >= 500 for _, status in follow_ups
+    ):
+        problems.append("서버 오류 응답이 있습니다.")
+    if problems:
+        print(f"검사 실패 {len(problems)}건:")
+        for line in problems:
+            print(f"  {line}")
+        sys.exit(1)
+    print("검사 통과: 초과 판매·음수 재고·롤업 불일치 없음")
+
+
+if __name__ == "__main__":
+    main()
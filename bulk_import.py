@@ -0,0 +1,356 @@
+# backend/bulk_import.py
+#
+# 항공편/숙소 대량 적재입니다. `python manage.py import-flights` 와 `POST /api/flights/bulk` 가 사용합니다.
+# 입력(CSV 또는 JSONL)을 레코드 단위로 읽어 스키마로 검증하고, chunk_size 행마다 executemany 한 번과
+# 커밋 한 번으로 씁니다. (SQLAlchemy 2 의 insertmanyvalues 로 여러 행 VALUES 문으로 묶여 전송됩니다)
+# 잘못된 행은 줄 번호와 함께 오류로 기록하고 나머지 적재는 계속합니다. 청크 INSERT 가 DB 오류로
+# 실패하면 그 청크만 한 행씩 다시 써서 문제 행을 골라냅니다.
+
+import codecs
+import csv
+import json
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud_async
+import itinerary
+import models
+import response_cache
+import schemas
+import search
+
+FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 5_000
+# 응답에 담는 오류 상세의 최대 개수 (개수 자체는 모두 셉니다)
+MAX_REPORTED_ERRORS = 1_000
+# 따옴표 안의 줄바꿈으로 이어지는 CSV 레코드 하나의 최대 줄 수. 닫히지 않은 따옴표 하나 때문에
+# 나머지 입력 전체를 메모리에 쌓지 않도록, 넘으면 시작 줄을 오류로 보고하고 그 다음 줄부터 다시 읽습니다.
+MAX_RECORD_LINES = 1_000
+
+
+def guess_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    content_type = (content_type or "").split(";")[0].strip()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl"):
+        return "jsonl"
+    if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+# --- 입력 파싱 ---
+class _LineFeed:
+    """RecordParser 가 줄을 채워 넣는 csv.reader 입력입니다.
+
+    비어 있으면 StopIteration 을 내지만 generator 와 달리 다시 채우면 이어서 읽히므로,
+    요청 본문처럼 조금씩 도착하는 입력도 csv.reader 하나로 끝까지 읽을 수 있습니다.
+    """
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+class RecordParser:
+    """텍스트 줄을 (줄 번호, dict) 로 바꿉니다. 해석할 수 없는 줄은 dict 대신 오류 메시지를 냅니다.
+
+    CSV 는 입력 전체를 csv.reader 하나로 읽으므로 따옴표 안의 줄바꿈도 한 값으로 유지되고,
+    줄 번호는 레코드가 시작하는 줄입니다. 줄은 줄바꿈 문자를 포함한 채로 넘겨야 합니다.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.line_no = 0
+        self._feed = _LineFeed()
+        self._reader = csv.reader(self._feed)
+        # 따옴표가 아직 닫히지 않은 CSV 레코드의 줄들 (레코드가 끝나면 한꺼번에 reader 에 넘깁니다)
+        self._partial: List[str] = []
+        self._quotes = 0
+        # reader 에 넘기지 않고 버린 줄 수. reader.line_num 에 더해 원래 줄 번호를 만듭니다.
+        self._skipped = 0
+
+    def parse(self, lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+        """입력 전체를 읽습니다."""
+        for line in lines:
+            yield from self.feed(line)
+        yield from self.close()
+
+    def feed(self, line: str) -> Iterator[Tuple[int, object]]:
+        """한 줄을 더 읽고, 그 줄로 끝난 레코드를 돌려줍니다."""
+        if self.fmt == "jsonl":
+            self.line_no += 1
+            yield from self._parse_json(line)
+            return
+        # reader 가 레코드 중간에서 입력 끝을 만나지 않도록 따옴표가 짝이 맞을 때만 넘깁니다.
+        self._partial.append(line)
+        self._quotes += line.count('"')
+        if self._quotes % 2 == 0:
+            yield from self._flush()
+        elif len(self._partial) > MAX_RECORD_LINES:
+            yield from self._skip_unclosed()
+
+    def close(self) -> Iterator[Tuple[int, object]]:
+        """입력이 끝났을 때 남은 줄을 마저 읽습니다."""
+        if self.fmt != "csv":
+            return
+        # 따옴표가 닫히지 않은 채 끝난 레코드는 시작 줄만 오류로 보고하고 나머지 줄을 다시 읽습니다.
+        while self._quotes % 2:
+            yield from self._skip_unclosed()
+        yield from self._flush()
+
+    def _skip_unclosed(self) -> Iterator[Tuple[int, object]]:
+        line_no = self._reader.line_num + self._skipped + 1
+        rest = self._partial[1:]
+        self._partial, self._quotes = [], 0
+        self._skipped += 1
+        yield line_no, "CSV 형식 오류: 따옴표가 닫히지 않았습니다."
+        for line in rest:
+            yield from self.feed(line)
+
+    def _parse_json(self, line: str) -> Iterator[Tuple[int, object]]:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield self.line_no, f"JSON 형식 오류: {exc}"
+            return
+        if not isinstance(record, dict):
+            yield self.line_no, "각 줄은 JSON 객체여야 합니다."
+            return
+        yield self.line_no, record
+
+    def _flush(self) -> Iterator[Tuple[int, object]]:
+        self._feed.lines.extend(self._partial)
+        self._partial, self._quotes = [], 0
+        while self._feed.lines:
+            line_no = self._reader.line_num + self._skipped + 1
+            try:
+                values = next(self._reader)
+            except csv.Error as exc:
+                yield line_no, f"CSV 형식 오류: {exc}"
+                continue
+            except StopIteration:
+                break
+            if not values or (len(values) == 1 and not values[0].strip()):
+                continue
+            if self.header is None:
+                self.header = [name.strip() for name in values]
+                continue
+            if len(values) != len(self.header):
+                yield line_no, (
+                    f"열 개수가 헤더와 다릅니다. ({len(values)} != {len(self.header)})"
+                )
+                continue
+            # 빈 칸은 None 으로 두어 선택 항목(description 등)이 빈 문자열로 들어가지 않게 합니다.
+            yield line_no, {
+                name: (value if value != "" else None)
+                for name, value in zip(self.header, values)
+            }
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """요청 본문 바이트 스트림을 UTF-8 텍스트 줄로 나눕니다. (줄바꿈 문자는 남겨 둡니다)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+# --- 검증 / 진행 상황 ---
+class BulkImport:
+    def __init__(
+        self,
+        schema: type,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        extra: Optional[dict] = None,
+    ):
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.extra = extra or {}
+        self.pending: List[Tuple[int, dict]] = []
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.started = time.perf_counter()
+
+    def add_error(self, line_no: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    def add(self, line_no: int, record) -> Optional[List[Tuple[int, dict]]]:
+        """행을 검증해 쌓고, 청크가 가득 차면 써야 할 청크를 돌려줍니다."""
+        if isinstance(record, str):
+            self.add_error(line_no, record)
+            return None
+        try:
+            row: BaseModel = self.schema.model_validate(record)
+        except ValidationError as exc:
+            self.add_error(line_no, _format_validation_error(exc))
+            return None
+        self.pending.append((line_no, {**row.model_dump(), **self.extra}))
+        if len(self.pending) >= self.chunk_size:
+            return self.take()
+        return None
+
+    def take(self) -> List[Tuple[int, dict]]:
+        chunk, self.pending = self.pending, []
+        return chunk
+
+    def record(self, result: Tuple[int, List[dict]]):
+        written, errors = result
+        self.inserted += written
+        for error in errors:
+            self.add_error(error["line"], error["error"])
+
+    def report(self) -> dict:
+        seconds = time.perf_counter() - self.started
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.inserted / seconds, 1) if seconds else 0.0,
+            "errors": self.errors,
+        }
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+# --- 쓰기 (동기 Session; 비동기 경로에서는 run_sync 로 호출) ---
+def _write_chunk(
+    db: Session,
+    chunk: List[Tuple[int, dict]],
+    write: Callable[[Session, List[dict]], None],
+) -> Tuple[int, List[dict]]:
+    if not chunk:
+        return 0, []
+    try:
+        write(db, [row for _, row in chunk])
+        db.commit()
+        return len(chunk), []
+    except DBAPIError:
+        db.rollback()
+
+    # 청크 전체가 실패하면 한 행씩 다시 써서 실패한 행만 골라냅니다.
+    written, errors = 0, []
+    for line_no, row in chunk:
+        try:
+            write(db, [row])
+            db.commit()
+            written += 1
+        except DBAPIError as exc:
+            db.rollback()
+            errors.append({"line": line_no, "error": str(exc.orig)})
+    return written, errors
+
+
+def _insert_flights(db: Session, rows: List[dict]):
+    db.execute(insert(models.Flight), rows)
+    response_cache.invalidate(db, response_cache.FLIGHTS)
+
+
+def _insert_accommodations(db: Session, rows: List[dict]):
+    ids = db.scalars(
+        insert(models.Accommodation).returning(models.Accommodation.id), rows
+    ).all()
+    search.get_session_backend(db).index_accommodations(db, ids)
+    response_cache.invalidate(db, response_cache.ACCOMMODATIONS)
+
+
+def write_flights(db: Session, chunk: List[Tuple[int, dict]]):
+    return _write_chunk(db, chunk, _insert_flights)
+
+
+def write_accommodations(db: Session, chunk: List[Tuple[int, dict]]):
+    return _write_chunk(db, chunk, _insert_accommodations)
+
+
+# --- 실행 ---
+def import_flights(
+    db: Session,
+    lines: Iterable[str],
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    job = BulkImport(schemas.FlightCreate, chunk_size)
+    for line_no, record in RecordParser(fmt).parse(lines):
+        chunk = job.add(line_no, record)
+        if chunk:
+            job.record(write_flights(db, chunk))
+    job.record(write_flights(db, job.take()))
+    # 새 항공편은 다음 여정 검색 때 그래프를 다시 적재하며 반영됩니다.
+    itinerary.route_graph.mark_stale()
+    return job.report()
+
+
+async def import_flights_async(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    job = BulkImport(schemas.FlightCreate, chunk_size)
+    parser = RecordParser(fmt)
+    # 청크마다 커밋하는 쓰기이므로 crud_async 를 거쳐 다른 쓰기 요청과 같이 쓰기 잠금을 잡습니다.
+    # (SQLite 에서 예약과 동시에 적재해도 "database is locked" 가 나지 않게)
+    async for line in aiter_lines(chunks):
+        for line_no, record in parser.feed(line):
+            chunk = job.add(line_no, record)
+            if chunk:
+                job.record(await crud_async.write_flights_chunk(db, chunk))
+    for line_no, record in parser.close():
+        chunk = job.add(line_no, record)
+        if chunk:
+            job.record(await crud_async.write_flights_chunk(db, chunk))
+    job.record(await crud_async.write_flights_chunk(db, job.take()))
+    itinerary.route_graph.mark_stale()
+    return job.report()
+
+
+def import_accommodations(
+    db: Session,
+    lines: Iterable[str],
+    owner_id: int,
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    job = BulkImport(
+        schemas.AccommodationCreate, chunk_size, extra={"owner_id": owner_id}
+    )
+    for line_no, record in RecordParser(fmt).parse(lines):
+        chunk = job.add(line_no, record)
+        if chunk:
+            job.record(write_accommodations(db, chunk))
+    job.record(write_accommodations(db, job.take()))
+    return job.report()
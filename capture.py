@@ -0,0 +1,269 @@
+# backend/capture.py
+#
+# 운영 요청 샘플링 캡처입니다. REQUEST_CAPTURE_PATH 를 지정하면 요청의 REQUEST_CAPTURE_SAMPLE_RATE
+# 비율을 아래 형식의 JSONL 로 기록하고, `python -m benchmarks.replay <파일>` 이 같은 순서·간격으로
+# 다시 보내 운영 부하 모양을 로컬에서 재현합니다.
+#
+# 한 줄이 요청 하나입니다. (v=1)
+#   {"v": 1, "ts": 1760000000.123, "method": "POST", "path": "/api/bookings/flights/3",
+#    "query": "limit=20", "route": "/api/bookings/flights/{flight_id}", "auth": "bearer",
+#    "content_type": "application/json", "body": "{\"booking_date\": \"2025-10-01\"}",
+#    "idempotency_key": "3f1c...", "status": 200, "duration_ms": 12.5}
+#   - ts: 요청 도착 시각(epoch 초). 재생 시 요청 간 간격을 이 값으로 맞춥니다.
+#   - route: 매칭된 경로 템플릿 (없으면 null). 리포트는 이 값으로 묶습니다.
+#   - auth: "bearer" | "cookie" | null. 토큰/쿠키 값은 저장하지 않으며 재생 시 다시 발급합니다.
+#   - query / body: 쿼리 문자열과 UTF-8 텍스트 본문 (본문이 없거나 REQUEST_CAPTURE_MAX_BODY_BYTES 를
+#     넘으면 null, body_truncated=true). 비밀번호·토큰 같은 민감한 필드 값은 중첩된 JSON 안에
+#     있어도 "***" 로 가립니다.
+#   - idempotency_key: Idempotency-Key 헤더 (없으면 null). 재생 시 그대로 보내 같은 키의 재시도를
+#     원래처럼 저장된 응답으로 돌려받게 합니다.
+#
+# 파일 쓰기는 전용 스레드가 하므로 요청 처리 경로에서는 큐에 넣는 비용만 듭니다.
+# 큐가 가득 차면(쓰기가 밀리면) 기록을 버리고 dropped 로 셉니다.
+
+import json
+import queue
+import random
+import threading
+import time
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from config import settings
+
+FORMAT_VERSION = 1
+REDACTED = "***"
+# 값을 가리는 필드 이름 (대소문자 무시). JSON 본문은 중첩된 객체·배열 안까지, 폼 본문과 쿼리 문자열은
+# 같은 이름의 파라미터를 가립니다.
+SENSITIVE_FIELDS = {
+    "password",
+    "new_password",
+    "current_password",
+    "token",
+    "access_token",
+    "refresh_token",
+    "id_token",
+    "client_secret",
+    "secret",
+    "api_key",
+}
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+CAPTURED_HEADERS = (
+    b"authorization",
+    b"cookie",
+    b"content-type",
+    IDEMPOTENCY_KEY_HEADER,
+)
+# 캡처하지 않는 경로 (계측·정적 파일)
+SKIP_PREFIXES = ("/metrics", "/static", "/docs", "/redoc", "/openapi.json")
+QUEUE_SIZE = 10_000
+
+
+# --- 형식 ---
+def _is_sensitive(name) -> bool:
+    return isinstance(name, str) and name.lower() in SENSITIVE_FIELDS
+
+
+def _redact_json(value):
+    """(가린 값, 가린 필드가 있었는지) 를 돌려줍니다."""
+    if isinstance(value, dict):
+        redacted, changed = {}, False
+        for k, v in value.items():
+            if _is_sensitive(k):
+                redacted[k], changed = REDACTED, True
+            else:
+                redacted[k], inner = _redact_json(v)
+                changed = changed or inner
+        return redacted, changed
+    if isinstance(value, list):
+        items = [_redact_json(item) for item in value]
+        return [item for item, _ in items], any(inner for _, inner in items)
+    return value, False
+
+
+def redact_query(query: str) -> str:
+    """urlencoded 문자열(쿼리 문자열·폼 본문)의 민감한 파라미터 값을 가립니다."""
+    fields = parse_qsl(query, keep_blank_values=True)
+    if not any(_is_sensitive(k) for k, _ in fields):
+        return query
+    return urlencode(
+        [(k, REDACTED if _is_sensitive(k) else v) for k, v in fields], safe="*"
+    )
+
+
+def redact_body(body: str, content_type: str) -> str:
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return redact_query(body)
+    if content_type.startswith("application/json"):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        data, changed = _redact_json(data)
+        if changed:
+            return json.dumps(data, ensure_ascii=False)
+    return body
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """캡처 파일에서 형식에 맞는 요청 기록만 ts 순서대로 읽습니다. (다른 줄은 건너뜀)"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if (
+                isinstance(record, dict)
+                and record.get("v") == FORMAT_VERSION
+                and "method" in record
+                and "path" in record
+            ):
+                records.append(record)
+    records.sort(key=lambda record: record.get("ts", 0))
+    return iter(records)
+
+
+# --- 기록기 ---
+class CaptureWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(
+            target=self._run, name="request-capture", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, record: dict):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.written += 1
+                # 몰려 있는 기록을 다 쓴 뒤에만 flush 합니다.
+                if self._queue.empty():
+                    f.flush()
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+
+# --- ASGI 미들웨어 ---
+class CaptureMiddleware:
+    def __init__(
+        self,
+        app,
+        writer: CaptureWriter,
+        sample_rate: float,
+        max_body_bytes: int,
+    ):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(SKIP_PREFIXES)
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        arrived = time.time()
+        started = time.perf_counter()
+        body = bytearray()
+        truncated = False
+        status_code = 500
+
+        async def receive_wrapper():
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request" and not truncated:
+                chunk = message.get("body", b"")
+                if len(body) + len(chunk) > self.max_body_bytes:
+                    truncated = True
+                    body.clear()
+                else:
+                    body.extend(chunk)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            self.writer.put(
+                self._record(scope, arrived, started, body, truncated, status_code)
+            )
+
+    def _record(self, scope, arrived, started, body, truncated, status_code) -> dict:
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in CAPTURED_HEADERS
+        }
+        auth = None
+        if headers.get("authorization", "").lower().startswith("bearer "):
+            auth = "bearer"
+        elif "access_token=" in headers.get("cookie", ""):
+            auth = "cookie"
+        content_type = headers.get("content-type", "")
+        text: Optional[str] = None
+        if body and not truncated:
+            try:
+                text = redact_body(body.decode("utf-8"), content_type)
+            except UnicodeDecodeError:
+                truncated = True
+        record = {
+            "v": FORMAT_VERSION,
+            "ts": round(arrived, 3),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": redact_query(scope["query_string"].decode("latin-1")),
+            "route": getattr(scope.get("route"), "path", None),
+            "auth": auth,
+            "content_type": content_type or None,
+            "body": text,
+            "idempotency_key": headers.get(IDEMPOTENCY_KEY_HEADER.decode()),
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        if truncated:
+            record["body_truncated"] = True
+        return record
+
+
+def install(app) -> Optional[CaptureWriter]:
+    """REQUEST_CAPTURE_PATH 가 지정되어 있으면 캡처 미들웨어를 붙이고 기록기를 돌려줍니다."""
+    if not settings.REQUEST_CAPTURE_PATH or settings.REQUEST_CAPTURE_SAMPLE_RATE <= 0:
+        return None
+    writer = CaptureWriter(settings.REQUEST_CAPTURE_PATH)
+    app.add_middleware(
+        CaptureMiddleware,
+        writer=writer,
+        sample_rate=settings.REQUEST_CAPTURE_SAMPLE_RATE,
+        max_body_bytes=settings.REQUEST_CAPTURE_MAX_BODY_BYTES,
+    )
+    return writer
@@ -1,7 +1,74 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # 비워두면 DATABASE_URL 에서 비동기 드라이버 URL 을 만들어 사용합니다.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # 읽기 전용 복제본. 지정하면 카탈로그 조회·검색·통계·내보내기가 이 DB 를 읽습니다.
+    READ_REPLICA_URL: Optional[str] = None
+    ASYNC_READ_REPLICA_URL: Optional[str] = None
+    # 커넥션 풀 (SQLite 메모리 DB 처럼 풀을 쓰지 않는 경우 무시됩니다)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # SQLite 연결마다 적용하는 PRAGMA. WAL 은 읽기와 쓰기가 서로 막지 않게 하고,
+    # busy_timeout 동안은 쓰기 잠금을 기다리므로 동시 예약 시 "database is locked" 가 줄어듭니다.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # 다른 워커에서 추가된 항공편을 반영하기 위한 여정 검색 그래프 전체 재적재 주기(초)
+    ITINERARY_REFRESH_SECONDS: int = 300
+    # 인증 사용자 캐시 (토큰 subject → 사용자 스냅샷)
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # 켜면 토큰에 uid/role 클레임을 넣고, 검증 시 DB/캐시 조회 없이 클레임으로 사용자를 만듭니다.
+    # 역할 변경은 이미 발급된 토큰이 만료될 때까지 반영되지 않으므로 기본값은 끔입니다.
+    JWT_EMBED_PRINCIPAL: bool = False
+    # 비밀번호 해싱 전용 워커 수와 대기열 한도. 한도를 넘으면 429 로 거절합니다.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # 공개 조회 응답 캐시. 비워 두면 프로세스 내 LRU, redis:// 로 지정하면 Redis 호환 서버를 사용합니다.
+    RESPONSE_CACHE_URL: Optional[str] = None
+    RESPONSE_CACHE_SIZE: int = 2048
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    # 요청/SQL 계측과 GET /metrics. 이 시간(ms)보다 오래 걸린 SQL 문은 경고 로그로 남깁니다.
+    METRICS_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: int = 200
+    # 요청 캡처 (benchmarks/replay.py 로 재생). 경로를 지정해야 켜집니다.
+    REQUEST_CAPTURE_PATH: Optional[str] = None
+    REQUEST_CAPTURE_SAMPLE_RATE: float = 0.01
+    REQUEST_CAPTURE_MAX_BODY_BYTES: int = 64 * 1024
+    # HTML 템플릿. 자동 리로드를 켜면 렌더링마다 템플릿 파일이 바뀌었는지 확인합니다. (개발용)
+    TEMPLATE_AUTO_RELOAD: bool = False
+    # 컴파일된 템플릿 바이트코드 저장 위치 (비워 두면 시스템 임시 디렉터리)
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+    # 페이지 조각 캐시 ({% cache %}). 무효화는 태그 버전으로 하므로 TTL 은 메모리 정리용입니다.
+    FRAGMENT_CACHE_SIZE: int = 512
+    FRAGMENT_CACHE_TTL_SECONDS: int = 300
+    # 예약 API 의 Idempotency-Key 보관 시간. 지난 키는 새 요청으로 처리합니다.
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # 항공편 좌석 재고: 결제(확정) 전 좌석 보류 시간, 등급별 재고 행(shard) 수,
+    # 만료된 보류를 푸는 스위퍼 주기(0 이면 끔)와 한 번에 푸는 예약 수
+    SEAT_HOLD_MINUTES: int = 15
+    SEAT_INVENTORY_SHARDS: int = 4
+    SEAT_HOLD_SWEEP_SECONDS: int = 30
+    SEAT_HOLD_SWEEP_BATCH: int = 500
+    # 예약 상태별 건수 롤업 행(shard) 수. 예약마다 임의의 shard 를 갱신해 행 잠금 경합을 나눕니다.
+    BOOKING_STATUS_SHARDS: int = 8
+    # 예약 후처리 아웃박스(outbox.py): 워커 수(0 이면 끔), 한 번에 가져가는 이벤트 수, 새 이벤트가
+    # 없을 때 확인 주기, 재시도 횟수와 지수 백오프(기본·최대 초), 가져간 이벤트의 처리 제한 시간
+    OUTBOX_WORKERS: int = 2
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 5.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: float = 2.0
+    OUTBOX_RETRY_MAX_SECONDS: float = 600.0
+    OUTBOX_LEASE_SECONDS: int = 60
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -1,27 +1,251 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import Optional
-import models, schemas, security
+from datetime import date, datetime, timedelta
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    String,
+    and_,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Iterable, List, Optional
+import idempotency, itinerary, models, outbox, pagination, response_cache, rollups, schemas, search, seats, security
+
+
+# --- Loading strategies ---
+# 응답 스키마가 접근하는 관계를 미리 로딩해 행마다 lazy SELECT 가 발생하는 N+1 을 막습니다.
+# 다대일(owner)은 JOIN 으로, 일대다 컬렉션(bookings)은 selectin(IN 배치) 으로 가져옵니다.
+def accommodation_load_options(include_bookings: bool = True):
+    options = [joinedload(models.Accommodation.owner)]
+    if include_bookings:
+        options.append(selectinload(models.Accommodation.bookings))
+    return options
+
+
+def flight_load_options(include_bookings: bool = True):
+    if include_bookings:
+        return [selectinload(models.Flight.bookings)]
+    return []
+
+
+# --- Sort keys ---
+# 목록 정렬 기준입니다. 키셋 페이지네이션은 (정렬 키, id) 순서를 그대로 커서로 사용합니다.
+ACCOMMODATION_SORT_COLUMNS = {
+    "id": models.Accommodation.id,
+    "price": models.Accommodation.price,
+}
+
+FLIGHT_SORT_COLUMNS = {
+    "id": models.Flight.id,
+    "departure_time": models.Flight.departure_time,
+    "price": models.Flight.price,
+}
+
+
+# --- Response rows ---
+# 목록 API 는 ORM 객체 대신 응답 스키마 모양의 dict 를 Core select() 로 바로 만듭니다.
+# 행마다 ORM 객체를 만들고 Pydantic 이 속성을 하나씩 읽어 검증하는 비용이 사라집니다.
+# 키 순서를 스키마 필드 순서와 맞추므로 직렬화 결과는 TypeAdapter 를 거친 응답과 같습니다.
+def _schema_fields(schema, exclude=()) -> list:
+    return [name for name in schema.model_fields if name not in exclude]
+
+
+def _attach_bookings(db: Session, items: List[dict], model, schema, parent_key: str):
+    # selectinload 와 같이 IN 조건 한 번으로 모든 행의 예약을 가져옵니다.
+    parents = {}
+    for item in items:
+        item["bookings"] = []
+        parents[item["id"]] = item
+    if not parents:
+        return
+    fields = _schema_fields(schema)
+    rows = db.execute(
+        select(*[getattr(model, name) for name in fields])
+        .where(getattr(model, parent_key).in_(parents))
+        .order_by(model.id)
+    )
+    for row in rows:
+        booking = dict(zip(fields, row))
+        parents[booking[parent_key]]["bookings"].append(booking)
+
+
+ACCOMMODATION_ROW_FIELDS = _schema_fields(
+    schemas.AccommodationSummary, exclude=("owner",)
+)
+FLIGHT_ROW_FIELDS = _schema_fields(schemas.FlightSummary)
 
 
 # --- Accommodation CRUD ---
-def get_accommodation(db: Session, accommodation_id: int):
+def get_accommodation(
+    db: Session, accommodation_id: int, include_bookings: bool = True
+):
     return (
         db.query(models.Accommodation)
-        .options(joinedload(models.Accommodation.owner))
+        .options(*accommodation_load_options(include_bookings))
         .filter(models.Accommodation.id == accommodation_id)
         .first()
     )
 
 
 def get_accommodations(
-    db: Session, location: Optional[str] = None, skip: int = 0, limit: int = 100
+    db: Session,
+    location: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    include_bookings: bool = True,
+    q: Optional[str] = None,
+    check_in: Optional[date] = None,
+    check_out: Optional[date] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     query = db.query(models.Accommodation).options(
-        joinedload(models.Accommodation.owner)
+        *accommodation_load_options(include_bookings)
+    )
+    return _filter_accommodations(
+        db,
+        query,
+        location=location,
+        skip=skip,
+        limit=limit,
+        q=q,
+        check_in=check_in,
+        check_out=check_out,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        cursor=cursor,
+    ).all()
+
+
+def _filter_accommodations(
+    db: Session,
+    query,
+    location: Optional[str],
+    skip: int,
+    limit: int,
+    q: Optional[str],
+    check_in: Optional[date],
+    check_out: Optional[date],
+    min_price: Optional[int],
+    max_price: Optional[int],
+    sort: Optional[str],
+    cursor: Optional[str],
+):
+    # ORM Query 와 Core select() 양쪽에 같은 검색 조건·정렬·페이지를 적용합니다.
+    # 텍스트 조건은 검색 백엔드(SQLite FTS5 / PostgreSQL pg_trgm)가 인덱스로 처리합니다.
+    # 정렬 기준을 따로 주지 않은 텍스트 검색은 관련도순이며, 이때는 OFFSET 으로만 넘깁니다.
+    by_relevance = sort is None and bool(q or location)
+    query = search.apply(db, query, q, rank=by_relevance)
+    query = search.apply(db, query, location, columns=("location",), rank=by_relevance)
+    if min_price is not None:
+        query = query.filter(models.Accommodation.price >= min_price)
+    if max_price is not None:
+        query = query.filter(models.Accommodation.price <= max_price)
+    if check_in and check_out:
+        # 해당 기간에 겹치는 예약이 없는 숙소만 남기는 anti-join (NOT EXISTS) 입니다.
+        # 숙박은 최대 MAX_STAY_NIGHTS 박이므로 겹치는 예약은 check_in - MAX_STAY_NIGHTS 이후에
+        # 시작합니다. 이 하한으로 (accommodation_id, start_date) 인덱스 탐색이 양쪽으로 막혀,
+        # 숙소마다 약 한 달치 예약만 읽고 과거 예약 이력이 쌓여도 비용이 늘지 않습니다.
+        earliest_start = check_in - timedelta(days=schemas.MAX_STAY_NIGHTS)
+        overlap = exists().where(
+            _overlapping_booking_filter(models.Accommodation.id, check_in, check_out),
+            models.AccommodationBooking.start_date > earliest_start,
+        )
+        query = query.filter(~overlap)
+    if by_relevance:
+        return query.offset(skip).limit(limit)
+
+    sort = sort or "id"
+    query = pagination.apply(
+        query,
+        sort,
+        ACCOMMODATION_SORT_COLUMNS[sort],
+        models.Accommodation.id,
+        cursor=cursor,
+        skip=skip,
+    )
+    return query.limit(limit)
+
+
+def get_accommodation_rows(
+    db: Session,
+    location: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    include_bookings: bool = True,
+    q: Optional[str] = None,
+    check_in: Optional[date] = None,
+    check_out: Optional[date] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[dict]:
+    """get_accommodations 와 같은 목록을 schemas.Accommodation(Summary) 모양의 dict 로 돌려줍니다."""
+    query = select(
+        *[getattr(models.Accommodation, name) for name in ACCOMMODATION_ROW_FIELDS],
+        models.User.email,
+    ).outerjoin(models.User, models.User.id == models.Accommodation.owner_id)
+    query = _filter_accommodations(
+        db,
+        query,
+        location=location,
+        skip=skip,
+        limit=limit,
+        q=q,
+        check_in=check_in,
+        check_out=check_out,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        cursor=cursor,
     )
-    if location:
-        query = query.filter(models.Accommodation.location.contains(location))
-    return query.offset(skip).limit(limit).all()
+    items = []
+    for *values, owner_email in db.execute(query):
+        item = dict(zip(ACCOMMODATION_ROW_FIELDS, values))
+        item["owner"] = (
+            None
+            if owner_email is None
+            else {"id": item["owner_id"], "email": owner_email}
+        )
+        items.append(item)
+    if include_bookings:
+        _attach_bookings(
+            db,
+            items,
+            models.AccommodationBooking,
+            schemas.AccommodationBooking,
+            "accommodation_id",
+        )
+    return items
+
+
+def get_accommodation_cards(db: Session, limit: int = 24):
+    """홈 화면 숙소 카드용 평평한 행 (등록자 이메일 포함, 쿼리 1번)."""
+    return db.execute(
+        select(
+            models.Accommodation.id,
+            models.Accommodation.name,
+            models.Accommodation.location,
+            models.Accommodation.price,
+            models.User.email.label("owner_email"),
+        )
+        .outerjoin(models.User, models.User.id == models.Accommodation.owner_id)
+        .order_by(models.Accommodation.id)
+        .limit(limit)
+    ).all()
 
 
 def create_accommodation(
@@ -29,9 +253,13 @@ def create_accommodation(
 ):
     db_accommodation = models.Accommodation(**accommodation.dict(), owner_id=user_id)
     db.add(db_accommodation)
+    db.flush()
+    search.get_session_backend(db).index_accommodation(db, db_accommodation)
+    response_cache.invalidate(db, response_cache.ACCOMMODATIONS)
     db.commit()
     db.refresh(db_accommodation)
-    return db_accommodation
+    # 응답 스키마가 쓰는 owner/bookings 까지 로딩된 객체를 돌려줍니다.
+    return get_accommodation(db, accommodation_id=db_accommodation.id)
 
 
 def update_accommodation(
@@ -44,6 +272,12 @@ def update_accommodation(
         update_data = accommodation_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_accommodation, key, value)
+        search.get_session_backend(db).index_accommodation(db, db_accommodation)
+        response_cache.invalidate(
+            db,
+            response_cache.ACCOMMODATIONS,
+            response_cache.accommodation_tag(accommodation_id),
+        )
         db.commit()
         db.refresh(db_accommodation)
     return db_accommodation
@@ -52,26 +286,176 @@ def update_accommodation(
 def delete_accommodation(db: Session, accommodation_id: int):
     db_accommodation = get_accommodation(db, accommodation_id=accommodation_id)
     if db_accommodation:
+        # 롤업 행이 숙소를 참조하므로 숙소보다 먼저 지웁니다.
+        rollups.forget_accommodation(db, accommodation_id)
         db.delete(db_accommodation)
+        search.get_session_backend(db).remove_accommodation(db, accommodation_id)
+        response_cache.invalidate(
+            db,
+            response_cache.ACCOMMODATIONS,
+            response_cache.accommodation_tag(accommodation_id),
+        )
         db.commit()
     return db_accommodation
 
 
 # --- Flight CRUD ---
 def get_flight(db: Session, flight_id: int):
-    return db.query(models.Flight).filter(models.Flight.id == flight_id).first()
+    return (
+        db.query(models.Flight)
+        .options(*flight_load_options())
+        .filter(models.Flight.id == flight_id)
+        .first()
+    )
 
 
-def get_flights(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Flight).offset(skip).limit(limit).all()
+def get_flights(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    include_bookings: bool = True,
+    cursor: Optional[str] = None,
+    origin: Optional[str] = None,
+    destination: Optional[str] = None,
+    departure_from: Optional[datetime] = None,
+    departure_to: Optional[datetime] = None,
+    max_price: Optional[int] = None,
+    sort: str = "departure_time",
+):
+    query = db.query(models.Flight).options(*flight_load_options(include_bookings))
+    return _filter_flights(
+        query,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        origin=origin,
+        destination=destination,
+        departure_from=departure_from,
+        departure_to=departure_to,
+        max_price=max_price,
+        sort=sort,
+    ).all()
+
+
+def _filter_flights(
+    query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    origin: Optional[str],
+    destination: Optional[str],
+    departure_from: Optional[datetime],
+    departure_to: Optional[datetime],
+    max_price: Optional[int],
+    sort: str,
+):
+    # 출발/도착 공항 등호 조건 + 출발 시각 범위는 ix_flights_route_departure 로 처리됩니다.
+    if origin:
+        query = query.filter(models.Flight.departure_airport == origin)
+    if destination:
+        query = query.filter(models.Flight.arrival_airport == destination)
+    if departure_from:
+        query = query.filter(models.Flight.departure_time >= departure_from)
+    if departure_to:
+        query = query.filter(models.Flight.departure_time < departure_to)
+    if max_price is not None:
+        query = query.filter(models.Flight.price <= max_price)
+    query = pagination.apply(
+        query,
+        sort,
+        FLIGHT_SORT_COLUMNS[sort],
+        models.Flight.id,
+        cursor=cursor,
+        skip=skip,
+    )
+    return query.limit(limit)
+
+
+def get_flight_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    include_bookings: bool = True,
+    cursor: Optional[str] = None,
+    origin: Optional[str] = None,
+    destination: Optional[str] = None,
+    departure_from: Optional[datetime] = None,
+    departure_to: Optional[datetime] = None,
+    max_price: Optional[int] = None,
+    sort: str = "departure_time",
+) -> List[dict]:
+    """get_flights 와 같은 목록을 schemas.Flight(Summary) 모양의 dict 로 돌려줍니다."""
+    query = _filter_flights(
+        select(*[getattr(models.Flight, name) for name in FLIGHT_ROW_FIELDS]),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        origin=origin,
+        destination=destination,
+        departure_from=departure_from,
+        departure_to=departure_to,
+        max_price=max_price,
+        sort=sort,
+    )
+    items = [dict(zip(FLIGHT_ROW_FIELDS, row)) for row in db.execute(query)]
+    if include_bookings:
+        _attach_bookings(
+            db, items, models.FlightBooking, schemas.FlightBooking, "flight_id"
+        )
+    return items
 
 
 def create_flight(db: Session, flight: schemas.FlightCreate):
     db_flight = models.Flight(**flight.dict())
     db.add(db_flight)
+    if flight.fares:
+        db.flush()
+        for fare in flight.fares:
+            seats.add_fare(db, db_flight.id, fare.fare_class, fare.capacity)
+    response_cache.invalidate(db, response_cache.FLIGHTS)
     db.commit()
     db.refresh(db_flight)
-    return db_flight
+    # 여정 검색 그래프에 새 항공편을 바로 반영합니다. (아직 적재 전이면 첫 검색 때 함께 읽힙니다)
+    itinerary.route_graph.add_flight(db_flight)
+    return get_flight(db, flight_id=db_flight.id)
+
+
+# --- Flight Seat Inventory ---
+def get_flight_seat_availability(db: Session, flight_id: int):
+    fare = models.FlightFare
+    inventory = models.FlightSeatInventory
+    return (
+        db.execute(
+            select(
+                fare.fare_class,
+                fare.capacity,
+                func.coalesce(func.sum(inventory.available), 0).label("available"),
+            )
+            .outerjoin(
+                inventory,
+                and_(
+                    inventory.flight_id == fare.flight_id,
+                    inventory.fare_class == fare.fare_class,
+                ),
+            )
+            .where(fare.flight_id == flight_id)
+            .group_by(fare.fare_class, fare.capacity)
+            .order_by(fare.fare_class)
+        )
+        .mappings()
+        .all()
+    )
+
+
+def add_flight_fare(db: Session, flight_id: int, fare: schemas.FlightFareCreate):
+    """항공편에 좌석 등급을 추가합니다. 항공편이 없으면 None, 이미 있는 등급이면 False."""
+    if db.get(models.Flight, flight_id) is None:
+        return None
+    if db.get(models.FlightFare, (flight_id, fare.fare_class)) is not None:
+        return False
+    seats.add_fare(db, flight_id, fare.fare_class, fare.capacity)
+    db.commit()
+    return True
 
 
 # --- User CRUD ---
@@ -80,12 +464,26 @@ def get_user_by_email(db: Session, email: str):
 
 
 # ✨ 관리자 기능을 위해 모든 사용자를 조회하는 함수 추가
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+):
+    query = pagination.apply(
+        db.query(models.User),
+        "id",
+        models.User.id,
+        models.User.id,
+        cursor=cursor,
+        skip=skip,
+    )
+    return query.limit(limit).all()
 
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = security.get_password_hash(user.password)
+def create_user(
+    db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None
+):
+    # 비동기 경로에서는 해싱을 이벤트 루프 밖에서 끝낸 뒤 hashed_password 로 넘겨줍니다.
+    if hashed_password is None:
+        hashed_password = security.get_password_hash(user.password)
     db_user = models.User(email=user.email, hashed_password=hashed_password)
     db.add(db_user)
     db.commit()
@@ -93,51 +491,608 @@ def create_user(db: Session, user: schemas.UserCreate):
     return db_user
 
 
+def update_user_password_hash(db: Session, user_id: int, hashed_password: str):
+    db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(hashed_password=hashed_password)
+    )
+    db.commit()
+
+
+# --- Accommodation Availability ---
+# [start_date, end_date) 반열린 구간끼리 겹치는지 검사합니다. (체크아웃 날 체크인 가능)
+# (accommodation_id, start_date, end_date) 복합 인덱스로 해당 숙소의 구간만 범위 탐색합니다.
+# accommodation_id 로 models.Accommodation.id 컬럼을 넘기면 목록 쿼리의 상관 서브쿼리가 됩니다.
+def _overlapping_booking_filter(accommodation_id, start_date: date, end_date: date):
+    return and_(
+        models.AccommodationBooking.accommodation_id == accommodation_id,
+        models.AccommodationBooking.start_date < end_date,
+        models.AccommodationBooking.end_date > start_date,
+        models.AccommodationBooking.status != "cancelled",
+    )
+
+
+def get_overlapping_bookings(
+    db: Session, accommodation_id: int, start_date: date, end_date: date
+):
+    return (
+        db.query(models.AccommodationBooking)
+        .filter(_overlapping_booking_filter(accommodation_id, start_date, end_date))
+        .order_by(models.AccommodationBooking.start_date)
+        .all()
+    )
+
+
+def is_accommodation_available(
+    db: Session, accommodation_id: int, start_date: date, end_date: date
+):
+    overlap = exists().where(
+        _overlapping_booking_filter(accommodation_id, start_date, end_date)
+    )
+    return not db.execute(select(overlap)).scalar()
+
+
 # --- Accommodation Booking CRUD ---
 def create_accommodation_booking(
     db: Session,
     booking: schemas.AccommodationBookingCreate,
     accommodation_id: int,
     user_id: int,
+    idempotent: Optional[idempotency.IdempotentRequest] = None,
 ):
-    db_booking = models.AccommodationBooking(
-        **booking.dict(), accommodation_id=accommodation_id, user_id=user_id
+    """숙소가 있고 겹치는 예약이 없을 때만 예약을 생성합니다. 아니면 None 을 반환합니다.
+
+    idempotent 를 주면 같은 트랜잭션에서 키를 기록합니다. (이미 있으면 idempotency.KeyInUse)
+    """
+    # 키를 예약보다 먼저 INSERT 해 같은 키의 동시 요청은 예약을 시도하기 전에 충돌하게 합니다.
+    claim = idempotency.claim(db, idempotent) if idempotent else None
+    if db.get_bind().dialect.name != "sqlite":
+        # PostgreSQL 에서는 숙소 행을 잠가 같은 숙소에 대한 동시 예약을 직렬화합니다.
+        # (SQLite 는 쓰기 문장이 DB 쓰기 잠금을 잡고 실행되므로 아래 INSERT 하나로 충분합니다.)
+        db.execute(
+            select(models.Accommodation.id)
+            .where(models.Accommodation.id == accommodation_id)
+            .with_for_update()
+        )
+
+    # 숙소 존재 확인, 겹침 검사, INSERT 를 한 문장(INSERT ... SELECT ... RETURNING)으로 수행합니다.
+    overlap = exists().where(
+        _overlapping_booking_filter(
+            accommodation_id, booking.start_date, booking.end_date
+        )
+    )
+    candidate = select(
+        literal(booking.start_date, Date),
+        literal(booking.end_date, Date),
+        literal("pending"),
+        literal(user_id),
+        models.Accommodation.id,
+        models.Accommodation.price,
+    ).where(models.Accommodation.id == accommodation_id, ~overlap)
+    # 예약 시점의 1박 요금을 함께 저장해 매출 롤업이 이후 요금 변경과 무관하게 맞도록 합니다.
+    stmt = (
+        insert(models.AccommodationBooking)
+        .from_select(
+            [
+                "start_date",
+                "end_date",
+                "status",
+                "user_id",
+                "accommodation_id",
+                "price",
+            ],
+            candidate,
+        )
+        .returning(models.AccommodationBooking)
+    )
+    db_booking = db.scalars(stmt).first()
+    if db_booking is None:
+        db.rollback()
+        return None
+    rollups.record_accommodation_booking(
+        db,
+        accommodation_id=accommodation_id,
+        start_date=booking.start_date,
+        end_date=booking.end_date,
+        status="pending",
+        price=db_booking.price,
+    )
+    # 숙소 응답에는 예약 목록이 포함되고, 날짜 검색 결과도 예약에 따라 달라집니다.
+    response_cache.invalidate(
+        db,
+        response_cache.ACCOMMODATIONS,
+        response_cache.accommodation_tag(accommodation_id),
     )
-    db.add(db_booking)
+    response = schemas.AccommodationBooking.model_validate(db_booking)
+    # 확인 메일 등 후처리는 커밋 후 outbox 워커가 합니다. (요청 경로에서는 INSERT 한 번)
+    outbox.enqueue(db, outbox.ACCOMMODATION_BOOKING_CREATED, response)
+    if claim is not None:
+        idempotency.complete(claim, 200, response)
     db.commit()
-    db.refresh(db_booking)
     return db_booking
 
 
 def get_user_accommodation_bookings(db: Session, user_id: int):
     return (
         db.query(models.AccommodationBooking)
+        .options(joinedload(models.AccommodationBooking.accommodation))
         .filter(models.AccommodationBooking.user_id == user_id)
         .all()
     )
 
 
 # ✨ 관리자 기능을 위해 모든 숙소 예약을 조회하는 함수 추가
-def get_all_accommodation_bookings(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.AccommodationBooking).offset(skip).limit(limit).all()
+def get_all_accommodation_bookings(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+):
+    query = pagination.apply(
+        db.query(models.AccommodationBooking),
+        "id",
+        models.AccommodationBooking.id,
+        models.AccommodationBooking.id,
+        cursor=cursor,
+        skip=skip,
+    )
+    return query.limit(limit).all()
+
+
+# --- Booking status transitions (관리자) ---
+# 허용되는 상태 전이입니다. 취소는 되돌릴 수 없습니다.
+BOOKING_STATUS_TRANSITIONS = {
+    "pending": {"confirmed", "cancelled"},
+    "confirmed": {"cancelled"},
+    "cancelled": set(),
+}
+# 한 번의 SELECT / UPDATE 에 담는 예약 수 (바인드 변수 개수 제한 안쪽)
+STATUS_UPDATE_BATCH = 2_000
+
+
+def _status_result(booking_id: int, result: str, row=None, **values) -> dict:
+    if row is not None:
+        values = {"status": row.status, "version": row.version, **values}
+    return {"id": booking_id, "result": result, **values}
+
+
+def _apply_status_batch(db: Session, targets: dict, new_status: str) -> tuple:
+    booking = models.AccommodationBooking
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(
+                booking.id,
+                booking.status,
+                booking.version,
+                booking.accommodation_id,
+                booking.start_date,
+                booking.end_date,
+                booking.price,
+            ).where(booking.id.in_(list(targets)))
+        )
+    }
+    results, candidates = {}, {}
+    for booking_id, expected_version in targets.items():
+        row = current.get(booking_id)
+        if row is None:
+            results[booking_id] = _status_result(booking_id, "not_found")
+        elif expected_version is not None and expected_version != row.version:
+            results[booking_id] = _status_result(booking_id, "version_conflict", row)
+        elif (row.status or "pending") == new_status:
+            results[booking_id] = _status_result(booking_id, "unchanged", row)
+        elif new_status not in BOOKING_STATUS_TRANSITIONS.get(
+            row.status or "pending", ()
+        ):
+            results[booking_id] = _status_result(booking_id, "invalid_transition", row)
+        else:
+            candidates[booking_id] = row
+    if not candidates:
+        return results, []
+
+    # 읽은 버전과 같을 때만 바꾸는 UPDATE 한 문장입니다. 그 사이 다른 요청이 먼저 바꾼 행은
+    # 버전이 달라 조건에서 빠지므로 RETURNING 에 없으면 version_conflict 로 보고합니다.
+    updated = dict(
+        db.execute(
+            update(booking)
+            .where(
+                tuple_(booking.id, booking.version).in_(
+                    [(row.id, row.version) for row in candidates.values()]
+                )
+            )
+            .values(status=new_status, version=booking.version + 1)
+            .returning(booking.id, booking.version)
+            .execution_options(synchronize_session=False)
+        ).all()
+    )
+    changes = []
+    for booking_id, row in candidates.items():
+        if booking_id in updated:
+            results[booking_id] = _status_result(
+                booking_id, "updated", status=new_status, version=updated[booking_id]
+            )
+            changes.append((row, row.status, new_status))
+        else:
+            results[booking_id] = _status_result(booking_id, "version_conflict")
+    return results, changes
+
+
+def update_accommodation_booking_statuses(
+    db: Session, new_status: str, targets: Iterable[schemas.BookingStatusTarget]
+) -> List[dict]:
+    """여러 예약의 상태를 한 트랜잭션에서 바꾸고, 입력 순서대로 예약별 결과를 돌려줍니다.
+
+    target.version 을 주면 그 버전일 때만 바꿉니다. (낙관적 잠금)
+    """
+    requested = {target.id: target.version for target in targets}
+    ids = list(requested)
+    results, changes = {}, []
+    for i in range(0, len(ids), STATUS_UPDATE_BATCH):
+        batch = {
+            booking_id: requested[booking_id]
+            for booking_id in ids[i : i + STATUS_UPDATE_BATCH]
+        }
+        batch_results, batch_changes = _apply_status_batch(db, batch, new_status)
+        results.update(batch_results)
+        changes.extend(batch_changes)
+
+    if changes:
+        rollups.record_accommodation_status_changes(db, changes)
+        accommodation_ids = {row.accommodation_id for row, _, _ in changes}
+        response_cache.invalidate(
+            db,
+            response_cache.ACCOMMODATIONS,
+            *(response_cache.accommodation_tag(i) for i in accommodation_ids),
+        )
+    db.commit()
+    # 이미 세션에 올라온 예약 객체가 있으면 다음 접근 때 새 상태를 다시 읽게 합니다.
+    db.expire_all()
+    return [results[booking_id] for booking_id in ids]
+
+
+def update_accommodation_booking_status(
+    db: Session, booking_id: int, status: str, version: Optional[int] = None
+) -> dict:
+    target = schemas.BookingStatusTarget(id=booking_id, version=version)
+    return update_accommodation_booking_statuses(db, status, [target])[0]
+
+
+# --- My Bookings (itinerary view) ---
+# 숙소 예약과 항공권 예약을 UNION ALL 한 번으로 읽어 여행 날짜순으로 정렬한 평평한 행 목록입니다.
+# 예약 수와 관계없이 쿼리는 항상 1회입니다. 상대편에만 있는 열은 타입을 맞춘 NULL 로 채웁니다.
+def _itinerary_accommodation_rows(user_id: int):
+    booking = models.AccommodationBooking
+    return (
+        select(
+            literal("accommodation", String).label("kind"),
+            booking.id.label("booking_id"),
+            booking.status,
+            booking.start_date.label("start_date"),
+            booking.end_date.label("end_date"),
+            cast(null(), DateTime).label("departure_time"),
+            cast(null(), DateTime).label("arrival_time"),
+            cast(null(), Date).label("booking_date"),
+            booking.accommodation_id,
+            models.Accommodation.name.label("accommodation_name"),
+            models.Accommodation.location,
+            cast(null(), Integer).label("flight_id"),
+            cast(null(), String).label("departure_airport"),
+            cast(null(), String).label("arrival_airport"),
+            # 카탈로그의 현재 요금이 아니라 예약 시점에 저장한 요금을 보여 줍니다.
+            booking.price,
+        )
+        .join(models.Accommodation, models.Accommodation.id == booking.accommodation_id)
+        .where(booking.user_id == user_id)
+    )
+
+
+def _itinerary_flight_rows(user_id: int):
+    booking = models.FlightBooking
+    return (
+        select(
+            literal("flight", String).label("kind"),
+            booking.id.label("booking_id"),
+            booking.status,
+            cast(null(), Date).label("start_date"),
+            cast(null(), Date).label("end_date"),
+            models.Flight.departure_time,
+            models.Flight.arrival_time,
+            booking.booking_date,
+            cast(null(), Integer).label("accommodation_id"),
+            cast(null(), String).label("accommodation_name"),
+            cast(null(), String).label("location"),
+            booking.flight_id,
+            models.Flight.departure_airport,
+            models.Flight.arrival_airport,
+            booking.price,
+        )
+        .join(models.Flight, models.Flight.id == booking.flight_id)
+        .where(booking.user_id == user_id)
+    )
+
+
+def get_user_itinerary(
+    db: Session, user_id: int, skip: int = 0, limit: Optional[int] = 100
+):
+    rows = union_all(
+        _itinerary_accommodation_rows(user_id), _itinerary_flight_rows(user_id)
+    ).subquery("itinerary")
+    # 숙소는 체크인 날짜, 항공편은 출발 시각 기준 (같은 날이면 숙소가 먼저)
+    query = (
+        select(rows)
+        .order_by(
+            func.coalesce(rows.c.start_date, rows.c.departure_time),
+            rows.c.kind,
+            rows.c.booking_id,
+        )
+        .offset(skip)
+        .limit(limit)
+    )
+    return db.execute(query).mappings().all()
+
+
+# --- Booking Export ---
+# 전체 예약 내보내기용 Core 쿼리입니다. ORM 객체를 만들지 않고 행 단위로 스트리밍합니다.
+def accommodation_bookings_export_query(
+    status: Optional[str] = None,
+    start_from: Optional[date] = None,
+    start_to: Optional[date] = None,
+):
+    booking = models.AccommodationBooking
+    query = (
+        select(
+            booking.id,
+            booking.user_id,
+            models.User.email.label("user_email"),
+            booking.accommodation_id,
+            models.Accommodation.name.label("accommodation_name"),
+            # 현재 카탈로그 요금이 아니라 예약 시점에 저장한 1박 요금입니다.
+            booking.price.label("price_per_night"),
+            booking.start_date,
+            booking.end_date,
+            booking.status,
+        )
+        .outerjoin(models.User, models.User.id == booking.user_id)
+        .outerjoin(
+            models.Accommodation, models.Accommodation.id == booking.accommodation_id
+        )
+        .order_by(booking.id)
+    )
+    if status is not None:
+        query = query.where(booking.status == status)
+    # 체크인 날짜 기준 [start_from, start_to) 구간
+    if start_from is not None:
+        query = query.where(booking.start_date >= start_from)
+    if start_to is not None:
+        query = query.where(booking.start_date < start_to)
+    return query
+
+
+# --- Admin Stats (롤업 테이블 조회) ---
+def get_booking_status_counts(db: Session):
+    stat = models.BookingStatusCount
+    count = func.sum(stat.count)
+    return db.execute(
+        select(stat.kind, stat.status, count.label("count"))
+        .group_by(stat.kind, stat.status)
+        .having(count != 0)
+        .order_by(stat.kind, stat.status)
+    ).all()
+
+
+def get_daily_revenue(db: Session, start_date: date, end_date: date):
+    accommodation = models.AccommodationDailyStat
+    route = models.RouteDailyStat
+    days = {}
+
+    def day_row(day):
+        return days.setdefault(
+            day,
+            {
+                "day": day,
+                "accommodation_bookings": 0,
+                "nights": 0,
+                "accommodation_revenue": 0,
+                "flight_bookings": 0,
+                "flight_revenue": 0,
+            },
+        )
+
+    for row in db.execute(
+        select(
+            accommodation.day,
+            func.sum(accommodation.bookings),
+            func.sum(accommodation.nights),
+            func.sum(accommodation.revenue),
+        )
+        .where(accommodation.day >= start_date, accommodation.day < end_date)
+        .group_by(accommodation.day)
+    ):
+        day_row(row[0]).update(
+            accommodation_bookings=row[1], nights=row[2], accommodation_revenue=row[3]
+        )
+    for row in db.execute(
+        select(route.day, func.sum(route.bookings), func.sum(route.revenue))
+        .where(route.day >= start_date, route.day < end_date)
+        .group_by(route.day)
+    ):
+        day_row(row[0]).update(flight_bookings=row[1], flight_revenue=row[2])
+    return [days[day] for day in sorted(days)]
+
+
+def get_accommodation_occupancy(
+    db: Session, start_date: date, end_date: date, limit: int = 20
+):
+    stat = models.AccommodationDailyStat
+    period_days = max((end_date - start_date).days, 1)
+    nights = func.sum(stat.nights).label("nights")
+    rows = db.execute(
+        select(
+            stat.accommodation_id,
+            models.Accommodation.name,
+            func.sum(stat.bookings).label("bookings"),
+            nights,
+            func.sum(stat.revenue).label("revenue"),
+        )
+        .join(models.Accommodation, models.Accommodation.id == stat.accommodation_id)
+        .where(stat.day >= start_date, stat.day < end_date)
+        .group_by(stat.accommodation_id, models.Accommodation.name)
+        .order_by(nights.desc(), stat.accommodation_id)
+        .limit(limit)
+    ).mappings()
+    return [
+        {**row, "occupancy_rate": round(row["nights"] / period_days, 4)} for row in rows
+    ]
+
+
+def get_route_stats(db: Session, start_date: date, end_date: date, limit: int = 20):
+    stat = models.RouteDailyStat
+    revenue = func.sum(stat.revenue).label("revenue")
+    return (
+        db.execute(
+            select(
+                stat.departure_airport,
+                stat.arrival_airport,
+                func.sum(stat.bookings).label("bookings"),
+                revenue,
+            )
+            .where(stat.day >= start_date, stat.day < end_date)
+            .group_by(stat.departure_airport, stat.arrival_airport)
+            .order_by(revenue.desc())
+            .limit(limit)
+        )
+        .mappings()
+        .all()
+    )
 
 
 # --- Flight Booking CRUD ---
 def create_flight_booking(
-    db: Session, booking: schemas.FlightBookingCreate, flight_id: int, user_id: int
+    db: Session,
+    booking: schemas.FlightBookingCreate,
+    flight_id: int,
+    user_id: int,
+    idempotent: Optional[idempotency.IdempotentRequest] = None,
 ):
-    db_booking = models.FlightBooking(
-        **booking.dict(), flight_id=flight_id, user_id=user_id
+    """항공편이 있으면 예약을 생성합니다. 없으면 None 을 반환합니다.
+
+    좌석 재고가 있는 항공편이면 좌석을 하나 꺼내 보류합니다. 매진이면 seats.SoldOut,
+    없는 등급이면 seats.UnknownFareClass 이며 트랜잭션은 롤백됩니다.
+    """
+    claim = idempotency.claim(db, idempotent) if idempotent else None
+    fare_class = booking.fare_class or seats.DEFAULT_FARE_CLASS
+    try:
+        reservation = seats.reserve(db, flight_id, fare_class)
+    except seats.SeatError:
+        db.rollback()
+        raise
+    if reservation is None:
+        # 좌석 수 제한이 없는 항공편입니다.
+        fare_class, shard, hold_expires_at = booking.fare_class, None, None
+    else:
+        fare_class, shard, hold_expires_at = reservation
+    # 항공편 존재 확인과 INSERT 를 한 문장(INSERT ... SELECT ... RETURNING)으로 수행합니다.
+    candidate = select(
+        literal(booking.booking_date, Date),
+        literal("pending"),
+        literal(user_id),
+        models.Flight.id,
+        models.Flight.price,
+        literal(fare_class, String),
+        literal(shard, Integer),
+        literal(hold_expires_at, DateTime),
+    ).where(models.Flight.id == flight_id)
+    stmt = (
+        insert(models.FlightBooking)
+        .from_select(
+            [
+                "booking_date",
+                "status",
+                "user_id",
+                "flight_id",
+                "price",
+                "fare_class",
+                "seat_shard",
+                "hold_expires_at",
+            ],
+            candidate,
+        )
+        .returning(models.FlightBooking)
+    )
+    db_booking = db.scalars(stmt).first()
+    if db_booking is None:
+        db.rollback()
+        return None
+    rollups.record_flight_booking(
+        db, flight_id=flight_id, status="pending", price=db_booking.price
     )
-    db.add(db_booking)
+    # 항공편 응답에는 예약 목록이 포함됩니다.
+    response_cache.invalidate(db, response_cache.FLIGHTS)
+    response = schemas.FlightBooking.model_validate(db_booking)
+    outbox.enqueue(db, outbox.FLIGHT_BOOKING_CREATED, response)
+    if claim is not None:
+        idempotency.complete(claim, 200, response)
     db.commit()
-    db.refresh(db_booking)
     return db_booking
 
 
+def update_flight_booking_status(
+    db: Session, booking_id: int, user_id: int, new_status: str
+):
+    """사용자 본인의 항공권 예약을 확정(결제)하거나 취소합니다. (결과, 예약) 을 돌려줍니다.
+
+    결과는 "updated", "unchanged", "not_found", "invalid_transition", "hold_expired",
+    "version_conflict"(그 사이 다른 요청이 상태를 바꿈) 중 하나입니다.
+    취소하면 보류 중이던(또는 확정된) 좌석을 재고에 돌려놓습니다.
+    """
+    booking = models.FlightBooking
+    db_booking = db.scalars(
+        select(booking).where(booking.id == booking_id, booking.user_id == user_id)
+    ).first()
+    if db_booking is None:
+        return "not_found", None
+    old_status = db_booking.status or "pending"
+    now = seats.utcnow()
+    if old_status == new_status:
+        return "unchanged", db_booking
+    if new_status not in BOOKING_STATUS_TRANSITIONS.get(old_status, ()):
+        return "invalid_transition", db_booking
+    if (
+        new_status == "confirmed"
+        and db_booking.hold_expires_at is not None
+        and db_booking.hold_expires_at <= now
+    ):
+        # 스위퍼가 아직 돌지 않았어도 보류 시간이 지난 예약은 확정할 수 없습니다.
+        return "hold_expired", db_booking
+
+    # 읽은 상태 그대로일 때만 바꿉니다. 확정은 UPDATE 시점에도 보류가 유효해야 합니다.
+    conditions = [booking.id == booking_id, booking.status == db_booking.status]
+    if new_status == "confirmed":
+        conditions.append(
+            booking.hold_expires_at.is_(None) | (booking.hold_expires_at > now)
+        )
+    # RETURNING 으로 세션의 객체를 갱신해 커밋 뒤 다시 조회하지 않습니다.
+    # (쓰기 잠금을 쥔 채 커넥션을 하나 더 꺼내면 잠금을 기다리는 요청들과 서로 막힙니다)
+    updated = db.scalars(
+        update(booking)
+        .where(*conditions)
+        .values(status=new_status, hold_expires_at=None)
+        .returning(booking)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
+    if updated is None:
+        db.rollback()
+        return "version_conflict", None
+    if new_status == rollups.CANCELLED:
+        seats.release(db, [(updated.flight_id, updated.fare_class, updated.seat_shard)])
+    rollups.record_flight_status_changes(db, [(updated, old_status, new_status)])
+    response_cache.invalidate(db, response_cache.FLIGHTS)
+    db.commit()
+    return "updated", updated
+
+
 def get_user_flight_bookings(db: Session, user_id: int):
     return (
         db.query(models.FlightBooking)
+        .options(joinedload(models.FlightBooking.flight))
         .filter(models.FlightBooking.user_id == user_id)
         .all()
     )
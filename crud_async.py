@@ -0,0 +1,120 @@
+# backend/crud_async.py
+#
+# crud.py 의 함수들을 AsyncSession 에서 사용하기 위한 비동기 CRUD 계층입니다.
+# AsyncSession.run_sync 는 동기 함수를 greenlet 안에서 실행하므로, 쿼리 로직은 crud.py 한 곳에
+# 두면서도 DB I/O 는 이벤트 루프를 막지 않고 비동기 드라이버(aiosqlite/asyncpg)로 처리됩니다.
+#
+# 주의: 반환된 ORM 객체는 세션 밖(응답 직렬화, 템플릿 렌더링)에서 lazy load 할 수 없습니다.
+# 응답에 필요한 관계는 crud.py 의 각 함수가 미리 로딩해 두어야 합니다.
+
+import functools
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bulk_import
+import crud
+import database
+import idempotency
+import schemas
+import security
+
+
+def _run_sync(fn):
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+
+    return wrapper
+
+
+async def _run_write_sync(db: AsyncSession, fn, *args, **kwargs):
+    # 커넥션을 먼저 잡은 뒤 쓰기 잠금을 기다립니다. 잠금을 쥔 채 풀에서 커넥션을 기다리면
+    # 커넥션을 쥐고 잠금을 기다리는 다른 요청들과 서로 막힐 수 있습니다.
+    await db.connection()
+    async with database.async_write_lock():
+        return await db.run_sync(fn, *args, **kwargs)
+
+
+def _run_write(fn):
+    """쓰기 트랜잭션을 커밋하는 crud 함수용. SQLite 에서는 프로세스 안의 쓰기를 차례로 실행합니다."""
+
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await _run_write_sync(db, fn, *args, **kwargs)
+
+    return wrapper
+
+
+# --- Accommodation CRUD ---
+get_accommodation = _run_sync(crud.get_accommodation)
+get_accommodations = _run_sync(crud.get_accommodations)
+get_accommodation_rows = _run_sync(crud.get_accommodation_rows)
+get_accommodation_cards = _run_sync(crud.get_accommodation_cards)
+create_accommodation = _run_write(crud.create_accommodation)
+update_accommodation = _run_write(crud.update_accommodation)
+delete_accommodation = _run_write(crud.delete_accommodation)
+
+# --- Flight CRUD ---
+get_flight = _run_sync(crud.get_flight)
+get_flights = _run_sync(crud.get_flights)
+get_flight_rows = _run_sync(crud.get_flight_rows)
+create_flight = _run_write(crud.create_flight)
+get_flight_seat_availability = _run_sync(crud.get_flight_seat_availability)
+add_flight_fare = _run_write(crud.add_flight_fare)
+
+
+async def write_flights_chunk(db: AsyncSession, chunk):
+    # 대량 적재(POST /api/flights/bulk)의 청크 하나를 쓰고 커밋합니다.
+    # bulk_import 가 이 모듈을 import 하므로 함수는 호출할 때 찾습니다.
+    return await _run_write_sync(db, bulk_import.write_flights, chunk)
+
+
+# --- User CRUD ---
+get_user_by_email = _run_sync(crud.get_user_by_email)
+get_users = _run_sync(crud.get_users)
+update_user_password_hash = _run_write(crud.update_user_password_hash)
+
+
+async def create_user(
+    db: AsyncSession, user: schemas.UserCreate, hashed_password: Optional[str] = None
+):
+    # argon2 해싱은 CPU 를 오래 쓰므로 이벤트 루프가 아닌 해싱 전용 워커 풀에서 수행합니다.
+    if hashed_password is None:
+        hashed_password = await security.hash_password_async(user.password)
+    return await _run_write_sync(
+        db, crud.create_user, user, hashed_password=hashed_password
+    )
+
+
+# --- Accommodation Availability ---
+get_overlapping_bookings = _run_sync(crud.get_overlapping_bookings)
+is_accommodation_available = _run_sync(crud.is_accommodation_available)
+
+# --- Accommodation Booking CRUD ---
+create_accommodation_booking = _run_write(crud.create_accommodation_booking)
+get_user_accommodation_bookings = _run_sync(crud.get_user_accommodation_bookings)
+get_all_accommodation_bookings = _run_sync(crud.get_all_accommodation_bookings)
+update_accommodation_booking_statuses = _run_write(
+    crud.update_accommodation_booking_statuses
+)
+update_accommodation_booking_status = _run_write(
+    crud.update_accommodation_booking_status
+)
+
+# --- Flight Booking CRUD ---
+create_flight_booking = _run_write(crud.create_flight_booking)
+update_flight_booking_status = _run_write(crud.update_flight_booking_status)
+get_user_flight_bookings = _run_sync(crud.get_user_flight_bookings)
+
+# --- Idempotency keys ---
+get_idempotent_response = _run_sync(idempotency.lookup)
+
+# --- Admin Stats ---
+get_booking_status_counts = _run_sync(crud.get_booking_status_counts)
+get_daily_revenue = _run_sync(crud.get_daily_revenue)
+get_accommodation_occupancy = _run_sync(crud.get_accommodation_occupancy)
+get_route_stats = _run_sync(crud.get_route_stats)
+
+# --- My Bookings (itinerary view) ---
+get_user_itinerary = _run_sync(crud.get_user_itinerary)
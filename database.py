@@ -1,11 +1,57 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextlib
+import weakref
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL # connect_args는 SQLite 동기 드라이버에서 필요 없습니다.
+
+# --- 엔진 설정 ---
+def _is_sqlite_memory(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url) -> dict:
+    """Settings 의 풀 설정을 create_engine / create_async_engine 인자로 만듭니다."""
+    if _is_sqlite_memory(url):
+        # 메모리 DB 는 연결마다 별개의 DB 이므로 하나의 연결을 공유합니다.
+        return {"poolclass": StaticPool}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine):
+    """SQLite 라면 새 연결마다 PRAGMA 를 적용합니다. (비동기 엔진은 .sync_engine 을 넘깁니다)"""
+    if engine.dialect.name == "sqlite" and not _is_sqlite_memory(engine.url):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+engine = configure_engine(
+    create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -17,4 +63,129 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# --- 비동기 엔진/세션 ---
+# 같은 DB 를 비동기 드라이버로 접속합니다. (SQLite → aiosqlite, PostgreSQL → asyncpg)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str):
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise ValueError(f"비동기 드라이버를 지원하지 않는 DB 입니다: {url.drivername}")
+    return url.set(drivername=drivername)
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(
+    SQLALCHEMY_DATABASE_URL
+)
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, **engine_options(ASYNC_SQLALCHEMY_DATABASE_URL)
+)
+configure_engine(async_engine.sync_engine)
+
+# 커밋 후에도 객체 속성을 만료시키지 않아야 응답 직렬화 시 추가 I/O 가 발생하지 않습니다.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# --- SQLite 쓰기 직렬화 ---
+# SQLite 는 DB 전체에 쓰기 트랜잭션이 하나뿐이라, 동시에 들어온 쓰기는 busy_timeout 동안 잠금을
+# 폴링하다 시간이 지나면 "database is locked" 로 실패합니다. 같은 프로세스의 비동기 쓰기는 이 잠금에서
+# 순서대로 기다리게 합니다. (다른 워커 프로세스와의 경합은 여전히 busy_timeout 이 처리합니다)
+class WriteLock:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        # asyncio.Lock 은 이벤트 루프에 묶이므로 루프마다 하나씩 만듭니다.
+        self._locks = weakref.WeakKeyDictionary()
+
+    def __call__(self):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+
+async_write_lock = WriteLock(async_engine.dialect.name == "sqlite")
+
+
+async def _run_in_write_session(fn, *args, **kwargs):
+    async with AsyncSessionLocal() as db:
+        # 커넥션을 먼저 잡고 잠금을 기다립니다. (crud_async._run_write_sync 와 같은 순서)
+        await db.connection()
+        async with async_write_lock():
+            return await db.run_sync(fn, *args, **kwargs)
+
+
+async def run_in_write_session(fn, *args, **kwargs):
+    """백그라운드 작업용. 새 세션에서 동기 함수 fn(db, ...) 를 쓰기 잠금을 쥐고 실행합니다.
+
+    앱 종료 때 작업이 취소되어도 DB 작업(커밋/롤백과 세션 정리)을 마친 뒤에 취소를 전파합니다.
+    중간에 끊기면 SQLite 쓰기 트랜잭션이 열린 채 남아 다른 연결이 "database is locked" 가 됩니다.
+    """
+    task = asyncio.ensure_future(_run_in_write_session(fn, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        if not task.cancelled():
+            task.exception()  # 결과는 버리고 취소만 전파합니다.
+        raise
+
+
+# --- 읽기 전용 복제본 ---
+# READ_REPLICA_URL 이 없으면 주 DB 엔진을 그대로 씁니다. 복제 지연이 있을 수 있으므로
+# 방금 쓴 내용을 바로 읽어야 하는 조회(내 예약, 관리자 예약 목록 등)는 get_async_db 를 씁니다.
+if settings.READ_REPLICA_URL:
+    read_engine = configure_engine(
+        create_engine(settings.READ_REPLICA_URL, **engine_options(settings.READ_REPLICA_URL))
+    )
+    ASYNC_READ_REPLICA_URL = settings.ASYNC_READ_REPLICA_URL or to_async_url(
+        settings.READ_REPLICA_URL
+    )
+    async_read_engine = create_async_engine(
+        ASYNC_READ_REPLICA_URL, **engine_options(ASYNC_READ_REPLICA_URL)
+    )
+    configure_engine(async_read_engine.sync_engine)
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+if settings.READ_REPLICA_URL:
+    def get_read_db():
+        db = ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_read_db():
+        async with AsyncReadSessionLocal() as db:
+            yield db
+else:
+    # 복제본이 없으면 같은 의존성 함수를 가리켜, 한 요청 안에서 인증 등 다른 의존성과
+    # 세션(=커넥션)을 공유합니다. 따로 열면 요청 하나가 같은 풀의 커넥션을 두 개 잡아
+    # 동시 요청이 풀 크기를 넘을 때 서로를 기다리며 멈출 수 있습니다.
+    get_read_db = get_db
+    get_async_read_db = get_async_db
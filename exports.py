@@ -0,0 +1,72 @@
+# backend/exports.py
+#
+# 관리자용 대용량 내보내기(NDJSON/CSV)입니다.
+# 결과를 리스트로 모으지 않고 서버 측 커서(stream + yield_per)로 YIELD_PER 행씩 읽어 바로 내보내므로,
+# 테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+# yield 의존성은 응답 본문을 모두 보낸 뒤에 정리되므로(FastAPI 0.118+) 요청 세션으로 그대로 읽습니다.
+
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+YIELD_PER = 1_000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+# --- 예약 내보내기 조건 (API/관리자 페이지 공용) ---
+def booking_export_params(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    start_from: Optional[date] = Query(None, alias="from"),
+    start_to: Optional[date] = Query(None, alias="to"),
+) -> dict:
+    if start_from and start_to and start_to <= start_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="종료 날짜는 시작 날짜 이후여야 합니다.",
+        )
+    return {"status": status_filter, "start_from": start_from, "start_to": start_to}
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(dict(row), ensure_ascii=False, default=str) + "\n" for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(row.values() for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(db: AsyncSession, query: Select, fmt: str) -> AsyncIterator[str]:
+    result = await db.stream(query.execution_options(yield_per=YIELD_PER))
+    if fmt == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙입니다.
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(result.keys())
+        yield "﻿" + buffer.getvalue()
+    serialize = _csv_chunk if fmt == "csv" else _ndjson_chunk
+    async for rows in result.mappings().partitions():
+        yield serialize(rows)
+
+
+def streaming_response(
+    db: AsyncSession, query: Select, fmt: str, filename: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(db, query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
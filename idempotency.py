@@ -0,0 +1,136 @@
+# backend/idempotency.py
+#
+# 예약 생성 API 의 Idempotency-Key 지원입니다. 클라이언트가 타임아웃 뒤 같은 키로 다시 보내면
+# 예약을 새로 만들지 않고 처음 응답을 그대로 돌려줍니다. (키 조회 한 번으로 끝납니다)
+#
+#   - 키는 사용자별입니다. (user_id, key) 가 idempotency_keys 의 기본 키입니다.
+#   - crud 는 예약 INSERT 보다 먼저 키 행을 INSERT 해 두고(claim), 같은 트랜잭션에서 응답을 채워 커밋합니다.
+#     같은 키로 동시에 들어온 두 번째 요청은 기본 키 충돌로 KeyInUse 가 나며, 먼저 커밋된 응답을 돌려받습니다.
+#     예약이 실패해 롤백되면 키 행도 함께 사라지므로, 실패 응답(404/409)은 저장되지 않고 재시도 시 다시 검사합니다.
+#   - 같은 키를 다른 요청(메서드·경로·본문)에 쓰면 KeyReused(422) 로 거절합니다.
+#   - IDEMPOTENCY_KEY_TTL_HOURS 가 지난 키는 없는 것으로 보며 `python manage.py purge-idempotency-keys` 로 지웁니다.
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import models
+from config import settings
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+class KeyReused(ValueError):
+    pass
+
+
+class KeyInUse(Exception):
+    """같은 키의 다른 요청이 먼저 기록했습니다. (동시 재시도)"""
+
+
+class IdempotentRequest(NamedTuple):
+    user_id: int
+    key: str
+    request_hash: str
+
+
+def request_for(
+    user_id: int, key: Optional[str], method: str, path: str, payload: BaseModel
+) -> Optional[IdempotentRequest]:
+    """헤더가 없으면 None."""
+    if not key:
+        return None
+    digest = hashlib.sha256(
+        f"{method} {path}\n{payload.model_dump_json()}".encode()
+    ).hexdigest()
+    return IdempotentRequest(user_id, key, digest)
+
+
+def _utcnow() -> datetime:
+    # created_at 은 시간대 없는 UTC 로 저장합니다.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _expired_before() -> datetime:
+    return _utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+# --- 조회 / 기록 (crud 트랜잭션 안에서 사용) ---
+def _key_filter(request: IdempotentRequest):
+    return (
+        models.IdempotencyKey.user_id == request.user_id,
+        models.IdempotencyKey.key == request.key,
+    )
+
+
+def lookup(db: Session, request: IdempotentRequest) -> Optional[models.IdempotencyKey]:
+    """저장된 응답이 있으면 돌려줍니다. 만료된 키는 없는 것으로 봅니다. (SELECT 만 실행)"""
+    row = db.scalars(
+        select(models.IdempotencyKey).where(
+            *_key_filter(request),
+            models.IdempotencyKey.created_at >= _expired_before(),
+        )
+    ).first()
+    if row is None:
+        return None
+    if row.request_hash != request.request_hash:
+        raise KeyReused("이 Idempotency-Key 는 다른 요청에 이미 사용되었습니다.")
+    return row
+
+
+def claim(db: Session, request: IdempotentRequest) -> models.IdempotencyKey:
+    """키 행을 먼저 INSERT 합니다. 이미 있으면(동시 요청) 롤백하고 KeyInUse."""
+    # 같은 키의 만료된 행이 남아 있으면 지우고 새로 씁니다. (lookup 은 만료된 행을 건너뜁니다)
+    db.execute(
+        delete(models.IdempotencyKey).where(
+            *_key_filter(request),
+            models.IdempotencyKey.created_at < _expired_before(),
+        )
+    )
+    row = models.IdempotencyKey(
+        user_id=request.user_id,
+        key=request.key,
+        request_hash=request.request_hash,
+        created_at=_utcnow(),
+    )
+    db.add(row)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise KeyInUse()
+    return row
+
+
+def complete(row: models.IdempotencyKey, status_code: int, body: BaseModel):
+    """claim 한 행에 응답을 채웁니다. 커밋은 호출한 crud 함수가 합니다."""
+    row.status_code = status_code
+    row.response_body = body.model_dump_json()
+
+
+def purge_expired(db: Session) -> int:
+    result = db.execute(
+        delete(models.IdempotencyKey).where(
+            models.IdempotencyKey.created_at < _expired_before()
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+# --- 라우터용 ---
+def replay(row: models.IdempotencyKey) -> Response:
+    return Response(
+        content=row.response_body,
+        status_code=row.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
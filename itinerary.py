@@ -0,0 +1,274 @@
+# backend/itinerary.py
+#
+# 직항뿐 아니라 1회/2회 경유 여정을 찾는 여정 검색 엔진입니다.
+# flights 테이블 전체를 출발 공항별·출발 시각순 인접 리스트로 메모리에 올려 두고,
+# 각 공항에서 "도착 + 최소 환승 시간" 이후 출발편만 bisect 로 잘라 탐색합니다.
+# 마지막 구간은 (출발, 도착) 노선 인덱스에서 바로 찾고, 최저가/최단 상위 k개 힙에 더는
+# 들어갈 수 없는 경로는 중간에 잘라내므로 허브 공항이 많은 스케줄에서도 탐색 범위가 작게 유지됩니다.
+# crud.create_flight 가 새 항공편을 add_flight 로 즉시 반영하고, 다른 워커 프로세스에서
+# 추가된 항공편은 ITINERARY_REFRESH_SECONDS 마다 전체 재적재로 따라잡습니다.
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import models
+from config import settings
+
+
+class Leg(NamedTuple):
+    departure_time: datetime
+    id: int
+    departure_airport: str
+    arrival_airport: str
+    arrival_time: datetime
+    price: int
+
+
+class Itinerary(NamedTuple):
+    legs: List[Leg]
+    total_price: int
+    departure_time: datetime
+    arrival_time: datetime
+    duration_minutes: int
+    stops: int
+
+
+def leg_from_flight(flight) -> Leg:
+    return Leg(
+        departure_time=flight.departure_time,
+        id=flight.id,
+        departure_airport=flight.departure_airport,
+        arrival_airport=flight.arrival_airport,
+        arrival_time=flight.arrival_time,
+        price=flight.price,
+    )
+
+
+def _build_itinerary(legs: List[Leg]) -> Itinerary:
+    departure, arrival = legs[0].departure_time, legs[-1].arrival_time
+    return Itinerary(
+        legs=list(legs),
+        total_price=sum(leg.price or 0 for leg in legs),
+        departure_time=departure,
+        arrival_time=arrival,
+        duration_minutes=int((arrival - departure).total_seconds() // 60),
+        stops=len(legs) - 1,
+    )
+
+
+class _TopK:
+    """key 가 작은 순으로 k개만 유지합니다. (heapq 는 최소 힙이라 키를 음수로 넣어 최대 힙처럼 씁니다)"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._counter = itertools.count()
+
+    def worst(self):
+        # 가득 차기 전에는 어떤 후보든 들어갈 수 있으므로 상한이 없습니다.
+        if len(self._heap) < self.k:
+            return None
+        return tuple(-value for value in self._heap[0][0])
+
+    def accepts(self, key) -> bool:
+        worst = self.worst()
+        return worst is None or key < worst
+
+    def push(self, key, item):
+        entry = (tuple(-value for value in key), next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif key < self.worst():
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+class RouteGraph:
+    def __init__(self):
+        # 공항 → 출발 시각순 Leg 리스트. Leg 는 출발 시각이 첫 필드라 그대로 정렬/bisect 됩니다.
+        self._by_origin = defaultdict(list)
+        # (출발, 도착) 노선 → 출발 시각순 Leg 리스트. 마지막 구간은 목적지 노선만 바로 찾습니다.
+        self._by_route = defaultdict(list)
+        self._ids = set()
+        # 마지막 전체 적재 이후 add_flight 로 들어온 항공편 (재적재 스냅샷에 빠졌을 수 있음)
+        self._added = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    # --- 적재 / 증분 반영 ---
+    def load(self, legs: Iterable[Leg]):
+        legs = {
+            leg.id: leg
+            for leg in legs
+            if leg.departure_time is not None and leg.arrival_time is not None
+        }
+        with self._lock:
+            # 적재 중에 add_flight 로 들어온 항공편이 사라지지 않도록 합쳐 줍니다.
+            for leg in self._added.values():
+                legs.setdefault(leg.id, leg)
+            by_origin, by_route = defaultdict(list), defaultdict(list)
+            for leg in sorted(legs.values()):
+                by_origin[leg.departure_airport].append(leg)
+                by_route[(leg.departure_airport, leg.arrival_airport)].append(leg)
+            self._by_origin, self._by_route = by_origin, by_route
+            self._ids, self._added = set(legs), {}
+            self.loaded_at = time.monotonic()
+
+    def add_flight(self, flight):
+        leg = leg_from_flight(flight)
+        if leg.departure_time is None or leg.arrival_time is None:
+            return
+        with self._lock:
+            if leg.id in self._ids:
+                return
+            insort(self._by_origin[leg.departure_airport], leg)
+            insort(self._by_route[(leg.departure_airport, leg.arrival_airport)], leg)
+            self._ids.add(leg.id)
+            self._added[leg.id] = leg
+
+    def mark_stale(self):
+        # 대량 적재처럼 add_flight 로 하나씩 넣기엔 많은 변경 뒤에 호출합니다. 다음 검색 때 다시 적재합니다.
+        self.loaded_at = None
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > max_age_seconds
+        )
+
+    # --- 탐색 ---
+    @staticmethod
+    def _window(legs: List[Leg], earliest: datetime, latest: datetime):
+        if not legs:
+            return []
+        start = bisect_left(legs, (earliest,))
+        end = bisect_left(legs, (latest,), lo=start)
+        return legs[start:end]
+
+    def _copy_window(self, index: dict, key, earliest: datetime, latest: datetime):
+        # 잠금은 구간을 잘라 복사하는 동안만 잡습니다. 탐색은 이 사본으로 하므로
+        # add_flight / load 가 검색이 끝날 때까지 기다리지 않습니다.
+        with self._lock:
+            return self._window(index.get(key), earliest, latest)
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        earliest: datetime,
+        latest: datetime,
+        max_stops: int = 2,
+        min_connection: timedelta = timedelta(minutes=60),
+        max_connection: timedelta = timedelta(hours=6),
+        k: int = 5,
+    ) -> dict:
+        """earliest~latest 사이에 출발하는 여정 중 가장 싼 k개와 가장 빠른 k개를 돌려줍니다."""
+        cheapest, fastest = _TopK(k), _TopK(k)
+        # load 가 인덱스를 통째로 바꿔도 한 검색은 같은 인덱스만 보도록 시작할 때 잡아 둡니다.
+        with self._lock:
+            by_origin, by_route = self._by_origin, self._by_route
+
+        def offer(path: List[Leg]):
+            price = sum(leg.price or 0 for leg in path)
+            duration = path[-1].arrival_time - path[0].departure_time
+            by_price, by_duration = (price, duration), (duration, price)
+            if cheapest.accepts(by_price) or fastest.accepts(by_duration):
+                built = _build_itinerary(path)
+                cheapest.push(by_price, built)
+                fastest.push(by_duration, built)
+
+        def hopeless(path: List[Leg]) -> bool:
+            # 지금까지의 가격·소요 시간만으로도 두 목록 모두에 못 들어가면 더 이어 붙일 필요가 없습니다.
+            price = sum(leg.price or 0 for leg in path)
+            duration = path[-1].arrival_time + min_connection - path[0].departure_time
+            worst_price, worst_duration = cheapest.worst(), fastest.worst()
+            return (
+                worst_price is not None
+                and worst_duration is not None
+                and price >= worst_price[0]
+                and duration >= worst_duration[0]
+            )
+
+        def connections(leg: Leg, index: dict, key):
+            return self._copy_window(
+                index,
+                key,
+                leg.arrival_time + min_connection,
+                leg.arrival_time + max_connection,
+            )
+
+        def extend(path: List[Leg], stops_left: int):
+            last = path[-1]
+            # 목적지로 바로 가는 마지막 구간은 노선 인덱스에서 찾습니다.
+            for leg in connections(last, by_route, (last.arrival_airport, destination)):
+                offer(path + [leg])
+            if stops_left == 0 or hopeless(path):
+                return
+            visited = {origin, destination, *(leg.arrival_airport for leg in path)}
+            for leg in connections(last, by_origin, last.arrival_airport):
+                if leg.arrival_airport in visited:
+                    continue
+                path.append(leg)
+                if not hopeless(path):
+                    extend(path, stops_left - 1)
+                path.pop()
+
+        for leg in self._copy_window(by_route, (origin, destination), earliest, latest):
+            offer([leg])
+        if max_stops > 0:
+            for leg in self._copy_window(by_origin, origin, earliest, latest):
+                if leg.arrival_airport in (origin, destination):
+                    continue
+                extend([leg], max_stops - 1)
+
+        return {"cheapest": cheapest.items(), "fastest": fastest.items()}
+
+
+route_graph = RouteGraph()
+
+
+def load_legs(db: Session) -> List[Leg]:
+    rows = db.execute(
+        select(
+            models.Flight.departure_time,
+            models.Flight.id,
+            models.Flight.departure_airport,
+            models.Flight.arrival_airport,
+            models.Flight.arrival_time,
+            models.Flight.price,
+        )
+    )
+    return [Leg(*row) for row in rows]
+
+
+def ensure_loaded(db: Session, graph: RouteGraph = route_graph) -> RouteGraph:
+    if graph.is_stale(settings.ITINERARY_REFRESH_SECONDS):
+        graph.load(load_legs(db))
+    return graph
+
+
+async def ensure_loaded_async(
+    db: AsyncSession, graph: RouteGraph = route_graph
+) -> RouteGraph:
+    """비동기 경로용 ensure_loaded 입니다. 항공편은 세션으로 읽고, 전체 정렬과 인덱스 재구성은
+    스레드에서 해 재적재 동안에도 이벤트 루프가 다른 요청을 처리하게 합니다."""
+    if graph.is_stale(settings.ITINERARY_REFRESH_SECONDS):
+        legs = await db.run_sync(load_legs)
+        await asyncio.to_thread(graph.load, legs)
+    return graph
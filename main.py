@@ -1,11 +1,47 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from database import engine, Base
+import capture
+import idempotency
+import metrics
+import outbox
+import pagination
+import response_cache
+import search
+import seats
+import security
+import templating
+from config import settings
+from database import async_engine, async_read_engine, engine, read_engine, Base
 from routers import accommodations, flights, users, auth, pages, bookings, admin, admin_pages
 
 Base.metadata.create_all(bind=engine)
-app = FastAPI()
+search.install(engine)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 결제(확정)되지 않은 좌석 보류를 주기적으로 풀어 줍니다. 워커 프로세스마다 돌지만
+    # 조건부 UPDATE 라 같은 예약을 두 번 취소하지 않습니다.
+    sweeper = None
+    if settings.SEAT_HOLD_SWEEP_SECONDS > 0:
+        sweeper = asyncio.create_task(seats.run_sweeper())
+    # 예약 후처리 이벤트(outbox)를 요청 경로 밖에서 처리하는 워커들입니다.
+    if settings.OUTBOX_WORKERS > 0:
+        outbox.pool.start()
+    yield
+    await outbox.pool.stop()
+    if sweeper is not None:
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+
+
+app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 origins = ["*"]
@@ -15,8 +51,76 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        pagination.NEXT_CURSOR_HEADER,
+        "ETag",
+        response_cache.CACHE_STATUS_HEADER,
+        idempotency.REPLAYED_HEADER,
+    ],
 )
 
+# --- 요청 캡처 (REQUEST_CAPTURE_PATH 를 지정한 경우에만) ---
+capture_writer = capture.install(app)
+
+# --- 계측 (GET /metrics) ---
+# 내부망의 Prometheus 가 수집하는 것을 전제로 인증 없이 공개합니다.
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine, "sync")
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    if read_engine is not engine:
+        metrics.instrument_engine(read_engine, "replica")
+        metrics.instrument_engine(async_read_engine.sync_engine, "async_replica")
+    metrics.stats_collector("principal_cache", "인증 사용자 캐시", security.principal_cache.stats)
+    metrics.stats_collector("response_cache", "응답 캐시", response_cache.backend.stats)
+    metrics.stats_collector("password_hashing", "비밀번호 해싱 풀", security.hashing_pool.stats)
+    metrics.stats_collector("template_fragment_cache", "페이지 조각 캐시", templating.fragment_cache.stats)
+    metrics.stats_collector("outbox", "예약 후처리 큐", outbox.pool.stats)
+    if capture_writer is not None:
+        metrics.stats_collector("request_capture", "요청 캡처", capture_writer.stats)
+    # CORS 밖(가장 바깥)에 두어 미들웨어를 포함한 전체 처리 시간을 잽니다.
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.exception_handler(security.HashingOverloaded)
+async def hashing_overloaded_handler(request: Request, exc: security.HashingOverloaded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(pagination.InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: pagination.InvalidCursor):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(idempotency.KeyReused)
+async def idempotency_key_reused_handler(request: Request, exc: idempotency.KeyReused):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(seats.SoldOut)
+async def seats_sold_out_handler(request: Request, exc: seats.SoldOut):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT, content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(seats.UnknownFareClass)
+async def unknown_fare_class_handler(request: Request, exc: seats.UnknownFareClass):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)}
+    )
+
 app.include_router(pages.router)
 app.include_router(accommodations.router)
 app.include_router(flights.router)
@@ -26,6 +130,9 @@ app.include_router(bookings.router)
 app.include_router(admin.router)
 app.include_router(admin_pages.router)
 
+# 첫 요청이 템플릿 컴파일 비용을 내지 않도록 시작 시 모두 컴파일해 둡니다.
+templating.precompile()
+
 @app.get("/api-root")
 def read_api_root():
     return {"message": "API 서버 루트"}
\ No newline at end of file
@@ -1,21 +1,40 @@
 # manage.py (전체 수정 코드)
 
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
 from typing_extensions import Annotated
 
 import typer
 from sqlalchemy.orm import Session
 
+import bulk_import
 import crud
+import idempotency
+import migrations
 import models
+import outbox
+import rollups
 import schemas
 import security
 from database import SessionLocal, engine
 
 models.Base.metadata.create_all(bind=engine)
 
-# app = typer.Typer() 와 @app.command()를 제거하고,
-# 함수 이름을 main으로 변경하거나 원하는 이름으로 둡니다.
-def main(
+# 하위 명령이 여러 개가 되어 다시 typer.Typer() 앱으로 구성합니다.
+#   python manage.py create-admin --email ... --password ...
+#   python manage.py migrate
+#   python manage.py import-flights schedule.csv
+#   python manage.py import-accommodations hotels.jsonl --owner-email admin@example.com
+#   python manage.py rebuild-rollups
+#   python manage.py purge-idempotency-keys
+#   python manage.py requeue-outbox
+app = typer.Typer()
+
+
+@app.command("create-admin")
+def create_admin(
     email: Annotated[str, typer.Option(help="관리자 계정으로 사용할 이메일 주소")],
     password: Annotated[str, typer.Option(help="새 관리자 계정의 비밀번호")]
 ):
@@ -47,6 +66,148 @@ def main(
 
     db.close()
 
-# 마지막 실행 부분을 typer.run(main)으로 변경합니다.
+
+@app.command("migrate")
+def migrate(
+    time_only_date: Annotated[
+        Optional[datetime],
+        typer.Option(
+            formats=["%Y-%m-%d"],
+            help="시각만 저장된 항공편 데이터('15:00')에 붙일 날짜 (YYYY-MM-DD)",
+        ),
+    ] = None,
+):
+    """
+    기존 DB 를 현재 스키마로 변환합니다. (컬럼 타입 변경, 누락된 인덱스 생성)
+    """
+    applied = migrations.upgrade(
+        engine, time_only_date=time_only_date.date() if time_only_date else None
+    )
+    if not applied:
+        print("적용할 마이그레이션이 없습니다.")
+        return
+    for name in applied:
+        print(f"✅ 적용: {name}")
+
+
+@app.command("rebuild-rollups")
+def rebuild_rollups():
+    """
+    관리자 통계 롤업 테이블을 예약 데이터에서 다시 계산합니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        result = rollups.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    print(
+        f"✅ 숙소 일자 {result['accommodation_days']}행, "
+        f"노선 일자 {result['route_days']}행, 상태 {result['statuses']}행을 다시 계산했습니다."
+    )
+
+
+@app.command("purge-idempotency-keys")
+def purge_idempotency_keys():
+    """
+    보관 기간(IDEMPOTENCY_KEY_TTL_HOURS)이 지난 예약 Idempotency-Key 를 지웁니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        deleted = idempotency.purge_expired(db)
+    finally:
+        db.close()
+    print(f"✅ 만료된 Idempotency-Key {deleted}개를 지웠습니다.")
+
+
+@app.command("requeue-outbox")
+def requeue_outbox(
+    topic: Annotated[
+        Optional[str], typer.Option(help="이 토픽의 이벤트만 다시 시도합니다.")
+    ] = None,
+):
+    """
+    재시도 횟수를 다 써 failed 로 남은 예약 후처리 이벤트를 다시 대기열에 넣습니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        requeued = outbox.requeue_failed(db, topic=topic)
+        remaining = outbox.counts(db)
+    finally:
+        db.close()
+    print(f"✅ 이벤트 {requeued}개를 다시 대기열에 넣었습니다. (상태별 {remaining})")
+
+
+def _print_import_report(report: dict, max_errors: int = 20):
+    print(
+        f"적재 {report['inserted']}건, 실패 {report['failed']}건, "
+        f"{report['seconds']}초 ({report['rows_per_second']} rows/s)"
+    )
+    for error in report["errors"][:max_errors]:
+        print(f"  {error['line']}행: {error['error']}")
+    if report["failed"] > max_errors:
+        print(f"  ... 외 {report['failed'] - max_errors}건")
+
+
+FormatOption = Annotated[
+    Optional[str],
+    typer.Option("--format", help="csv 또는 jsonl (기본: 파일 확장자로 판단)"),
+]
+ChunkSizeOption = Annotated[int, typer.Option(help="한 트랜잭션에 쓰는 행 수")]
+
+
+@app.command("import-flights")
+def import_flights(
+    path: Annotated[Path, typer.Argument(exists=True, dir_okay=False)],
+    fmt: FormatOption = None,
+    chunk_size: ChunkSizeOption = bulk_import.DEFAULT_CHUNK_SIZE,
+):
+    """
+    CSV/JSONL 파일의 항공편을 대량 적재합니다. 잘못된 행은 건너뛰고 보고합니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as lines:
+            report = bulk_import.import_flights(
+                db,
+                lines,
+                fmt=fmt or bulk_import.guess_format(path.name),
+                chunk_size=chunk_size,
+            )
+    finally:
+        db.close()
+    _print_import_report(report)
+
+
+@app.command("import-accommodations")
+def import_accommodations(
+    path: Annotated[Path, typer.Argument(exists=True, dir_okay=False)],
+    owner_email: Annotated[str, typer.Option(help="숙소 소유자로 지정할 사용자 이메일")],
+    fmt: FormatOption = None,
+    chunk_size: ChunkSizeOption = bulk_import.DEFAULT_CHUNK_SIZE,
+):
+    """
+    CSV/JSONL 파일의 숙소를 대량 적재합니다. 잘못된 행은 건너뛰고 보고합니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        owner = crud.get_user_by_email(db, email=owner_email)
+        if owner is None:
+            print(f"오류: 이메일 '{owner_email}' 사용자가 없습니다.")
+            return
+        with open(path, encoding="utf-8-sig", newline="") as lines:
+            report = bulk_import.import_accommodations(
+                db,
+                lines,
+                owner_id=owner.id,
+                fmt=fmt or bulk_import.guess_format(path.name),
+                chunk_size=chunk_size,
+            )
+    finally:
+        db.close()
+    _print_import_report(report)
+
+
 if __name__ == "__main__":
-    typer.run(main)
+    app()
+
@@ -0,0 +1,322 @@
+# backend/metrics.py
+#
+# 요청 지연 시간과 DB 쿼리 계측입니다. `GET /metrics` 가 Prometheus 텍스트 형식으로 내보냅니다.
+#   - http_request_duration_seconds: 라우트(경로 템플릿)·메서드·상태 코드별 지연 시간 히스토그램
+#   - http_request_db_statements / http_request_db_seconds: 요청 한 번에 실행한 SQL 문 수와 DB 시간
+#   - db_statement_duration_seconds: SQL 문 종류(SELECT/INSERT/...)별 실행 시간
+#   - db_pool_*: 커넥션 풀 게이지, 그 밖의 캐시/해싱 풀 상태는 register_collector 로 붙입니다.
+# SQL_SLOW_QUERY_MS 보다 오래 걸린 문장은 "metrics.slow_query" 로거에 경고로 남깁니다.
+#
+# 계측은 상시 켜 두는 것을 전제로 합니다. 요청마다 ContextVar 하나와 카운터 몇 개만 갱신하고,
+# 라벨은 경로 템플릿을 쓰므로 (/api/accommodations/{accommodation_id}) 시계열 수가 늘어나지 않습니다.
+# 외부 의존성 없이 동작하며, 값은 워커(프로세스)별입니다.
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+# 라우트에 매칭되지 않은 요청(404 등)은 경로를 라벨로 쓰지 않고 하나로 묶습니다.
+UNMATCHED_ROUTE = "<unmatched>"
+
+slow_query_logger = logging.getLogger("metrics.slow_query")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '%s="%s"'
+        % (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{%s}" % pairs
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# --- 메트릭 타입 ---
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 라벨 조합별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(counts)) for labels, counts in self._counts.items()]
+            sums = dict(self._sums)
+        names = self.labelnames + ("le",)
+        for labels, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield (
+                    self.name + "_bucket",
+                    _format_labels(names, labels + (_format_value(bound),)),
+                    cumulative,
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            yield self.name + "_sum", label_text, sums[labels]
+            yield self.name + "_count", label_text, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        # 수집 시점에 값을 읽는 게이지들: () -> [(이름, 도움말, {라벨: 값} 또는 None, 값)]
+        self._collectors: List[Callable[[], list]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], list]):
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        seen = set()
+        for collector in self._collectors:
+            for name, help, labels, value in collector():
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# HELP {name} {help}")
+                    lines.append(f"# TYPE {name} gauge")
+                labels = labels or {}
+                label_text = _format_labels(tuple(labels), tuple(labels.values()))
+                lines.append(f"{name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+register_collector = registry.register_collector
+
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP 요청 처리 시간(초)",
+        ("method", "route", "status"),
+    )
+)
+request_db_statements = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "요청 한 번에 실행한 SQL 문 수",
+        ("route",),
+        buckets=STATEMENT_BUCKETS,
+    )
+)
+request_db_seconds = registry.register(
+    Histogram(
+        "http_request_db_seconds", "요청 한 번의 SQL 실행 시간 합계(초)", ("route",)
+    )
+)
+statement_duration = registry.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "SQL 문 실행 시간(초)",
+        ("engine", "operation"),
+    )
+)
+slow_statements = registry.register(
+    Counter(
+        "db_slow_statements_total",
+        "SQL_SLOW_QUERY_MS 를 넘긴 SQL 문 수",
+        ("engine", "operation"),
+    )
+)
+
+
+# --- 요청별 DB 통계 ---
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "scope")
+
+    def __init__(self, scope: dict):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        # 라우터가 매칭한 경로 템플릿 (scope 는 라우팅 중에 갱신됩니다)
+        return getattr(self.scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+# 비동기 세션의 run_sync(그린렛)과 스레드풀에서 실행되는 동기 라우트에도 그대로 전달됩니다.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "metrics_current_request", default=None
+)
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:16].split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine, name: str = "primary"):
+    """동기 엔진(비동기 엔진은 .sync_engine)에 실행 시간 측정 이벤트를 답니다."""
+    slow_seconds = settings.SQL_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        operation = _operation(statement)
+        statement_duration.observe(elapsed, name, operation)
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+        if elapsed >= slow_seconds:
+            slow_statements.inc(name, operation)
+            slow_query_logger.warning(
+                "slow query %.1fms route=%s engine=%s: %s",
+                elapsed * 1000,
+                stats.route if stats is not None else "-",
+                name,
+                " ".join(statement.split())[:500],
+            )
+
+    def _pool_gauges():
+        pool = engine.pool
+        labels = {"engine": name}
+        gauges = []
+        for metric, help, method in (
+            ("db_pool_size", "커넥션 풀 크기", "size"),
+            ("db_pool_checked_out", "사용 중인 커넥션 수", "checkedout"),
+            ("db_pool_checked_in", "풀에서 대기 중인 커넥션 수", "checkedin"),
+            ("db_pool_overflow", "pool_size 를 넘어 연 커넥션 수", "overflow"),
+        ):
+            # StaticPool/NullPool 등은 일부 값을 제공하지 않습니다.
+            if hasattr(pool, method):
+                gauges.append((metric, help, labels, getattr(pool, method)()))
+        return gauges
+
+    register_collector(_pool_gauges)
+    return engine
+
+
+# --- ASGI 미들웨어 ---
+class MetricsMiddleware:
+    """요청 처리 시간과 요청별 SQL 통계를 기록합니다.
+
+    BaseHTTPMiddleware 와 달리 응답을 다시 감싸지 않는 순수 ASGI 미들웨어라 스트리밍 응답에도
+    추가 비용이 거의 없습니다. 시간은 응답 본문을 모두 보낸 시점까지 잽니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            route = stats.route
+            request_duration.observe(elapsed, scope["method"], route, str(status_code))
+            request_db_statements.observe(stats.statements, route)
+            request_db_seconds.observe(stats.db_seconds, route)
+
+
+def stats_collector(prefix: str, help: str, stats: Callable[[], dict]):
+    """cache.TTLCache.stats() 처럼 dict 를 돌려주는 함수를 {prefix}_{키} 게이지로 내보냅니다."""
+
+    def collect():
+        return [
+            (f"{prefix}_{key}", f"{help} ({key})", None, value)
+            for key, value in stats().items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+
+    return register_collector(collect)
+
+
+def render() -> str:
+    return registry.render()
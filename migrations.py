@@ -0,0 +1,276 @@
+# backend/migrations.py
+#
+# 기존 DB 를 현재 models.py 스키마에 맞추는 마이그레이션입니다. `python manage.py migrate` 로 실행합니다.
+# create_all 은 없는 테이블만 만들기 때문에, 이미 있는 테이블의 컬럼 타입 변경이나 새 인덱스는 여기서 처리합니다.
+# 각 단계는 현재 상태를 확인한 뒤 필요한 경우에만 실행되므로 여러 번 실행해도 안전합니다.
+
+from datetime import date, datetime, time, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, MetaData, inspect, select
+from sqlalchemy.orm import Session
+
+import models
+import rollups
+
+# 예전 문자열 컬럼에 들어 있을 수 있는 시각 형식들 (ISO 8601 은 fromisoformat 으로 먼저 시도)
+LEGACY_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y%m%d%H%M",
+)
+TIME_ONLY_FORMATS = ("%H:%M", "%H:%M:%S")
+
+
+def _parse_time_only(raw: str) -> Optional[time]:
+    for fmt in TIME_ONLY_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_legacy_datetime(value, time_only_date: Optional[date] = None):
+    if value is None or isinstance(value, datetime):
+        return value
+    raw = value.strip()
+    # 초기 데이터에는 날짜 없이 '15:00' 처럼 시각만 저장된 행이 있습니다.
+    # 날짜를 추측할 수 없으므로 운영자가 지정한 날짜(time_only_date)와 합칩니다.
+    time_only = _parse_time_only(raw)
+    if time_only is not None:
+        if time_only_date is None:
+            raise ValueError(
+                f"날짜 없이 시각만 있는 값입니다: {value!r} "
+                "(--time-only-date 로 적용할 날짜를 지정하세요)"
+            )
+        return datetime.combine(time_only_date, time_only)
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = None
+        for fmt in LEGACY_DATETIME_FORMATS:
+            try:
+                parsed = datetime.strptime(raw, fmt)
+                break
+            except ValueError:
+                continue
+        if parsed is None:
+            raise ValueError(f"시각 형식을 해석할 수 없습니다: {value!r}")
+    # 컬럼은 타임존 없는 UTC 시각으로 저장합니다.
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _is_datetime_column(connection, table_name: str, column_name: str) -> bool:
+    for column in inspect(connection).get_columns(table_name):
+        if column["name"] == column_name:
+            return isinstance(column["type"], DateTime)
+    return False
+
+
+# --- 0001: flights.departure_time / arrival_time 문자열 → DateTime ---
+def convert_flight_times(connection, options: dict):
+    if not inspect(connection).has_table("flights"):
+        return False
+    if _is_datetime_column(connection, "flights", "departure_time") and (
+        _is_datetime_column(connection, "flights", "arrival_time")
+    ):
+        return False
+
+    if connection.dialect.name == "postgresql":
+        for column in ("departure_time", "arrival_time"):
+            connection.exec_driver_sql(
+                f"ALTER TABLE flights ALTER COLUMN {column} TYPE TIMESTAMP "
+                f"USING {column}::timestamp"
+            )
+        return True
+
+    # SQLite 는 컬럼 타입을 바꿀 수 없어 권장 절차(새 테이블 생성 → 복사 → 교체)로 재구성합니다.
+    rows = connection.exec_driver_sql(
+        "SELECT id, departure_airport, arrival_airport, departure_time, "
+        "arrival_time, price FROM flights"
+    ).all()
+    converted = [
+        {
+            "id": row.id,
+            "departure_airport": row.departure_airport,
+            "arrival_airport": row.arrival_airport,
+            "departure_time": parse_legacy_datetime(
+                row.departure_time, options.get("time_only_date")
+            ),
+            "arrival_time": parse_legacy_datetime(
+                row.arrival_time, options.get("time_only_date")
+            ),
+            "price": row.price,
+        }
+        for row in rows
+    ]
+
+    staging = models.Flight.__table__.to_metadata(MetaData(), name="flights_new")
+    for index in list(staging.indexes):
+        staging.indexes.discard(index)
+    staging.create(connection)
+    if converted:
+        connection.execute(staging.insert(), converted)
+    connection.exec_driver_sql("DROP TABLE flights")
+    connection.exec_driver_sql("ALTER TABLE flights_new RENAME TO flights")
+    return True
+
+
+# --- 모델에 선언된 인덱스 중 기존 테이블에 없는 것 생성 ---
+def create_missing_indexes(connection, options: dict):
+    created = False
+    inspector = inspect(connection)
+    for table in models.Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            # 아직 추가되지 않은 컬럼의 인덱스는 그 컬럼을 추가하는 단계에서 만듭니다.
+            if index.name not in existing and {c.name for c in index.columns} <= columns:
+                index.create(connection)
+                created = True
+    return created
+
+
+# --- 0003: 관리자 통계 롤업 테이블 채우기 (비어 있을 때만) ---
+def backfill_rollups(connection, options: dict):
+    has_rollups = connection.execute(
+        select(models.BookingStatusCount.kind).limit(1)
+    ).first()
+    has_bookings = any(
+        connection.execute(select(model.id).limit(1)).first()
+        for model in (models.AccommodationBooking, models.FlightBooking)
+    )
+    if has_rollups or not has_bookings:
+        return False
+    # 가격 컬럼이나 상태 건수 shard 컬럼이 아직 없는 DB 는 0006/0007 단계가 롤업을 계산합니다.
+    if not (_has_booking_price_columns(connection)
+            and _has_status_count_shards(connection)):
+        return False
+    rollups.rebuild(Session(bind=connection))
+    return True
+
+
+# --- 0004: accommodation_bookings.version (낙관적 잠금) 컬럼 추가 ---
+def add_booking_version_column(connection, options: dict):
+    inspector = inspect(connection)
+    if not inspector.has_table("accommodation_bookings"):
+        return False
+    columns = inspector.get_columns("accommodation_bookings")
+    if any(column["name"] == "version" for column in columns):
+        return False
+    connection.exec_driver_sql(
+        "ALTER TABLE accommodation_bookings ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+    )
+    return True
+
+
+# --- 0005: flight_bookings 좌석 재고 컬럼 추가 (재고 테이블은 create_all 이 만듭니다) ---
+FLIGHT_BOOKING_SEAT_COLUMNS = (
+    ("fare_class", "VARCHAR"),
+    ("seat_shard", "INTEGER"),
+    ("hold_expires_at", "TIMESTAMP"),
+)
+
+
+def add_flight_booking_seat_columns(connection, options: dict):
+    inspector = inspect(connection)
+    if not inspector.has_table("flight_bookings"):
+        return False
+    existing = {column["name"] for column in inspector.get_columns("flight_bookings")}
+    missing = [c for c in FLIGHT_BOOKING_SEAT_COLUMNS if c[0] not in existing]
+    for name, column_type in missing:
+        connection.exec_driver_sql(
+            f"ALTER TABLE flight_bookings ADD COLUMN {name} {column_type}"
+        )
+    if not missing:
+        return False
+    create_missing_indexes(connection, options)
+    return True
+
+
+# --- 0006: 예약 시점 가격 컬럼 추가 ---
+# 기존 예약은 예약 당시 가격을 알 수 없으므로 현재 카탈로그 가격으로 채우고, 롤업을 그 값으로 다시 계산합니다.
+BOOKING_PRICE_SOURCES = (
+    ("accommodation_bookings", "accommodations", "accommodation_id"),
+    ("flight_bookings", "flights", "flight_id"),
+)
+
+
+def _has_booking_price_columns(connection) -> bool:
+    inspector = inspect(connection)
+    return all(
+        any(column["name"] == "price" for column in inspector.get_columns(table))
+        for table, _, _ in BOOKING_PRICE_SOURCES
+    )
+
+
+def add_booking_price_columns(connection, options: dict):
+    inspector = inspect(connection)
+    added = False
+    for table, catalog, foreign_key in BOOKING_PRICE_SOURCES:
+        if not inspector.has_table(table):
+            continue
+        if any(column["name"] == "price" for column in inspector.get_columns(table)):
+            continue
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN price INTEGER")
+        added = True
+    if added:
+        fill_booking_prices(connection)
+        if _has_status_count_shards(connection):
+            rollups.rebuild(Session(bind=connection))
+    return added
+
+
+def fill_booking_prices(connection):
+    """가격이 비어 있는 예약을 현재 카탈로그 가격으로 채웁니다. (벤치마크 시드 데이터에도 사용)"""
+    for table, catalog, foreign_key in BOOKING_PRICE_SOURCES:
+        connection.exec_driver_sql(
+            f"UPDATE {table} SET price = "
+            f"(SELECT price FROM {catalog} WHERE {catalog}.id = {table}.{foreign_key}) "
+            "WHERE price IS NULL"
+        )
+
+
+# --- 0007: booking_status_counts 에 shard 기본 키 컬럼 추가 ---
+# 기본 키를 바꿔야 하므로 테이블을 다시 만들고 롤업을 다시 계산합니다. (파생 데이터라 잃을 것이 없습니다)
+def _has_status_count_shards(connection) -> bool:
+    columns = inspect(connection).get_columns(models.BookingStatusCount.__tablename__)
+    return any(column["name"] == "shard" for column in columns)
+
+
+def add_status_count_shards(connection, options: dict):
+    if _has_status_count_shards(connection):
+        return False
+    table = models.BookingStatusCount.__table__
+    table.drop(connection)
+    table.create(connection)
+    rollups.rebuild(Session(bind=connection))
+    return True
+
+
+MIGRATIONS = [
+    ("0001_flight_datetime_columns", convert_flight_times),
+    ("0002_create_missing_indexes", create_missing_indexes),
+    ("0003_backfill_rollups", backfill_rollups),
+    ("0004_booking_version_column", add_booking_version_column),
+    ("0005_flight_seat_inventory", add_flight_booking_seat_columns),
+    ("0006_booking_price_columns", add_booking_price_columns),
+    ("0007_booking_status_count_shards", add_status_count_shards),
+]
+
+
+def upgrade(engine, **options):
+    """모든 마이그레이션을 순서대로 적용하고, 실제로 변경이 일어난 단계 이름을 돌려줍니다."""
+    models.Base.metadata.create_all(bind=engine)
+    applied = []
+    for name, step in MIGRATIONS:
+        with engine.begin() as connection:
+            if step(connection, options):
+                applied.append(name)
+    return applied
@@ -1,6 +1,7 @@
 # models.py (전체 수정 코드)
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Index
+from sqlalchemy import CheckConstraint, ForeignKeyConstraint
 # 👇 sqlalchemy.orm에서 필요한 것들을 명확히 지정해줍니다.
 from sqlalchemy.orm import relationship, declarative_base
 
@@ -24,7 +25,7 @@ class Accommodation(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     location = Column(String)
-    price = Column(Integer)
+    price = Column(Integer, index=True)
     description = Column(String, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"))
 
@@ -37,12 +38,22 @@ class Flight(Base):
     id = Column(Integer, primary_key=True, index=True)
     departure_airport = Column(String, index=True)
     arrival_airport = Column(String, index=True)
-    departure_time = Column(String)
-    arrival_time = Column(String)
+    departure_time = Column(DateTime)
+    arrival_time = Column(DateTime)
     price = Column(Integer)
 
     bookings = relationship("FlightBooking", back_populates="flight")
 
+    # 노선(출발/도착 공항) + 출발 시각 범위 검색을 인덱스 하나로 처리합니다.
+    __table_args__ = (
+        Index(
+            "ix_flights_route_departure",
+            "departure_airport",
+            "arrival_airport",
+            "departure_time",
+        ),
+    )
+
 
 class AccommodationBooking(Base):
     __tablename__ = "accommodation_bookings"
@@ -50,6 +61,11 @@ class AccommodationBooking(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     status = Column(String, default="pending")
+    # 낙관적 잠금용 버전입니다. 상태가 바뀔 때마다 1씩 올라가며, 클라이언트가 읽은 버전과
+    # 다르면 변경을 거부해 동시에 들어온 수정이 서로를 덮어쓰지 않게 합니다.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # 예약 시점의 1박 요금입니다. 숙소 요금이 나중에 바뀌어도 매출 롤업은 이 값으로 더하고 뺍니다.
+    price = Column(Integer, nullable=True)
 
     user_id = Column(Integer, ForeignKey("users.id"))
     accommodation_id = Column(Integer, ForeignKey("accommodations.id"))
@@ -57,15 +73,141 @@ class AccommodationBooking(Base):
     user = relationship("User", back_populates="accommodation_bookings")
     accommodation = relationship("Accommodation", back_populates="bookings")
 
+    # 숙소별 기간 겹침 조회(가용성 확인/예약 충돌 검사)를 인덱스 범위 탐색으로 처리합니다.
+    __table_args__ = (
+        Index(
+            "ix_accommodation_bookings_availability",
+            "accommodation_id",
+            "start_date",
+            "end_date",
+        ),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
 
 class FlightBooking(Base):
     __tablename__ = "flight_bookings"
     id = Column(Integer, primary_key=True, index=True)
     booking_date = Column(Date, nullable=False)
     status = Column(String, default="pending")
+    # 예약 시점의 항공권 가격입니다. (매출 롤업 기준)
+    price = Column(Integer, nullable=True)
 
     user_id = Column(Integer, ForeignKey("users.id"))
     flight_id = Column(Integer, ForeignKey("flights.id"))
+    # 좌석 재고가 설정된 항공편의 예약만 채워집니다. (seats.py)
+    # seat_shard 는 좌석을 꺼낸 재고 행, hold_expires_at 은 결제(확정) 전 좌석 보류 만료 시각입니다.
+    fare_class = Column(String, nullable=True)
+    seat_shard = Column(Integer, nullable=True)
+    hold_expires_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="flight_bookings")
-    flight = relationship("Flight", back_populates="bookings")
\ No newline at end of file
+    flight = relationship("Flight", back_populates="bookings")
+
+    # 만료된 보류를 찾는 스위퍼가 인덱스 범위 탐색으로 읽습니다.
+    __table_args__ = (
+        Index("ix_flight_bookings_hold_expiry", "status", "hold_expires_at"),
+    )
+
+
+# --- 항공편 좌석 재고 ---
+# 좌석 등급별 정원입니다. 판매 가능 좌석 수는 FlightSeatInventory 의 여러 행(shard)에 나눠 담아,
+# 같은 항공편에 예약이 몰려도 서로 다른 행을 줄이게 해 행 잠금 경합을 나눕니다.
+class FlightFare(Base):
+    __tablename__ = "flight_fares"
+    flight_id = Column(Integer, ForeignKey("flights.id"), primary_key=True)
+    fare_class = Column(String, primary_key=True)
+    capacity = Column(Integer, nullable=False)
+
+
+class FlightSeatInventory(Base):
+    __tablename__ = "flight_seat_inventory"
+    flight_id = Column(Integer, primary_key=True)
+    fare_class = Column(String, primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    available = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["flight_id", "fare_class"],
+            ["flight_fares.flight_id", "flight_fares.fare_class"],
+        ),
+        CheckConstraint("available >= 0", name="ck_flight_seat_inventory_available"),
+    )
+
+
+# --- 관리자 통계용 롤업 테이블 ---
+# 예약 생성/상태 변경 트랜잭션 안에서 rollups.py 가 증분(upsert)으로 갱신합니다.
+# 대시보드는 예약 테이블을 훑지 않고 이 테이블들만 읽습니다. (취소된 예약은 포함하지 않습니다)
+class AccommodationDailyStat(Base):
+    __tablename__ = "accommodation_daily_stats"
+    accommodation_id = Column(
+        Integer, ForeignKey("accommodations.id"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    # 이 날 체크인한 예약 수
+    bookings = Column(Integer, nullable=False, default=0)
+    # 이 날 밤에 점유된 객실 수 (예약 1건이 숙박일마다 1씩)
+    nights = Column(Integer, nullable=False, default=0)
+    # 이 날 밤에 해당하는 매출 (1박 요금)
+    revenue = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_accommodation_daily_stats_day", "day"),)
+
+
+class RouteDailyStat(Base):
+    __tablename__ = "route_daily_stats"
+    departure_airport = Column(String, primary_key=True)
+    arrival_airport = Column(String, primary_key=True)
+    # 항공편 출발 날짜
+    day = Column(Date, primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0)
+    revenue = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_route_daily_stats_day", "day"),)
+
+
+class BookingStatusCount(Base):
+    __tablename__ = "booking_status_counts"
+    # "accommodation" 또는 "flight"
+    kind = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    # 모든 예약이 같은 (kind, status) 행을 갱신하며 줄을 서지 않도록 여러 행에 나눠 더합니다.
+    # 한 shard 의 count 는 음수일 수 있고, 조회할 때 shard 를 합칩니다.
+    shard = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# --- 멱등성 키 (Idempotency-Key 헤더) ---
+# 예약 생성 요청의 결과를 사용자별 키로 저장해 두고, 같은 키로 다시 온 요청에는 저장된 응답을 돌려줍니다.
+# 예약 INSERT 와 같은 트랜잭션에서 기록되므로 예약과 키는 함께 커밋되거나 함께 롤백됩니다.
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String, primary_key=True)
+    # 메서드·경로·본문의 해시. 같은 키를 다른 요청에 재사용하면 거절합니다.
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+# --- 아웃박스 (예약 후처리 작업 큐) ---
+# 예약과 같은 트랜잭션에서 기록되는 후처리 이벤트(확인 메일, 영수증, 분석 집계 등)입니다.
+# outbox.py 의 워커가 due 한 행을 가져가 처리하고, 성공하면 지웁니다. 실패하면 available_at 을
+# 뒤로 미뤄 재시도하고, OUTBOX_MAX_ATTEMPTS 번 실패하면 status 를 failed 로 남깁니다.
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    id = Column(Integer, primary_key=True)
+    topic = Column(String, nullable=False)
+    # JSON 문자열
+    payload = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    # 이 시각 이후에 처리합니다. 워커가 가져가면 임대(lease) 만료 시각으로 바뀌어,
+    # 처리 중 프로세스가 죽어도 그 시각이 지나면 다른 워커가 다시 가져갑니다.
+    available_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    __table_args__ = (Index("ix_outbox_events_due", "status", "available_at"),)
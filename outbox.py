@@ -0,0 +1,320 @@
+# backend/outbox.py
+#
+# 예약 후처리(확인 메일, 영수증, 분석 집계 등)를 요청 경로 밖에서 실행하는 프로세스 내 작업 큐입니다.
+# 외부 브로커 없이 DB 의 outbox_events 테이블을 내구성 있는 저장소로 씁니다.
+#
+#   - crud 는 예약 INSERT 와 같은 트랜잭션에서 enqueue() 로 이벤트 행을 추가합니다. 예약이 롤백되면
+#     이벤트도 사라지고, 커밋되면 이벤트도 반드시 남습니다. 요청 경로의 비용은 INSERT 한 번입니다.
+#   - 앱 수명 동안 OUTBOX_WORKERS 개의 워커(pool)가 due 한 이벤트를 OUTBOX_BATCH_SIZE 개씩 가져가
+#     토픽별로 묶어 핸들러에 넘깁니다. 새 이벤트가 커밋되면 바로 깨어나고, 아니면 OUTBOX_POLL_SECONDS 마다 확인합니다.
+#   - 가져갈 때 available_at 을 임대 만료 시각(OUTBOX_LEASE_SECONDS 뒤)으로 바꾸므로, 처리 중 프로세스가
+#     죽어도 그 시각이 지나면 다시 처리됩니다. 그래서 전달은 "최소 한 번"이며 핸들러는 같은 이벤트를
+#     두 번 받아도 괜찮게(이벤트 id 로 중복 제거) 작성해야 합니다.
+#   - 성공한 이벤트는 지웁니다. 핸들러가 예외를 내면 묶음 전체를 지수 백오프(+지터) 뒤에 다시 시도하고,
+#     OUTBOX_MAX_ATTEMPTS 번 실패하면 status=failed 로 남깁니다. (`python manage.py requeue-outbox` 로 재시도)
+#
+# 핸들러 등록:
+#
+#   @outbox.handler(outbox.ACCOMMODATION_BOOKING_CREATED)
+#   async def send_confirmation_mail(events: List[outbox.Event]):
+#       ...
+
+import asyncio
+import json
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, event, func, select, update
+from sqlalchemy.orm import Session
+
+import database
+import models
+from config import settings
+
+ACCOMMODATION_BOOKING_CREATED = "accommodation_booking.created"
+FLIGHT_BOOKING_CREATED = "flight_booking.created"
+
+PENDING = "pending"
+FAILED = "failed"
+# last_error 에 남기는 최대 길이
+MAX_ERROR_LENGTH = 1_000
+
+logger = logging.getLogger("outbox")
+
+
+class Event(NamedTuple):
+    id: int
+    topic: str
+    payload: dict
+    # 이번 시도를 포함한 시도 횟수
+    attempts: int
+
+
+Handler = Callable[[List[Event]], Awaitable[None]]
+handlers: Dict[str, Handler] = {}
+
+
+def handler(topic: str):
+    """토픽의 핸들러로 등록합니다. 핸들러는 같은 토픽의 이벤트 목록을 받는 async 함수입니다."""
+
+    def register(fn: Handler) -> Handler:
+        handlers[topic] = fn
+        return fn
+
+    return register
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# --- 기록 (crud 트랜잭션 안에서 사용) ---
+def enqueue(db: Session, topic: str, payload: BaseModel):
+    """이벤트를 세션에 추가합니다. 커밋은 호출한 crud 함수가 합니다."""
+    now = _utcnow()
+    db.add(
+        models.OutboxEvent(
+            topic=topic,
+            payload=payload.model_dump_json(),
+            status=PENDING,
+            attempts=0,
+            available_at=now,
+            created_at=now,
+        )
+    )
+    db.info["outbox_enqueued"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    if session.info.pop("outbox_enqueued", False):
+        pool.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session):
+    session.info.pop("outbox_enqueued", None)
+
+
+# --- 가져가기 / 결과 기록 (워커가 run_in_write_session 으로 실행) ---
+def claim(db: Session, batch: int, now: Optional[datetime] = None) -> List[Event]:
+    """due 한 이벤트를 최대 batch 개 가져가며 시도 횟수를 올리고 임대 만료 시각을 기록합니다."""
+    outbox_event = models.OutboxEvent
+    now = now or _utcnow()
+    due = (outbox_event.status == PENDING, outbox_event.available_at <= now)
+    # PostgreSQL 에서는 다른 워커가 잡고 있는 행을 건너뜁니다. (SQLite 는 쓰기가 하나뿐이라 필요 없음)
+    candidates = (
+        select(outbox_event.id)
+        .where(*due)
+        .order_by(outbox_event.available_at, outbox_event.id)
+        .limit(batch)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(outbox_event)
+        .where(outbox_event.id.in_(candidates), *due)
+        .values(
+            attempts=outbox_event.attempts + 1,
+            available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+        )
+        .returning(
+            outbox_event.id,
+            outbox_event.topic,
+            outbox_event.payload,
+            outbox_event.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return [
+        Event(row.id, row.topic, json.loads(row.payload), row.attempts)
+        for row in sorted(rows, key=lambda row: row.id)
+    ]
+
+
+def complete(db: Session, ids: List[int]):
+    if ids:
+        db.execute(delete(models.OutboxEvent).where(models.OutboxEvent.id.in_(ids)))
+        db.commit()
+
+
+def retry_delay(attempts: int) -> float:
+    """지수 백오프. 같은 시각에 실패한 이벤트들이 한꺼번에 다시 몰리지 않게 지터를 섞습니다."""
+    delay = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.OUTBOX_RETRY_MAX_SECONDS) * random.uniform(0.5, 1.0)
+
+
+def fail(
+    db: Session, events: Iterable[Event], error: str, now: Optional[datetime] = None
+) -> int:
+    """실패한 이벤트를 백오프 뒤로 미루거나, 시도 횟수를 다 쓴 이벤트는 failed 로 남깁니다.
+
+    failed 로 바뀐 이벤트 수를 돌려줍니다.
+    """
+    now = now or _utcnow()
+    rows = []
+    for item in events:
+        exhausted = item.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+        rows.append(
+            {
+                "b_id": item.id,
+                "b_status": FAILED if exhausted else PENDING,
+                "b_available_at": now
+                + timedelta(seconds=0 if exhausted else retry_delay(item.attempts)),
+            }
+        )
+    if not rows:
+        return 0
+    table = models.OutboxEvent.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            status=bindparam("b_status"),
+            available_at=bindparam("b_available_at"),
+            last_error=error[:MAX_ERROR_LENGTH],
+        ),
+        rows,
+    )
+    db.commit()
+    return sum(1 for row in rows if row["b_status"] == FAILED)
+
+
+def requeue_failed(db: Session, topic: Optional[str] = None) -> int:
+    """failed 이벤트를 시도 횟수를 초기화해 다시 대기열에 넣습니다."""
+    outbox_event = models.OutboxEvent
+    query = update(outbox_event).where(outbox_event.status == FAILED)
+    if topic is not None:
+        query = query.where(outbox_event.topic == topic)
+    result = db.execute(
+        query.values(status=PENDING, attempts=0, available_at=_utcnow())
+    )
+    db.commit()
+    return result.rowcount
+
+
+def counts(db: Session) -> dict:
+    outbox_event = models.OutboxEvent
+    return dict(
+        db.execute(
+            select(outbox_event.status, func.count()).group_by(outbox_event.status)
+        ).all()
+    )
+
+
+# --- 워커 풀 ---
+class WorkerPool:
+    def __init__(self, workers: int, batch_size: int, poll_seconds: float):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """실행 중인 이벤트 루프에서 워커 작업들을 시작합니다. (main.py lifespan)"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"outbox-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def wake(self):
+        """새 이벤트가 커밋되었음을 알립니다. 어느 스레드에서 불러도 됩니다."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._wake.set)
+
+    async def run_once(self) -> int:
+        """이벤트 한 묶음을 가져가 처리하고 가져간 개수를 돌려줍니다."""
+        events = await database.run_in_write_session(claim, self.batch_size)
+        if not events:
+            return 0
+        by_topic = defaultdict(list)
+        for item in events:
+            by_topic[item.topic].append(item)
+        done = []
+        for topic, batch in by_topic.items():
+            fn = handlers.get(topic)
+            try:
+                if fn is None:
+                    raise LookupError(f"등록된 핸들러가 없습니다: {topic}")
+                # 임대 시간 안에 끝내야 다른 워커가 같은 이벤트를 다시 가져가지 않습니다.
+                await asyncio.wait_for(fn(batch), settings.OUTBOX_LEASE_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "outbox %s 이벤트 %d개 처리 실패: %r", topic, len(batch), exc
+                )
+                failed = await database.run_in_write_session(fail, batch, repr(exc))
+                self.failed += failed
+                self.retried += len(batch) - failed
+            else:
+                done.extend(item.id for item in batch)
+        await database.run_in_write_session(complete, done)
+        self.processed += len(done)
+        return len(events)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("outbox 이벤트를 가져오지 못했습니다.")
+                claimed = 0
+            # 한 묶음이 가득 찼으면 밀린 이벤트가 더 있으므로 쉬지 않고 이어서 처리합니다.
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+pool = WorkerPool(
+    workers=settings.OUTBOX_WORKERS,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.OUTBOX_POLL_SECONDS,
+)
+
+
+# --- 기본 핸들러 ---
+# 실제 메일·영수증·분석 연동이 붙을 자리입니다. 지금은 처리 기록만 남깁니다.
+@handler(ACCOMMODATION_BOOKING_CREATED)
+@handler(FLIGHT_BOOKING_CREATED)
+async def log_booking_created(events: List[Event]):
+    for item in events:
+        logger.info(
+            "%s: booking %s (user %s)",
+            item.topic,
+            item.payload.get("id"),
+            item.payload.get("user_id"),
+        )
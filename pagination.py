@@ -0,0 +1,95 @@
+# backend/pagination.py
+#
+# 목록 API 용 키셋(커서) 페이지네이션입니다.
+# OFFSET 은 앞 페이지의 행을 모두 읽고 버리므로 뒤 페이지일수록 느려집니다. 키셋 방식은
+# 마지막으로 본 (정렬 키, id) 다음 행부터 인덱스를 바로 탐색하므로 페이지 깊이와 무관하게 일정합니다.
+# 커서는 정렬 키 이름과 값을 base64 로 감싼 불투명한 문자열이며, 응답의 X-Next-Cursor 헤더로 전달됩니다.
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Mapping, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, values: Sequence) -> str:
+    payload = json.dumps({"s": sort, "v": list(values)}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("잘못된 커서입니다.")
+    if cursor_sort != sort:
+        raise InvalidCursor("커서의 정렬 기준이 요청과 다릅니다.")
+    return values
+
+
+def _coerce(column, value):
+    # JSON 에는 날짜가 문자열로 들어가므로 컬럼 타입에 맞게 되돌려야 드라이버가 바르게 바인딩합니다.
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor("잘못된 커서입니다.")
+
+
+def order_columns(sort_column, id_column):
+    if sort_column is id_column:
+        return (id_column,)
+    return (sort_column, id_column)
+
+
+def apply(query, sort: str, sort_column, id_column, cursor: Optional[str], skip: int):
+    """(정렬 키, id) 순으로 정렬하고, 커서가 있으면 키셋 조건을, 없으면 OFFSET 을 적용합니다."""
+    columns = order_columns(sort_column, id_column)
+    query = query.order_by(*columns)
+    if cursor is None:
+        return query.offset(skip) if skip else query
+
+    values = decode_cursor(cursor, sort)
+    if len(values) != len(columns):
+        raise InvalidCursor("잘못된 커서입니다.")
+    values = [_coerce(column, value) for column, value in zip(columns, values)]
+    if len(columns) == 1:
+        return query.filter(columns[0] > values[0])
+    return query.filter(tuple_(*columns) > tuple_(*values))
+
+
+def next_cursor(items: Sequence, limit: int, sort: str) -> Optional[str]:
+    # 페이지가 가득 찼을 때만 다음 페이지가 있을 수 있습니다.
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    # ORM 객체와 crud.get_*_rows 의 dict 행을 모두 받습니다.
+    if isinstance(last, Mapping):
+        values = [last[sort], last["id"]]
+    else:
+        values = [getattr(last, sort), last.id]
+    return encode_cursor(sort, values[1:] if sort == "id" else values)
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int, sort: str = "id"):
+    cursor = next_cursor(items, limit, sort)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return items
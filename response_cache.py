@@ -0,0 +1,235 @@
+# backend/response_cache.py
+#
+# 공개 카탈로그 조회(숙소/항공편 목록·상세) 응답 캐시입니다.
+# 직렬화까지 끝난 JSON 바이트를 "경로 + 정렬된 쿼리 파라미터 + 태그 버전" 키로 저장하고,
+# 본문 해시로 ETag 를 붙여 If-None-Match 가 일치하면 304 로 응답합니다.
+#
+# 무효화는 태그 버전 방식입니다. 각 응답은 태그(예: "accommodations", "accommodation:3")의
+# 현재 버전을 키에 포함하므로, crud 가 행을 바꾸면서 태그를 invalidate 하면 버전이 올라가
+# 이전 항목은 더 이상 조회되지 않고 TTL 이 지나면 사라집니다.
+# 태그는 crud 트랜잭션 안에서 세션에 모아 두었다가 커밋이 성공한 뒤에만 올립니다. (롤백 시 버림)
+#
+# 백엔드는 RESPONSE_CACHE_URL 로 고릅니다.
+#   - 비워 두면: 프로세스 내 LRU (워커별 캐시이므로 다른 워커의 쓰기는 TTL 안에 반영됩니다)
+#   - redis://...: Redis 호환 서버 (Redis, Valkey 등). 워커끼리 캐시와 버전을 공유합니다.
+#     redis 패키지가 필요합니다. (pip install redis)
+#
+# 목록 API 는 crud.get_*_rows 가 응답 모양으로 만든 dict 를 fill_json() 으로 검증 없이 바로 직렬화합니다.
+# orjson 이 설치되어 있으면 그것을, 없으면 pydantic_core.to_json 을 씁니다. (출력 바이트는 같습니다)
+
+import hashlib
+import threading
+from typing import Iterable, Optional, Sequence
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import cache
+from config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_STATUS_HEADER = "X-Cache"
+# 캐시된 응답과 함께 저장해 다시 내보낼 헤더
+STORED_HEADERS = ("x-next-cursor",)
+
+
+# --- 백엔드 ---
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._entries = cache.TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    async def versions(self, tags: Sequence[str]) -> list:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: dict):
+        self._entries.set(key, entry)
+
+    def bump(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def stats(self) -> dict:
+        return {"backend": self.name, **self._entries.stats()}
+
+
+class RedisBackend:
+    name = "redis"
+    prefix = "response-cache:"
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError(
+                "RESPONSE_CACHE_URL 에 Redis 를 지정하려면 redis 패키지가 필요합니다."
+            )
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # 조회는 이벤트 루프를 막지 않도록 비동기 클라이언트로, 무효화는 커밋 훅(동기)에서
+        # 호출되므로 동기 클라이언트로 보냅니다.
+        self._client = redis.asyncio.Redis.from_url(url)
+        self._sync_client = redis.Redis.from_url(url)
+
+    async def versions(self, tags: Sequence[str]) -> list:
+        values = await self._client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._client.hgetall(self.prefix + key)
+        if not raw:
+            self.misses += 1
+            return None
+        self.hits += 1
+        headers = {
+            name.decode()[len("h:") :]: value.decode()
+            for name, value in raw.items()
+            if name.startswith(b"h:")
+        }
+        return {"body": raw[b"body"], "etag": raw[b"etag"].decode(), "headers": headers}
+
+    async def set(self, key: str, entry: dict):
+        mapping = {"body": entry["body"], "etag": entry["etag"]}
+        mapping.update({f"h:{name}": value for name, value in entry["headers"].items()})
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.prefix + key, mapping=mapping)
+            pipe.expire(self.prefix + key, self.ttl)
+            await pipe.execute()
+
+    def bump(self, tags: Iterable[str]):
+        with self._sync_client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"{self.prefix}tag:{tag}")
+            pipe.execute()
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses}
+
+
+def create_backend(url: Optional[str] = None):
+    url = url if url is not None else settings.RESPONSE_CACHE_URL
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryBackend(
+        maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+    )
+
+
+backend = create_backend()
+
+
+# --- 태그 ---
+def accommodation_tag(accommodation_id: int) -> str:
+    return f"accommodation:{accommodation_id}"
+
+
+ACCOMMODATIONS = "accommodations"
+FLIGHTS = "flights"
+
+
+# --- 무효화 (crud 에서 호출) ---
+def invalidate(db: Session, *tags: str):
+    """커밋이 성공하면 태그 버전을 올리도록 세션에 기록합니다."""
+    db.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        backend.bump(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session):
+    session.info.pop("response_cache_tags", None)
+
+
+# --- 직렬화 ---
+def dump_json(payload) -> bytes:
+    """dict/list/날짜 등 JSON 으로 바로 옮길 수 있는 값을 바이트로 직렬화합니다."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return to_json(payload)
+
+
+# --- 라우터용 ---
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _render(request: Request, entry: dict, status: str) -> Response:
+    headers = {"ETag": entry["etag"], CACHE_STATUS_HEADER: status, **entry["headers"]}
+    if _etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=entry["body"], media_type="application/json", headers=headers
+    )
+
+
+class CacheLookup:
+    def __init__(self, request: Request, key: str, entry: Optional[dict]):
+        self.request = request
+        self.key = key
+        self.entry = entry
+
+    @property
+    def response(self) -> Optional[Response]:
+        if self.entry is None:
+            return None
+        return _render(self.request, self.entry, "HIT")
+
+    async def fill(self, adapter, payload, response: Optional[Response] = None):
+        """payload 를 adapter(TypeAdapter)로 직렬화해 저장하고 응답을 돌려줍니다."""
+        body = adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+        return await self.store(body, response)
+
+    async def fill_json(self, payload, response: Optional[Response] = None):
+        """이미 응답 스키마 모양인 payload 를 검증 없이 직렬화해 저장하고 응답을 돌려줍니다."""
+        return await self.store(dump_json(payload), response)
+
+    async def store(self, body: bytes, response: Optional[Response] = None):
+        headers = {}
+        if response is not None:
+            headers = {
+                name: value
+                for name, value in response.headers.items()
+                if name in STORED_HEADERS
+            }
+        entry = {
+            "body": body,
+            "etag": '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest(),
+            "headers": headers,
+        }
+        await backend.set(self.key, entry)
+        return _render(self.request, entry, "MISS")
+
+
+async def lookup(request: Request, tags: Sequence[str]) -> CacheLookup:
+    versions = await backend.versions(tags)
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    raw_key = "|".join(
+        [request.url.path, query]
+        + [f"{tag}={version}" for tag, version in zip(tags, versions)]
+    )
+    key = hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
+    return CacheLookup(request, key, await backend.get(key))
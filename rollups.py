@@ -0,0 +1,381 @@
+# backend/rollups.py
+#
+# 관리자 통계용 롤업 테이블(models.AccommodationDailyStat, RouteDailyStat, BookingStatusCount) 갱신입니다.
+# 예약을 만들거나 상태를 바꾸는 crud 함수가 같은 트랜잭션 안에서 record_* 를 호출해
+# 해당 일자 행의 카운터를 INSERT ... ON CONFLICT DO UPDATE 로 더하고 뺍니다.
+# 그래서 대시보드 조회 비용은 예약 수가 아니라 조회 기간(일수)에만 비례합니다.
+#
+# 숙소 매출은 숙박일(밤) 기준으로 1박 요금을 나눠 기록하고, 항공 매출은 출발일에 기록합니다.
+# 요금은 카탈로그의 현재 가격이 아니라 예약 행에 저장된 예약 시점 가격(price)을 씁니다.
+# 그래서 요금이 바뀐 뒤 취소되어도 더했던 금액을 그대로 빼고, rebuild() 결과와도 일치합니다.
+# 취소된 예약은 일자별 통계에서 빠지고 상태별 건수에만 남습니다.
+# 상태별 건수는 예약마다 임의의 shard 행에 더해 예약 쓰기가 한 행에 몰리지 않게 하고,
+# 여러 행 UPSERT 는 키 순서로 정렬해 동시에 실행되는 트랜잭션이 같은 순서로 행을 잠그게 합니다.
+# 기존 데이터는 `python manage.py rebuild-rollups` (또는 migrate) 로 다시 계산합니다.
+
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import models
+from config import settings
+
+CANCELLED = "cancelled"
+ACCOMMODATION = "accommodation"
+FLIGHT = "flight"
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# 여러 행 UPSERT 한 문장에 담는 행 수 (SQLite 바인드 변수 개수 제한 안쪽)
+UPSERT_BATCH = 500
+STATUS_KEYS = ("kind", "status", "shard")
+
+
+def upsert_increments(db: Session, model, rows: List[dict], keys: Sequence[str]):
+    """키가 같은 행이 있으면 나머지 열(카운터)을 더하고, 없으면 새로 넣습니다.
+
+    행은 키 순서로 정렬해 UPSERT_BATCH 개씩 씁니다. 입력 순서와 관계없이 항상 같은 순서로
+    행을 잠그므로, 겹치는 행을 갱신하는 두 트랜잭션이 서로를 기다리며 교착되지 않습니다.
+    """
+    rows = sorted(rows, key=lambda row: tuple(row[k] for k in keys))
+    for i in range(0, len(rows), UPSERT_BATCH):
+        _upsert_batch(db, model, rows[i : i + UPSERT_BATCH], keys)
+
+
+def _upsert_batch(db: Session, model, rows: List[dict], keys: Sequence[str]):
+    if not rows:
+        return
+    table = model.__table__
+    dialect_insert = _DIALECT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        # ON CONFLICT 를 지원하지 않는 DB 는 UPDATE 후 없으면 INSERT 합니다.
+        for row in rows:
+            counters = {k: v for k, v in row.items() if k not in keys}
+            result = db.execute(
+                update(table)
+                .where(*[table.c[k] == row[k] for k in keys])
+                .values({k: table.c[k] + v for k, v in counters.items()})
+            )
+            if result.rowcount == 0:
+                db.execute(table.insert().values(row))
+        return
+    stmt = dialect_insert(table).values(rows)
+    counters = [name for name in rows[0] if name not in keys]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+    )
+    db.execute(stmt)
+
+
+# --- 행 계산 ---
+def _nights(start_date: date, end_date: date) -> Iterable[date]:
+    day = start_date
+    while day < end_date:
+        yield day
+        day += timedelta(days=1)
+
+
+def accommodation_stat_rows(
+    accommodation_id: int, start_date: date, end_date: date, price: int, sign: int
+) -> List[dict]:
+    rows: Dict[date, dict] = {}
+    for night in _nights(start_date, end_date):
+        rows[night] = {
+            "accommodation_id": accommodation_id,
+            "day": night,
+            "bookings": 0,
+            "nights": sign,
+            "revenue": sign * (price or 0),
+        }
+    if start_date in rows:
+        rows[start_date]["bookings"] = sign
+    return list(rows.values())
+
+
+def _status_shard() -> int:
+    return random.randrange(max(1, settings.BOOKING_STATUS_SHARDS))
+
+
+def _status_rows(kind: str, totals: Dict[str, int]) -> List[dict]:
+    # 한 번의 변경(예약 1건 또는 일괄 변경 1회)은 shard 하나에 모아 더합니다.
+    shard = _status_shard()
+    return [
+        {"kind": kind, "status": status, "shard": shard, "count": count}
+        for status, count in totals.items()
+        if count
+    ]
+
+
+# --- 쓰기 경로 (crud 에서 호출) ---
+def record_accommodation_booking(
+    db: Session,
+    accommodation_id: int,
+    start_date: date,
+    end_date: date,
+    status: str,
+    price: Optional[int],
+    sign: int = 1,
+):
+    """예약 1건을 롤업에 더합니다. sign=-1 이면 뺍니다. (상태 변경 = 이전 상태 -1, 새 상태 +1)
+
+    price 는 예약 행에 저장된 1박 요금입니다.
+    """
+    upsert_increments(
+        db,
+        models.BookingStatusCount,
+        _status_rows(ACCOMMODATION, {status or "pending": sign}),
+        STATUS_KEYS,
+    )
+    if status == CANCELLED:
+        return
+    upsert_increments(
+        db,
+        models.AccommodationDailyStat,
+        accommodation_stat_rows(accommodation_id, start_date, end_date, price, sign),
+        ("accommodation_id", "day"),
+    )
+
+
+def forget_accommodation(db: Session, accommodation_id: int):
+    """숙소를 지우기 전에 그 숙소의 일자별 통계 행을 지웁니다.
+
+    예약 행은 숙소 없이(accommodation_id NULL) 남으므로 상태별 건수는 그대로 둡니다.
+    rebuild() 도 숙소가 없는 예약은 일자별 통계에 넣지 않습니다.
+    """
+    stat = models.AccommodationDailyStat
+    db.execute(delete(stat).where(stat.accommodation_id == accommodation_id))
+
+
+def record_accommodation_status_changes(db: Session, changes: List[Tuple]):
+    """일괄 상태 변경을 롤업에 반영합니다. changes 는 (예약 행, 이전 상태, 새 상태) 목록이며,
+    예약 행에는 accommodation_id, start_date, end_date, price(예약 시점 1박 요금)가 있어야 합니다.
+
+    건수는 상태별로 합산하고, 일자별 통계는 취소로 빠지는(또는 취소에서 돌아오는) 예약만
+    (숙소, 날짜) 단위로 합쳐 UPSERT 하므로 예약 수천 건도 문장 몇 개로 끝납니다.
+    """
+    status_totals = defaultdict(int)
+    for _, old_status, new_status in changes:
+        status_totals[old_status or "pending"] -= 1
+        status_totals[new_status or "pending"] += 1
+    upsert_increments(
+        db,
+        models.BookingStatusCount,
+        _status_rows(ACCOMMODATION, status_totals),
+        STATUS_KEYS,
+    )
+
+    moved = [
+        (row, -1 if new_status == CANCELLED else 1)
+        for row, old_status, new_status in changes
+        if (old_status == CANCELLED) != (new_status == CANCELLED)
+        and row.accommodation_id is not None
+    ]
+    if not moved:
+        return
+    day_totals = defaultdict(lambda: {"bookings": 0, "nights": 0, "revenue": 0})
+    for row, sign in moved:
+        for stat in accommodation_stat_rows(
+            row.accommodation_id,
+            row.start_date,
+            row.end_date,
+            row.price,
+            sign,
+        ):
+            totals = day_totals[(stat["accommodation_id"], stat["day"])]
+            for name in ("bookings", "nights", "revenue"):
+                totals[name] += stat[name]
+    rows = [
+        {"accommodation_id": accommodation_id, "day": day, **counters}
+        for (accommodation_id, day), counters in day_totals.items()
+    ]
+    upsert_increments(
+        db, models.AccommodationDailyStat, rows, ("accommodation_id", "day")
+    )
+
+
+def record_flight_booking(
+    db: Session, flight_id: int, status: str, price: Optional[int], sign: int = 1
+):
+    """항공권 예약 1건을 롤업에 더합니다. price 는 예약 행에 저장된 가격입니다."""
+    upsert_increments(
+        db,
+        models.BookingStatusCount,
+        _status_rows(FLIGHT, {status or "pending": sign}),
+        STATUS_KEYS,
+    )
+    if status == CANCELLED:
+        return
+    flight = db.execute(
+        select(
+            models.Flight.departure_airport,
+            models.Flight.arrival_airport,
+            models.Flight.departure_time,
+        ).where(models.Flight.id == flight_id)
+    ).first()
+    if flight is None or flight.departure_time is None:
+        return
+    upsert_increments(
+        db,
+        models.RouteDailyStat,
+        [
+            {
+                "departure_airport": flight.departure_airport,
+                "arrival_airport": flight.arrival_airport,
+                "day": flight.departure_time.date(),
+                "bookings": sign,
+                "revenue": sign * (price or 0),
+            }
+        ],
+        ("departure_airport", "arrival_airport", "day"),
+    )
+
+
+def record_flight_status_changes(db: Session, changes: List[Tuple]):
+    """항공권 예약 상태 변경을 롤업에 반영합니다. changes 는 (예약 행, 이전 상태, 새 상태) 목록이며,
+    예약 행에는 flight_id 와 price(예약 시점 가격)가 있어야 합니다.
+
+    숙소와 같이 건수는 상태별로, 노선 통계는 취소로 빠지는(또는 돌아오는) 예약만 (노선, 날짜) 단위로 합칩니다.
+    """
+    if not changes:
+        return
+    status_totals = defaultdict(int)
+    flight_totals = defaultdict(lambda: {"bookings": 0, "revenue": 0})
+    for row, old_status, new_status in changes:
+        status_totals[old_status or "pending"] -= 1
+        status_totals[new_status or "pending"] += 1
+        if (old_status == CANCELLED) != (new_status == CANCELLED):
+            sign = -1 if new_status == CANCELLED else 1
+            flight_totals[row.flight_id]["bookings"] += sign
+            flight_totals[row.flight_id]["revenue"] += sign * (row.price or 0)
+    upsert_increments(
+        db,
+        models.BookingStatusCount,
+        _status_rows(FLIGHT, status_totals),
+        STATUS_KEYS,
+    )
+
+    flight_totals = {
+        flight_id: totals
+        for flight_id, totals in flight_totals.items()
+        if totals["bookings"] or totals["revenue"]
+    }
+    if not flight_totals:
+        return
+    # 항공편에서는 노선과 출발일만 읽습니다. 매출은 예약 행의 가격으로 이미 합쳤습니다.
+    route_totals = defaultdict(lambda: {"bookings": 0, "revenue": 0})
+    for flight in db.execute(
+        select(
+            models.Flight.id,
+            models.Flight.departure_airport,
+            models.Flight.arrival_airport,
+            models.Flight.departure_time,
+        ).where(models.Flight.id.in_(list(flight_totals)))
+    ):
+        if flight.departure_time is None:
+            continue
+        key = (
+            flight.departure_airport,
+            flight.arrival_airport,
+            flight.departure_time.date(),
+        )
+        for name, value in flight_totals[flight.id].items():
+            route_totals[key][name] += value
+    rows = [
+        {"departure_airport": dep, "arrival_airport": arr, "day": day, **counters}
+        for (dep, arr, day), counters in route_totals.items()
+    ]
+    upsert_increments(
+        db,
+        models.RouteDailyStat,
+        rows,
+        ("departure_airport", "arrival_airport", "day"),
+    )
+
+
+# --- 전체 재계산 ---
+REBUILD_BATCH = 5_000
+
+
+def _flush(db: Session, model, totals: dict, keys: Sequence[str]):
+    rows = [{**dict(zip(keys, key)), **counters} for key, counters in totals.items()]
+    for i in range(0, len(rows), REBUILD_BATCH):
+        db.execute(model.__table__.insert(), rows[i : i + REBUILD_BATCH])
+
+
+def rebuild(db: Session) -> dict:
+    """롤업 테이블을 비우고 예약 테이블에서 다시 계산합니다. 호출한 쪽에서 커밋합니다."""
+    for model in (
+        models.AccommodationDailyStat,
+        models.RouteDailyStat,
+        models.BookingStatusCount,
+    ):
+        db.execute(delete(model))
+
+    status_counts = defaultdict(lambda: {"count": 0})
+    accommodation_totals = defaultdict(
+        lambda: {"bookings": 0, "nights": 0, "revenue": 0}
+    )
+    route_totals = defaultdict(lambda: {"bookings": 0, "revenue": 0})
+
+    accommodation_bookings = db.execute(
+        select(
+            models.AccommodationBooking.accommodation_id,
+            models.AccommodationBooking.start_date,
+            models.AccommodationBooking.end_date,
+            models.AccommodationBooking.status,
+            models.AccommodationBooking.price,
+        ).execution_options(yield_per=REBUILD_BATCH)
+    )
+    for row in accommodation_bookings:
+        status_counts[(ACCOMMODATION, row.status or "pending", 0)]["count"] += 1
+        if row.status == CANCELLED or row.accommodation_id is None:
+            continue
+        for stat in accommodation_stat_rows(
+            row.accommodation_id, row.start_date, row.end_date, row.price, 1
+        ):
+            totals = accommodation_totals[(stat["accommodation_id"], stat["day"])]
+            for name in ("bookings", "nights", "revenue"):
+                totals[name] += stat[name]
+
+    flight_bookings = db.execute(
+        select(
+            models.FlightBooking.status,
+            models.Flight.departure_airport,
+            models.Flight.arrival_airport,
+            models.Flight.departure_time,
+            models.FlightBooking.price,
+        )
+        .outerjoin(models.Flight, models.Flight.id == models.FlightBooking.flight_id)
+        .execution_options(yield_per=REBUILD_BATCH)
+    )
+    for row in flight_bookings:
+        status_counts[(FLIGHT, row.status or "pending", 0)]["count"] += 1
+        if row.status == CANCELLED or row.departure_time is None:
+            continue
+        key = (row.departure_airport, row.arrival_airport, row.departure_time.date())
+        route_totals[key]["bookings"] += 1
+        route_totals[key]["revenue"] += row.price or 0
+
+    _flush(db, models.BookingStatusCount, status_counts, STATUS_KEYS)
+    _flush(
+        db,
+        models.AccommodationDailyStat,
+        accommodation_totals,
+        ("accommodation_id", "day"),
+    )
+    _flush(
+        db,
+        models.RouteDailyStat,
+        route_totals,
+        ("departure_airport", "arrival_airport", "day"),
+    )
+    return {
+        "accommodation_days": len(accommodation_totals),
+        "route_days": len(route_totals),
+        "statuses": len(status_counts),
+    }
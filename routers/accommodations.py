@@ -1,12 +1,14 @@
 # backend/routers/accommodations.py
 
-from typing import List, Optional
+from datetime import date
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud, models, schemas, security
-from database import get_db
+import crud_async, pagination, response_cache, schemas, security
+from database import get_async_db, get_async_read_db
 
 # ❌ from ..routers.auth import get_current_user # 👈 이 줄을 삭제합니다.
 
@@ -15,74 +17,203 @@ router = APIRouter(
     tags=["accommodations"],
 )
 
+
+# --- 목록 검색 조건 ---
+def accommodation_search_params(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    check_in: Optional[date] = None,
+    check_out: Optional[date] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    sort: Optional[Literal["id", "price"]] = None,
+) -> dict:
+    if (check_in is None) != (check_out is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="check_in 과 check_out 은 함께 지정해야 합니다.",
+        )
+    if check_in and check_out <= check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="체크아웃 날짜는 체크인 날짜 이후여야 합니다.",
+        )
+    return {
+        "q": q,
+        "location": location,
+        "check_in": check_in,
+        "check_out": check_out,
+        "min_price": min_price,
+        "max_price": max_price,
+        "sort": sort,
+    }
+
+
+# 정렬 기준 없이 텍스트 검색한 결과는 관련도순이라 커서를 만들 수 없습니다. (skip 으로만 이동)
+def set_accommodation_cursor(response: Response, items, limit: int, filters: dict):
+    if filters["sort"] is None and (filters["q"] or filters["location"]):
+        return items
+    return pagination.set_next_cursor(response, items, limit, filters["sort"] or "id")
+
+
+# --- 응답 캐시 직렬화 ---
+# 목록은 crud.get_accommodation_rows 의 dict 를 cached.fill_json 으로 바로 직렬화합니다.
+ACCOMMODATION_DETAIL = TypeAdapter(schemas.Accommodation)
+
+
 # --- API 엔드포인트 ---
 
 
 @router.post("/", response_model=schemas.Accommodation)
-def create_accommodation(
+async def create_accommodation(
     accommodation: schemas.AccommodationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     # ✨ Depends(get_current_user)를 Depends(security.get_current_active_user)로 수정
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    return crud.create_accommodation(
+    return await crud_async.create_accommodation(
         db=db, accommodation=accommodation, user_id=current_user.id
     )
 
 
 @router.get("/", response_model=List[schemas.Accommodation])
-def read_accommodations(
-    location: Optional[str] = None,
+async def read_accommodations(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: dict = Depends(accommodation_search_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    cached = await response_cache.lookup(request, [response_cache.ACCOMMODATIONS])
+    if cached.response is not None:
+        return cached.response
+    accommodations = await crud_async.get_accommodation_rows(
+        db, skip=skip, limit=limit, cursor=cursor, **filters
+    )
+    set_accommodation_cursor(response, accommodations, limit, filters)
+    return await cached.fill_json(accommodations, response)
+
+
+# 예약 목록 없이 숙소 정보만 필요한 화면용 경량 목록 (bookings 로딩 생략)
+@router.get("/summary", response_model=List[schemas.AccommodationSummary])
+async def read_accommodation_summaries(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    filters: dict = Depends(accommodation_search_params),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    accommodations = crud.get_accommodations(
-        db, location=location, skip=skip, limit=limit
+    cached = await response_cache.lookup(request, [response_cache.ACCOMMODATIONS])
+    if cached.response is not None:
+        return cached.response
+    accommodations = await crud_async.get_accommodation_rows(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_bookings=False,
+        **filters,
     )
-    return accommodations
+    set_accommodation_cursor(response, accommodations, limit, filters)
+    return await cached.fill_json(accommodations, response)
 
 
 @router.get("/{accommodation_id}", response_model=schemas.Accommodation)
-def read_accommodation(accommodation_id: int, db: Session = Depends(get_db)):
-    db_accommodation = crud.get_accommodation(db, accommodation_id=accommodation_id)
+async def read_accommodation(
+    request: Request,
+    accommodation_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    cached = await response_cache.lookup(
+        request, [response_cache.accommodation_tag(accommodation_id)]
+    )
+    if cached.response is not None:
+        return cached.response
+    db_accommodation = await crud_async.get_accommodation(
+        db, accommodation_id=accommodation_id
+    )
+    if db_accommodation is None:
+        raise HTTPException(status_code=404, detail="Accommodation not found")
+    return await cached.fill(ACCOMMODATION_DETAIL, db_accommodation)
+
+
+# --- 기간별 예약 가능 여부 조회 ---
+@router.get(
+    "/{accommodation_id}/availability",
+    response_model=schemas.AccommodationAvailability,
+)
+async def read_accommodation_availability(
+    accommodation_id: int,
+    start_date: date = Query(alias="from"),
+    end_date: date = Query(alias="to"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="종료 날짜는 시작 날짜 이후여야 합니다.",
+        )
+    db_accommodation = await crud_async.get_accommodation(
+        db, accommodation_id=accommodation_id, include_bookings=False
+    )
     if db_accommodation is None:
         raise HTTPException(status_code=404, detail="Accommodation not found")
-    return db_accommodation
+
+    conflicts = await crud_async.get_overlapping_bookings(
+        db,
+        accommodation_id=accommodation_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return {
+        "accommodation_id": accommodation_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "available": not conflicts,
+        "conflicts": conflicts,
+    }
 
 
 @router.put("/{accommodation_id}", response_model=schemas.Accommodation)
-def update_accommodation(
+async def update_accommodation(
     accommodation_id: int,
     accommodation: schemas.AccommodationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     # ✨ Depends(get_current_user)를 Depends(security.get_current_active_user)로 수정
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    db_accommodation = crud.get_accommodation(db, accommodation_id=accommodation_id)
+    db_accommodation = await crud_async.get_accommodation(
+        db, accommodation_id=accommodation_id
+    )
     if db_accommodation is None:
         raise HTTPException(status_code=404, detail="Accommodation not found")
     if db_accommodation.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="수정할 권한이 없습니다."
         )
-    return crud.update_accommodation(
+    return await crud_async.update_accommodation(
         db, accommodation_id=accommodation_id, accommodation_update=accommodation
     )
 
 
 @router.delete("/{accommodation_id}", response_model=schemas.Accommodation)
-def delete_accommodation(
+async def delete_accommodation(
     accommodation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     # ✨ Depends(get_current_user)를 Depends(security.get_current_active_user)로 수정
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    db_accommodation = crud.get_accommodation(db, accommodation_id=accommodation_id)
+    db_accommodation = await crud_async.get_accommodation(
+        db, accommodation_id=accommodation_id
+    )
     if db_accommodation is None:
         raise HTTPException(status_code=404, detail="Accommodation not found")
     if db_accommodation.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="삭제할 권한이 없습니다."
         )
-    return crud.delete_accommodation(db, accommodation_id=accommodation_id)
+    return await crud_async.delete_accommodation(db, accommodation_id=accommodation_id)
@@ -1,14 +1,18 @@
 # backend/routers/admin.py (전체 수정 코드)
 
-from typing import List
+from datetime import date, timedelta
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import crud
+import crud_async
+import exports
+import pagination
 import schemas
 import security
-from database import get_db
+from database import get_async_db, get_async_read_db
 
 router = APIRouter(
     prefix="/api/admin",  # 👈 /admin -> /api/admin 으로 변경
@@ -18,12 +22,104 @@ router = APIRouter(
 
 
 @router.get("/users", response_model=List[schemas.User])
-def read_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = crud.get_users(db, skip=skip, limit=limit)
-    return users
+async def read_all_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    users = await crud_async.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    return pagination.set_next_cursor(response, users, limit)
 
 
 @router.get("/bookings", response_model=List[schemas.AccommodationBooking])
-def read_all_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    bookings = crud.get_all_accommodation_bookings(db, skip=skip, limit=limit)
-    return bookings
+async def read_all_bookings(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    bookings = await crud_async.get_all_accommodation_bookings(
+        db, skip=skip, limit=limit, cursor=cursor
+    )
+    return pagination.set_next_cursor(response, bookings, limit)
+
+
+# 여러 예약을 한 번에 확정/취소합니다. 예약별 결과(updated, unchanged, not_found,
+# invalid_transition, version_conflict)를 요청 순서대로 돌려주며, 일부가 실패해도 나머지는 반영됩니다.
+@router.post("/bookings/status", response_model=schemas.BookingStatusUpdateReport)
+async def update_booking_statuses(
+    body: schemas.BookingStatusUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    results = await crud_async.update_accommodation_booking_statuses(
+        db, body.status, body.bookings
+    )
+    updated = sum(1 for result in results if result["result"] == "updated")
+    return {"updated": updated, "results": results}
+
+
+# 전체 예약을 페이지 없이 한 번에 내려받습니다. (from/to 는 체크인 날짜 기준 [from, to))
+@router.get("/bookings/export")
+async def export_bookings(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filters: dict = Depends(exports.booking_export_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return exports.streaming_response(
+        db, crud.accommodation_bookings_export_query(**filters), format, "bookings"
+    )
+
+
+# --- 통계 (롤업 테이블 기반) ---
+# 기간은 [from, to) 이며, 지정하지 않으면 오늘까지 최근 30일입니다.
+def stats_period(
+    start_date: Optional[date] = Query(None, alias="from"),
+    end_date: Optional[date] = Query(None, alias="to"),
+) -> dict:
+    end_date = end_date or date.today() + timedelta(days=1)
+    start_date = start_date or end_date - timedelta(days=30)
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="종료 날짜는 시작 날짜 이후여야 합니다.",
+        )
+    if (end_date - start_date).days > 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="조회 기간은 최대 366일입니다.",
+        )
+    return {"start_date": start_date, "end_date": end_date}
+
+
+@router.get(
+    "/stats/bookings-by-status", response_model=List[schemas.BookingStatusCount]
+)
+async def read_booking_status_counts(db: AsyncSession = Depends(get_async_read_db)):
+    return await crud_async.get_booking_status_counts(db)
+
+
+@router.get("/stats/revenue", response_model=List[schemas.DailyRevenue])
+async def read_daily_revenue(
+    period: dict = Depends(stats_period), db: AsyncSession = Depends(get_async_read_db)
+):
+    return await crud_async.get_daily_revenue(db, **period)
+
+
+@router.get("/stats/occupancy", response_model=List[schemas.AccommodationOccupancy])
+async def read_accommodation_occupancy(
+    limit: int = Query(20, ge=1, le=500),
+    period: dict = Depends(stats_period),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await crud_async.get_accommodation_occupancy(db, limit=limit, **period)
+
+
+@router.get("/stats/routes", response_model=List[schemas.RouteStat])
+async def read_route_stats(
+    limit: int = Query(20, ge=1, le=500),
+    period: dict = Depends(stats_period),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await crud_async.get_route_stats(db, limit=limit, **period)
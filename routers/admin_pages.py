@@ -1,10 +1,13 @@
+from datetime import date, timedelta
+from typing import List, Literal, Optional
+
 from fastapi import APIRouter, Depends, Request, Form, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud, models, security
-from database import get_db
+import crud, crud_async, exports, schemas, security
+from database import get_async_db, get_async_read_db
+from templating import templates
 
 router = APIRouter(
     prefix="/admin",
@@ -12,32 +15,81 @@ router = APIRouter(
     dependencies=[Depends(security.get_current_admin_user_from_cookie)]
 )
 
-templates = Jinja2Templates(directory="backend/templates")
-
 # --- 관리자 대시보드 메인 ---
 @router.get("/dashboard", response_class=HTMLResponse)
-def admin_dashboard(request: Request):
-    return templates.TemplateResponse("admin_base.html", {"request": request})
+async def admin_dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # 예약 테이블 대신 롤업 테이블만 읽으므로 예약 수와 관계없이 빠르게 열립니다.
+    end_date = date.today() + timedelta(days=1)
+    start_date = end_date - timedelta(days=30)
+    return templates.TemplateResponse("admin_dashboard.html", {
+        "request": request,
+        "status_counts": await crud_async.get_booking_status_counts(db),
+        "revenue": await crud_async.get_daily_revenue(db, start_date=start_date, end_date=end_date),
+        "occupancy": await crud_async.get_accommodation_occupancy(db, start_date=start_date, end_date=end_date, limit=10),
+    })
 
 # --- 사용자 관리 페이지 ---
 @router.get("/users", response_class=HTMLResponse)
-def admin_users_page(request: Request, db: Session = Depends(get_db)):
-    users = crud.get_users(db)
+async def admin_users_page(request: Request, db: AsyncSession = Depends(get_async_db)):
+    users = await crud_async.get_users(db)
     return templates.TemplateResponse("admin_users.html", {"request": request, "users": users})
 
 # --- 예약 관리 페이지 ---
 @router.get("/bookings", response_class=HTMLResponse)
-def admin_bookings_page(request: Request, db: Session = Depends(get_db)):
-    bookings = crud.get_all_accommodation_bookings(db)
-    return templates.TemplateResponse("admin_bookings.html", {"request": request, "bookings": bookings})
+async def admin_bookings_page(
+    request: Request,
+    updated: Optional[int] = None,
+    skipped: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    bookings = await crud_async.get_all_accommodation_bookings(db)
+    return templates.TemplateResponse("admin_bookings.html", {
+        "request": request,
+        "bookings": bookings,
+        "updated": updated,
+        "skipped": skipped,
+    })
+
+# --- 예약 내보내기 (CSV/NDJSON 다운로드) ---
+@router.get("/bookings/export")
+async def admin_bookings_export(
+    format: Literal["ndjson", "csv"] = "csv",
+    filters: dict = Depends(exports.booking_export_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return exports.streaming_response(
+        db, crud.accommodation_bookings_export_query(**filters), format, "bookings"
+    )
+
+# --- 예약 상태 변경 (선택한 예약 일괄 / 한 건) ---
+def _redirect_with_results(results: List[dict]):
+    updated = sum(1 for result in results if result["result"] == "updated")
+    return RedirectResponse(
+        url=f"/admin/bookings?updated={updated}&skipped={len(results) - updated}",
+        status_code=status.HTTP_303_SEE_OTHER,
+    )
+
+@router.post("/bookings/update-status")
+async def handle_bulk_update_booking_status(
+    booking_ids: List[int] = Form(default=[]),
+    new_status: Literal["confirmed", "cancelled"] = Form(alias="status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    targets = [schemas.BookingStatusTarget(id=booking_id) for booking_id in booking_ids]
+    if not targets:
+        return RedirectResponse(url="/admin/bookings", status_code=status.HTTP_303_SEE_OTHER)
+    results = await crud_async.update_accommodation_booking_statuses(db, new_status, targets)
+    return _redirect_with_results(results)
 
-# --- ✨ 여기에 새로운 예약 상태 변경 엔드포인트를 추가합니다 ✨ ---
 @router.post("/bookings/{booking_id}/update-status")
-def handle_update_booking_status(
+async def handle_update_booking_status(
     booking_id: int,
-    status: str = Form(),
-    db: Session = Depends(get_db)
+    new_status: str = Form(alias="status"),
+    version: Optional[int] = Form(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    crud.update_accommodation_booking_status(db=db, booking_id=booking_id, status=status)
-    # 상태 변경 후, 다시 예약 관리 페이지로 리다이렉트
-    return RedirectResponse(url="/admin/bookings", status_code=status.HTTP_303_SEE_OTHER)
\ No newline at end of file
+    # 화면을 연 뒤 다른 관리자가 먼저 바꾼 예약이면 version 이 달라 반영되지 않습니다.
+    result = await crud_async.update_accommodation_booking_status(
+        db, booking_id=booking_id, status=new_status, version=version
+    )
+    return _redirect_with_results([result])
@@ -2,9 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+import crud_async
+import schemas
+import security
+from database import get_async_db
 
 router = APIRouter(
     prefix="/api",  # 👈 /token 앞에 /api를 붙이기 위해 prefix를 /api로 설정
@@ -14,9 +17,24 @@ router = APIRouter(
 
 # security.py의 tokenUrl도 수정해야 합니다.
 # 우선 여기서 로그인 API를 정의합니다.
-@router.post("/token")
-def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+@router.post("/token", response_model=schemas.Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    # ... (로그인 로직은 동일)
-    pass
+    user = await crud_async.get_user_by_email(db, email=form_data.username)
+    verified, new_hash = await security.verify_and_update_async(
+        form_data.password, user.hashed_password if user else None
+    )
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="이메일 또는 비밀번호가 올바르지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # 해시 파라미터가 바뀐 경우(예: argon2 비용 상향) 로그인 시점에 새 해시로 교체합니다.
+    if new_hash:
+        await crud_async.update_user_password_hash(
+            db, user_id=user.id, hashed_password=new_hash
+        )
+    return {"access_token": security.create_user_access_token(user)}
@@ -1,16 +1,16 @@
 # backend/routers/bookings.py (전체 수정 코드)
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from pydantic import BaseModel  # 👈 여기에 누락되었던 import를 추가했습니다!
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud
-import models
+import crud_async
+import idempotency
 import schemas
 import security
-from database import get_db
+from database import get_async_db
 
 router = APIRouter(
     prefix="/api/bookings",
@@ -18,42 +18,148 @@ router = APIRouter(
 )
 
 
+# --- Idempotency-Key ---
+# 헤더를 보내면 같은 키의 재시도에는 예약을 새로 만들지 않고 처음 응답(Idempotent-Replayed: true)을 돌려줍니다.
+IdempotencyKeyHeader = Header(
+    default=None, alias=idempotency.HEADER, max_length=idempotency.MAX_KEY_LENGTH
+)
+
+
+async def _stored_response(db: AsyncSession, request: idempotency.IdempotentRequest):
+    stored = await crud_async.get_idempotent_response(db, request)
+    if stored is None:
+        # 같은 키의 요청이 처리 중에 실패해 롤백된 경우입니다.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="같은 Idempotency-Key 의 요청이 처리되지 않았습니다. 다시 시도해 주세요.",
+        )
+    return idempotency.replay(stored)
+
+
 # --- 사용자 기능: 숙소 예약 생성 ---
 @router.post(
     "/accommodations/{accommodation_id}", response_model=schemas.AccommodationBooking
 )
-def book_accommodation(
+async def book_accommodation(
     accommodation_id: int,
     booking: schemas.AccommodationBookingCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    db_accommodation = crud.get_accommodation(db, accommodation_id=accommodation_id)
-    if db_accommodation is None:
-        raise HTTPException(status_code=404, detail="해당 숙소를 찾을 수 없습니다.")
-
-    return crud.create_accommodation_booking(
-        db=db,
-        booking=booking,
-        accommodation_id=accommodation_id,
-        user_id=current_user.id,
+    request = idempotency.request_for(
+        current_user.id,
+        idempotency_key,
+        "POST",
+        f"/api/bookings/accommodations/{accommodation_id}",
+        booking,
     )
+    if request is not None:
+        stored = await crud_async.get_idempotent_response(db, request)
+        if stored is not None:
+            return idempotency.replay(stored)
+
+    # 숙소 확인·겹침 검사·INSERT 가 한 문장이라, 실패했을 때만 원인을 구분하려고 숙소를 조회합니다.
+    try:
+        db_booking = await crud_async.create_accommodation_booking(
+            db=db,
+            booking=booking,
+            accommodation_id=accommodation_id,
+            user_id=current_user.id,
+            idempotent=request,
+        )
+    except idempotency.KeyInUse:
+        return await _stored_response(db, request)
+    if db_booking is None:
+        db_accommodation = await crud_async.get_accommodation(
+            db, accommodation_id=accommodation_id, include_bookings=False
+        )
+        if db_accommodation is None:
+            raise HTTPException(status_code=404, detail="해당 숙소를 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="해당 기간에 이미 예약이 있습니다.",
+        )
+    return db_booking
 
 
 # --- 사용자 기능: 항공권 예약 생성 ---
 @router.post("/flights/{flight_id}", response_model=schemas.FlightBooking)
-def book_flight(
+async def book_flight(
     flight_id: int,
     booking: schemas.FlightBookingCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    db_flight = crud.get_flight(db, flight_id=flight_id)
-    if db_flight is None:
+    request = idempotency.request_for(
+        current_user.id,
+        idempotency_key,
+        "POST",
+        f"/api/bookings/flights/{flight_id}",
+        booking,
+    )
+    if request is not None:
+        stored = await crud_async.get_idempotent_response(db, request)
+        if stored is not None:
+            return idempotency.replay(stored)
+
+    try:
+        db_booking = await crud_async.create_flight_booking(
+            db=db,
+            booking=booking,
+            flight_id=flight_id,
+            user_id=current_user.id,
+            idempotent=request,
+        )
+    except idempotency.KeyInUse:
+        return await _stored_response(db, request)
+    if db_booking is None:
         raise HTTPException(status_code=404, detail="해당 항공권을 찾을 수 없습니다.")
+    return db_booking
+
+
+# --- 사용자 기능: 항공권 예약 확정(결제) / 취소 ---
+# 좌석 재고가 있는 항공편의 예약은 hold_expires_at 까지 확정하지 않으면 자동 취소됩니다.
+FLIGHT_STATUS_ERRORS = {
+    "not_found": (404, "해당 예약을 찾을 수 없습니다."),
+    "invalid_transition": (409, "현재 상태에서는 변경할 수 없는 예약입니다."),
+    "hold_expired": (409, "좌석 보류 시간이 지나 확정할 수 없습니다."),
+    "version_conflict": (409, "다른 요청이 먼저 예약 상태를 변경했습니다."),
+}
+
+
+async def _change_flight_booking_status(
+    db: AsyncSession, booking_id: int, user_id: int, new_status: str
+):
+    result, db_booking = await crud_async.update_flight_booking_status(
+        db, booking_id=booking_id, user_id=user_id, new_status=new_status
+    )
+    if result in FLIGHT_STATUS_ERRORS:
+        status_code, detail = FLIGHT_STATUS_ERRORS[result]
+        raise HTTPException(status_code=status_code, detail=detail)
+    return db_booking
+
 
-    return crud.create_flight_booking(
-        db=db, booking=booking, flight_id=flight_id, user_id=current_user.id
+@router.post("/flights/{booking_id}/confirm", response_model=schemas.FlightBooking)
+async def confirm_flight_booking(
+    booking_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
+):
+    return await _change_flight_booking_status(
+        db, booking_id, current_user.id, "confirmed"
+    )
+
+
+@router.post("/flights/{booking_id}/cancel", response_model=schemas.FlightBooking)
+async def cancel_flight_booking(
+    booking_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
+):
+    return await _change_flight_booking_status(
+        db, booking_id, current_user.id, "cancelled"
     )
 
 
@@ -64,12 +170,27 @@ class MyBookings(BaseModel):
 
 
 @router.get("/my-bookings", response_model=MyBookings)
-def read_my_bookings(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+async def read_my_bookings(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
 ):
-    accommodation_bookings = crud.get_user_accommodation_bookings(
+    accommodation_bookings = await crud_async.get_user_accommodation_bookings(
+        db, user_id=current_user.id
+    )
+    flight_bookings = await crud_async.get_user_flight_bookings(
         db, user_id=current_user.id
     )
-    flight_bookings = crud.get_user_flight_bookings(db, user_id=current_user.id)
     return {"accommodations": accommodation_bookings, "flights": flight_bookings}
+
+
+# --- 사용자 기능: 내 예약 통합 목록 (여행 날짜순) ---
+@router.get("/itinerary", response_model=List[schemas.BookingItineraryItem])
+async def read_my_itinerary(
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_active_user),
+):
+    return await crud_async.get_user_itinerary(
+        db, user_id=current_user.id, skip=skip, limit=limit
+    )
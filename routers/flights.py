@@ -1,11 +1,18 @@
-from typing import List
+from datetime import date, datetime, time, timedelta
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud
+import bulk_import
+import crud_async
+import itinerary
+import pagination
+import response_cache
 import schemas
-from database import get_db  # 👈 중앙화된 get_db를 가져옵니다.
+import security
+from database import get_async_db, get_async_read_db  # 👈 중앙화된 get_db를 가져옵니다.
 
 router = APIRouter(
     prefix="/api/flights",
@@ -15,20 +22,162 @@ router = APIRouter(
 # ❌ 여기에 있던 def get_db(): ... 함수를 삭제합니다.
 
 
+# --- 항공편 검색 조건 ---
+def flight_search_params(
+    origin: Optional[str] = None,
+    destination: Optional[str] = None,
+    departure_from: Optional[datetime] = None,
+    departure_to: Optional[datetime] = None,
+    max_price: Optional[int] = None,
+    sort: Literal["departure_time", "price", "id"] = "departure_time",
+) -> dict:
+    if departure_from and departure_to and departure_to <= departure_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="departure_to 는 departure_from 이후여야 합니다.",
+        )
+    return {
+        "origin": origin,
+        "destination": destination,
+        "departure_from": departure_from,
+        "departure_to": departure_to,
+        "max_price": max_price,
+        "sort": sort,
+    }
+
+
 @router.post("/", response_model=schemas.Flight)
-def create_flight(flight: schemas.FlightCreate, db: Session = Depends(get_db)):
-    return crud.create_flight(db=db, flight=flight)
+async def create_flight(
+    flight: schemas.FlightCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await crud_async.create_flight(db=db, flight=flight)
+
+
+# --- 대량 적재 (관리자) ---
+# 본문을 CSV(헤더 포함) 또는 JSONL 로 그대로 보내면 스트리밍으로 읽으며 청크 단위로 적재합니다.
+#   curl -X POST -H "Content-Type: text/csv" --data-binary @schedule.csv .../api/flights/bulk
+@router.post("/bulk", response_model=schemas.BulkImportReport)
+async def bulk_create_flights(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    chunk_size: int = Query(bulk_import.DEFAULT_CHUNK_SIZE, ge=1, le=50_000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_admin_user),
+):
+    fmt = format or bulk_import.guess_format(None, request.headers.get("content-type"))
+    return await bulk_import.import_flights_async(
+        db, request.stream(), fmt=fmt, chunk_size=chunk_size
+    )
 
 
 @router.get("/", response_model=List[schemas.Flight])
-def read_flights(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    flights = crud.get_flights(db, skip=skip, limit=limit)
-    return flights
+async def read_flights(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: dict = Depends(flight_search_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    cached = await response_cache.lookup(request, [response_cache.FLIGHTS])
+    if cached.response is not None:
+        return cached.response
+    flights = await crud_async.get_flight_rows(
+        db, skip=skip, limit=limit, cursor=cursor, **filters
+    )
+    pagination.set_next_cursor(response, flights, limit, filters["sort"])
+    return await cached.fill_json(flights, response)
+
+
+# 예약 목록 없이 항공편 정보만 필요한 화면용 경량 목록 (bookings 로딩 생략)
+@router.get("/summary", response_model=List[schemas.FlightSummary])
+async def read_flight_summaries(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: dict = Depends(flight_search_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    cached = await response_cache.lookup(request, [response_cache.FLIGHTS])
+    if cached.response is not None:
+        return cached.response
+    flights = await crud_async.get_flight_rows(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_bookings=False,
+        **filters,
+    )
+    pagination.set_next_cursor(response, flights, limit, filters["sort"])
+    return await cached.fill_json(flights, response)
+
+
+# --- 경유 여정 검색 (직항 + 1~2회 경유) ---
+@router.get("/itineraries", response_model=schemas.ItinerarySearchResult)
+async def search_itineraries(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    max_stops: int = Query(2, ge=0, le=2),
+    min_connection_minutes: int = Query(60, ge=0),
+    max_connection_hours: int = Query(6, ge=1, le=24),
+    k: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    graph = await itinerary.ensure_loaded_async(db)
+    earliest = datetime.combine(departure_date, time.min)
+    # 탐색은 순수 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드풀에서 수행합니다.
+    return await run_in_threadpool(
+        graph.search,
+        origin,
+        destination,
+        earliest=earliest,
+        latest=earliest + timedelta(days=1),
+        max_stops=max_stops,
+        min_connection=timedelta(minutes=min_connection_minutes),
+        max_connection=timedelta(hours=max_connection_hours),
+        k=k,
+    )
+
+
+# --- 좌석 재고 ---
+@router.get("/{flight_id}/seats", response_model=List[schemas.FlightSeatAvailability])
+async def read_flight_seats(
+    flight_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """등급별 정원과 남은 좌석 수. 등급을 등록하지 않은 항공편은 빈 목록(좌석 수 제한 없음)입니다."""
+    return await crud_async.get_flight_seat_availability(db, flight_id=flight_id)
+
+
+@router.post(
+    "/{flight_id}/fares",
+    response_model=List[schemas.FlightSeatAvailability],
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_flight_fare(
+    flight_id: int,
+    fare: schemas.FlightFareCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.UserSnapshot = Depends(security.get_current_admin_user),
+):
+    added = await crud_async.add_flight_fare(db, flight_id=flight_id, fare=fare)
+    if added is None:
+        raise HTTPException(status_code=404, detail="Flight not found")
+    if not added:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 등록된 좌석 등급입니다.",
+        )
+    return await crud_async.get_flight_seat_availability(db, flight_id=flight_id)
 
 
 @router.get("/{flight_id}", response_model=schemas.Flight)
-def read_flight(flight_id: int, db: Session = Depends(get_db)):
-    db_flight = crud.get_flight(db, flight_id=flight_id)
+async def read_flight(flight_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    db_flight = await crud_async.get_flight(db, flight_id=flight_id)
     if db_flight is None:
         raise HTTPException(status_code=404, detail="Flight not found")
     return db_flight
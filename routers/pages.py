@@ -1,34 +1,57 @@
 from fastapi import APIRouter, Depends, Request, Form, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud, models, schemas, security
-from database import get_db
+import crud_async, response_cache, schemas, security, templating
+from database import get_async_db, get_async_read_db
+from templating import templates
 
 router = APIRouter(tags=["pages"])
-templates = Jinja2Templates(directory="backend/templates")
+
+# 홈 화면에 보여 줄 추천 숙소 수
+HOME_ACCOMMODATION_LIMIT = 24
 
 
 # ... (home, register, login, logout, create_accommodation 등 기존 코드는 그대로 둡니다) ...
 
+# --- 홈 (추천 숙소) ---
+@router.get("/", response_class=HTMLResponse)
+async def home_page(
+        request: Request,
+        db: AsyncSession = Depends(get_async_read_db),
+        current_user: security.UserSnapshot = Depends(security.get_current_user_from_cookie)
+):
+    # 추천 숙소 목록은 사용자와 무관하므로 렌더링된 조각을 캐시하고, 캐시에 없을 때만 조회합니다.
+    # 숙소가 추가/수정/삭제되면 accommodations 태그 버전이 올라가 새로 렌더링됩니다.
+    fragments = templating.Fragments()
+    accommodations = []
+    if not await fragments.load("home:recommended", response_cache.ACCOMMODATIONS):
+        accommodations = await crud_async.get_accommodation_cards(db, limit=HOME_ACCOMMODATION_LIMIT)
+
+    return templates.TemplateResponse("home.html", {
+        "request": request,
+        "current_user": current_user,
+        "accommodations": accommodations,
+        "fragments": fragments,
+    })
+
 # --- ✨ 여기에 새로운 '내 예약 목록' 페이지 엔드포인트를 추가합니다 ✨ ---
 @router.get("/my-bookings", response_class=HTMLResponse)
-def my_bookings_page(
+async def my_bookings_page(
         request: Request,
-        db: Session = Depends(get_db),
-        current_user: models.User = Depends(security.get_current_user_from_cookie)
+        db: AsyncSession = Depends(get_async_db),
+        current_user: security.UserSnapshot = Depends(security.get_current_user_from_cookie)
 ):
     if not current_user:
         return RedirectResponse(url="/login")
 
-    # 현재 로그인한 유저의 숙소/항공권 예약 목록을 DB에서 가져옵니다.
-    accommodation_bookings = crud.get_user_accommodation_bookings(db, user_id=current_user.id)
-    flight_bookings = crud.get_user_flight_bookings(db, user_id=current_user.id)
+    # 숙소/항공권 예약을 숙소·항공편 정보까지 포함한 평평한 행으로 한 번에 가져옵니다.
+    # (템플릿에서 관계를 따라가며 추가 조회가 일어나지 않습니다)
+    items = await crud_async.get_user_itinerary(db, user_id=current_user.id, limit=None)
 
     return templates.TemplateResponse("my_bookings.html", {
         "request": request,
         "current_user": current_user,
-        "accommodation_bookings": accommodation_bookings,
-        "flight_bookings": flight_bookings
+        "accommodation_bookings": [item for item in items if item.kind == "accommodation"],
+        "flight_bookings": [item for item in items if item.kind == "flight"]
     })
\ No newline at end of file
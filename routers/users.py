@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import crud
+import crud_async
 import schemas
-from database import get_db  # 👈 중앙화된 get_db를 가져옵니다.
+from database import get_async_db  # 👈 중앙화된 get_db를 가져옵니다.
 
 router = APIRouter(
     prefix="/api/users",
@@ -14,8 +14,10 @@ router = APIRouter(
 
 
 @router.post("/", response_model=schemas.User)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
+async def create_user(
+    user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
+):
+    db_user = await crud_async.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
-    return crud.create_user(db=db, user=user)
+    return await crud_async.create_user(db=db, user=user)
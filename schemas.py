@@ -1,9 +1,9 @@
 # backend/schemas.py (전체 수정 코드)
 
-from datetime import date
-from typing import ForwardRef, List
+from datetime import date, datetime
+from typing import ForwardRef, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 # --- Forward References ---
 # 순환 참조를 해결하기 위해 ForwardRef를 사용합니다.
@@ -30,8 +30,8 @@ class AccommodationBase(BaseModel):
 class FlightBase(BaseModel):
     departure_airport: str
     arrival_airport: str
-    departure_time: str
-    arrival_time: str
+    departure_time: datetime
+    arrival_time: datetime
     price: int
 
 
@@ -55,16 +55,48 @@ class AccommodationCreate(AccommodationBase):
     pass
 
 
+class FlightFareCreate(BaseModel):
+    fare_class: str = Field(min_length=1, max_length=32)
+    capacity: int = Field(ge=0)
+
+
 class FlightCreate(FlightBase):
-    pass
+    # 좌석 등급별 정원. 비워 두면 좌석 수 제한 없이 예약됩니다.
+    # flights 테이블의 열이 아니므로 model_dump 에서 빠집니다. (대량 적재는 등급 없이 넣습니다)
+    fares: List[FlightFareCreate] = Field(default=[], exclude=True)
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.arrival_time <= self.departure_time:
+            raise ValueError("도착 시각은 출발 시각 이후여야 합니다.")
+        return self
+
+    @model_validator(mode="after")
+    def check_fares(self):
+        fare_classes = [fare.fare_class for fare in self.fares]
+        if len(fare_classes) != len(set(fare_classes)):
+            raise ValueError("좌석 등급이 중복되었습니다.")
+        return self
+
+
+# 한 번에 예약할 수 있는 최대 숙박일수입니다. 날짜 조건 숙소 검색은 이보다 먼저 시작한 예약을
+# 보지 않는 것으로 인덱스 탐색 범위를 좁히므로, 값을 줄이면 기존의 긴 예약이 검색에서 빠집니다.
+MAX_STAY_NIGHTS = 30
 
 
 class AccommodationBookingCreate(AccommodationBookingBase):
-    pass
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.end_date <= self.start_date:
+            raise ValueError("체크아웃 날짜는 체크인 날짜 이후여야 합니다.")
+        if (self.end_date - self.start_date).days > MAX_STAY_NIGHTS:
+            raise ValueError(f"숙박 기간은 최대 {MAX_STAY_NIGHTS}박입니다.")
+        return self
 
 
 class FlightBookingCreate(FlightBookingBase):
-    pass
+    # 좌석 재고가 있는 항공편에서만 쓰입니다. (없으면 "economy")
+    fare_class: Optional[str] = Field(default=None, max_length=32)
 
 
 # --- Main Schemas for Reading Data ---
@@ -87,6 +119,7 @@ class AccommodationInUser(BaseModel):
 class AccommodationBooking(AccommodationBookingBase):
     id: int
     status: str
+    version: int = 1
     user_id: int
     accommodation_id: int
     model_config = ConfigDict(from_attributes=True)
@@ -97,22 +130,158 @@ class FlightBooking(FlightBookingBase):
     status: str
     user_id: int
     flight_id: int
+    fare_class: Optional[str] = None
+    # 이 시각까지 확정하지 않으면 취소되고 좌석이 풀립니다.
+    hold_expires_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 
-class Accommodation(AccommodationBase):
+class FlightSeatAvailability(BaseModel):
+    fare_class: str
+    capacity: int
+    available: int
+
+
+class AccommodationAvailability(BaseModel):
+    accommodation_id: int
+    start_date: date
+    end_date: date
+    available: bool
+    conflicts: List[AccommodationBooking] = []
+
+
+# 목록 화면용 경량 스키마: 예약 컬렉션을 포함하지 않으므로 bookings 를 로딩하지 않습니다.
+class AccommodationSummary(AccommodationBase):
     id: int
     owner_id: int
     owner: UserInAccommodation
-    bookings: List[AccommodationBooking] = []
     model_config = ConfigDict(from_attributes=True)
 
 
-class Flight(FlightBase):
+class Accommodation(AccommodationSummary):
+    bookings: List[AccommodationBooking] = []
+
+
+class FlightSummary(FlightBase):
     id: int
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Flight(FlightSummary):
     bookings: List[FlightBooking] = []
+
+
+# --- Itinerary (경유 여정) ---
+class Itinerary(BaseModel):
+    legs: List[FlightSummary]
+    total_price: int
+    departure_time: datetime
+    arrival_time: datetime
+    duration_minutes: int
+    stops: int
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ItinerarySearchResult(BaseModel):
+    cheapest: List[Itinerary]
+    fastest: List[Itinerary]
+
+
+# 내 예약 통합 목록의 한 행 (숙소/항공권 예약을 평평하게 합친 형태)
+class BookingItineraryItem(BaseModel):
+    kind: Literal["accommodation", "flight"]
+    booking_id: int
+    status: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    departure_time: Optional[datetime] = None
+    arrival_time: Optional[datetime] = None
+    booking_date: Optional[date] = None
+    accommodation_id: Optional[int] = None
+    accommodation_name: Optional[str] = None
+    location: Optional[str] = None
+    flight_id: Optional[int] = None
+    departure_airport: Optional[str] = None
+    arrival_airport: Optional[str] = None
+    price: Optional[int] = None
+
+
+# --- 관리자 통계 ---
+class BookingStatusCount(BaseModel):
+    kind: str
+    status: str
+    count: int
     model_config = ConfigDict(from_attributes=True)
 
 
+class DailyRevenue(BaseModel):
+    day: date
+    accommodation_bookings: int
+    nights: int
+    accommodation_revenue: int
+    flight_bookings: int
+    flight_revenue: int
+
+
+class AccommodationOccupancy(BaseModel):
+    accommodation_id: int
+    name: Optional[str] = None
+    bookings: int
+    nights: int
+    revenue: int
+    occupancy_rate: float
+
+
+class RouteStat(BaseModel):
+    departure_airport: str
+    arrival_airport: str
+    bookings: int
+    revenue: int
+
+
+# --- 예약 상태 일괄 변경 ---
+class BookingStatusTarget(BaseModel):
+    id: int
+    # 클라이언트가 읽은 버전. 주면 그 사이 다른 변경이 있었을 때 version_conflict 가 됩니다.
+    version: Optional[int] = None
+
+
+class BookingStatusUpdate(BaseModel):
+    status: Literal["confirmed", "cancelled"]
+    bookings: List[BookingStatusTarget] = Field(min_length=1, max_length=10_000)
+
+
+class BookingStatusResult(BaseModel):
+    id: int
+    result: Literal[
+        "updated", "unchanged", "not_found", "invalid_transition", "version_conflict"
+    ]
+    status: Optional[str] = None
+    version: Optional[int] = None
+
+
+class BookingStatusUpdateReport(BaseModel):
+    updated: int
+    results: List[BookingStatusResult]
+
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    inserted: int
+    failed: int
+    seconds: float
+    rows_per_second: float
+    errors: List[BulkImportError]
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+
+
 class User(UserBase):
     id
@@ -0,0 +1,257 @@
+# backend/search.py
+#
+# 숙소 텍스트 검색 백엔드입니다. LIKE '%x%' 는 B-tree 인덱스를 쓸 수 없어 항상 전체 스캔이 되므로,
+# DB 종류에 맞는 전문 검색 인덱스를 사용합니다.
+#   - SQLite(로컬/개발): FTS5 trigram 가상 테이블 accommodations_fts, bm25 로 정렬
+#   - PostgreSQL(운영): pg_trgm GIN 인덱스, 유사도(word_similarity)로 정렬
+# 검색 대상은 name, location, description 입니다.
+# FTS5 테이블은 crud 의 생성/수정/삭제 트랜잭션 안에서 index_accommodation/remove_accommodation
+# 으로 함께 갱신되고, PostgreSQL 인덱스는 DB 가 스스로 유지합니다.
+
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    func,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+
+import models
+
+SEARCH_COLUMNS = ("name", "location", "description")
+
+# trigram 인덱스는 3글자 미만의 검색어를 찾지 못하므로 그보다 짧으면 LIKE 로 대신합니다.
+MIN_TRIGRAM_LENGTH = 3
+
+
+def _terms(query_text: str):
+    return [term for term in query_text.split() if term]
+
+
+class LikeSearchBackend:
+    """인덱스 없이 LIKE 로 찾는 기본 구현입니다. 다른 백엔드의 짧은 검색어 처리에도 쓰입니다."""
+
+    name = "like"
+
+    def install(self, connection):
+        pass
+
+    def apply(
+        self,
+        query,
+        query_text: str,
+        columns: Sequence[str] = SEARCH_COLUMNS,
+        rank: bool = True,
+    ):
+        conditions = [
+            or_(*[getattr(models.Accommodation, col).contains(term) for col in columns])
+            for term in _terms(query_text)
+        ]
+        if not conditions:
+            return query
+        return query.filter(and_(*conditions))
+
+    def index_accommodation(self, db: Session, accommodation: models.Accommodation):
+        pass
+
+    def index_accommodations(self, db: Session, accommodation_ids: Sequence[int]):
+        pass
+
+    def remove_accommodation(self, db: Session, accommodation_id: int):
+        pass
+
+
+class SqliteFtsSearchBackend(LikeSearchBackend):
+    name = "sqlite-fts5"
+    table_name = "accommodations_fts"
+
+    def install(self, connection):
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} "
+            f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='trigram')"
+        )
+        # 인덱스가 비어 있으면(최초 설치) 기존 숙소 데이터로 채웁니다.
+        is_empty = (
+            connection.exec_driver_sql(
+                f"SELECT count(*) FROM {self.table_name}"
+            ).scalar()
+            == 0
+        )
+        if is_empty:
+            self.rebuild(connection)
+
+    def rebuild(self, connection):
+        connection.exec_driver_sql(f"DELETE FROM {self.table_name}")
+        connection.exec_driver_sql(
+            f"INSERT INTO {self.table_name}(rowid, name, location, description) "
+            "SELECT id, coalesce(name, ''), coalesce(location, ''), "
+            "coalesce(description, '') FROM accommodations"
+        )
+
+    def _match_expression(self, query_text: str, columns: Sequence[str]) -> str:
+        # 사용자가 입력한 따옴표나 연산자가 FTS5 문법으로 해석되지 않도록 단어마다 구문으로 감쌉니다.
+        column_filter = "{" + " ".join(columns) + "}"
+        phrases = [
+            '%s : "%s"' % (column_filter, term.replace('"', '""'))
+            for term in _terms(query_text)
+        ]
+        return " AND ".join(phrases)
+
+    def apply(
+        self,
+        query,
+        query_text: str,
+        columns: Sequence[str] = SEARCH_COLUMNS,
+        rank: bool = True,
+    ):
+        terms = _terms(query_text)
+        if not terms:
+            return query
+        if any(len(term) < MIN_TRIGRAM_LENGTH for term in terms):
+            return super().apply(query, query_text, columns, rank)
+
+        matches = (
+            select(
+                literal_column("rowid").label("id"),
+                literal_column("rank").label("rank"),
+            )
+            .select_from(text(self.table_name))
+            .where(
+                text(f"{self.table_name} MATCH :match").bindparams(
+                    match=self._match_expression(query_text, columns)
+                )
+            )
+            .subquery("search_matches")
+        )
+        query = query.join(matches, matches.c.id == models.Accommodation.id)
+        return query.order_by(matches.c.rank) if rank else query
+
+    def index_accommodation(self, db: Session, accommodation: models.Accommodation):
+        self.remove_accommodation(db, accommodation.id)
+        db.execute(
+            text(
+                f"INSERT INTO {self.table_name}(rowid, name, location, description) "
+                "VALUES (:id, :name, :location, :description)"
+            ),
+            {
+                "id": accommodation.id,
+                "name": accommodation.name or "",
+                "location": accommodation.location or "",
+                "description": accommodation.description or "",
+            },
+        )
+
+    def index_accommodations(self, db: Session, accommodation_ids: Sequence[int]):
+        # 대량 적재용: 행마다 INSERT 하지 않고 accommodations 에서 한 번에 복사합니다.
+        if not accommodation_ids:
+            return
+        db.execute(
+            text(f"DELETE FROM {self.table_name} WHERE rowid IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": list(accommodation_ids)},
+        )
+        db.execute(
+            text(
+                f"INSERT INTO {self.table_name}(rowid, name, location, description) "
+                "SELECT id, coalesce(name, ''), coalesce(location, ''), "
+                "coalesce(description, '') FROM accommodations WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(accommodation_ids)},
+        )
+
+    def remove_accommodation(self, db: Session, accommodation_id: int):
+        db.execute(
+            text(f"DELETE FROM {self.table_name} WHERE rowid = :id"),
+            {"id": accommodation_id},
+        )
+
+
+class PostgresTrigramSearchBackend(LikeSearchBackend):
+    name = "postgres-trgm"
+
+    # 인덱스 식과 검색 식이 글자 그대로 같아야 플래너가 GIN 인덱스를 사용하므로 리터럴로 둡니다.
+    DOCUMENT_SQL = (
+        "(coalesce(accommodations.name, '') || ' ' || "
+        "coalesce(accommodations.location, '') || ' ' || "
+        "coalesce(accommodations.description, ''))"
+    )
+
+    def install(self, connection):
+        connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        connection.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_accommodations_search_trgm "
+            f"ON accommodations USING gin ({self.DOCUMENT_SQL} gin_trgm_ops)"
+        )
+        for col in SEARCH_COLUMNS:
+            connection.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_accommodations_{col}_trgm "
+                f"ON accommodations USING gin ({col} gin_trgm_ops)"
+            )
+
+    def _document(self, columns: Sequence[str]):
+        if tuple(columns) == SEARCH_COLUMNS:
+            return literal_column(self.DOCUMENT_SQL)
+        if len(columns) == 1:
+            return getattr(models.Accommodation, columns[0])
+        return func.concat_ws(
+            " ", *[getattr(models.Accommodation, col) for col in columns]
+        )
+
+    def apply(
+        self,
+        query,
+        query_text: str,
+        columns: Sequence[str] = SEARCH_COLUMNS,
+        rank: bool = True,
+    ):
+        terms = _terms(query_text)
+        if not terms:
+            return query
+        document = self._document(columns)
+        query = query.filter(and_(*[document.ilike(f"%{term}%") for term in terms]))
+        if not rank:
+            return query
+        return query.order_by(func.word_similarity(query_text, document).desc())
+
+
+_BACKENDS = {
+    "sqlite": SqliteFtsSearchBackend(),
+    "postgresql": PostgresTrigramSearchBackend(),
+}
+_FALLBACK = LikeSearchBackend()
+
+
+def get_backend(dialect_name: str):
+    return _BACKENDS.get(dialect_name, _FALLBACK)
+
+
+def get_session_backend(db: Session):
+    return get_backend(db.get_bind().dialect.name)
+
+
+def install(engine):
+    """검색 인덱스를 만듭니다. 숙소 테이블이 아직 없으면 아무것도 하지 않습니다."""
+    if not inspect(engine).has_table(models.Accommodation.__tablename__):
+        return
+    with engine.begin() as connection:
+        get_backend(engine.dialect.name).install(connection)
+
+
+def apply(
+    db: Session,
+    query,
+    query_text: Optional[str],
+    columns: Sequence[str] = SEARCH_COLUMNS,
+    rank: bool = True,
+):
+    """검색 조건을 붙입니다. rank=True 면 관련도순 정렬도 함께 붙입니다."""
+    if not query_text:
+        return query
+    return get_session_backend(db).apply(query, query_text, columns, rank)
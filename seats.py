@@ -0,0 +1,224 @@
+# backend/seats.py
+#
+# 항공편 좌석 재고입니다. 좌석 등급(fare_class)별 정원은 flight_fares 에, 남은 좌석 수는
+# flight_seat_inventory 의 여러 행(shard)에 나눠 담습니다.
+#
+#   - 예약은 재고 행 하나를 골라 `UPDATE ... SET available = available - 1 WHERE ... AND available > 0`
+#     한 문장으로 좌석을 꺼냅니다. 조건을 만족하지 못하면 갱신된 행이 없으므로 초과 판매가 생기지 않고,
+#     재고를 먼저 읽고 나중에 쓰는 경쟁 구간도 없습니다. (CHECK available >= 0 은 마지막 방어선)
+#   - 같은 항공편에 예약이 몰려도 shard 를 무작위로 고르므로 PostgreSQL 에서 행 잠금 대기가 나뉩니다.
+#   - 꺼낸 좌석은 결제(확정) 전까지 SEAT_HOLD_MINUTES 동안 보류(pending + hold_expires_at)됩니다.
+#     확정하면 보류가 풀리고, 만료되면 run_sweeper 가 SEAT_HOLD_SWEEP_BATCH 건씩 취소하며 좌석을 돌려놓습니다.
+#   - 재고 행이 없는 항공편(등급을 등록하지 않은 기존 항공편)은 좌석 수 제한 없이 예약됩니다.
+#
+# reserve / release / release_expired_holds 는 crud 트랜잭션 안에서 쓰며 커밋은 호출한 쪽이 합니다.
+# (release_expired_holds 는 스위퍼가 단독으로 부르므로 직접 커밋합니다)
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+import database
+import models
+import response_cache
+import rollups
+from config import settings
+
+DEFAULT_FARE_CLASS = "economy"
+# 고른 shard 를 다른 요청이 먼저 비웠을 때 다시 고르는 횟수
+RESERVE_ATTEMPTS = 3
+
+logger = logging.getLogger("seats")
+
+
+class SeatError(Exception):
+    pass
+
+
+class SoldOut(SeatError):
+    pass
+
+
+class UnknownFareClass(SeatError):
+    pass
+
+
+class Reservation(NamedTuple):
+    fare_class: str
+    shard: int
+    hold_expires_at: datetime
+
+
+def utcnow() -> datetime:
+    # hold_expires_at 은 시간대 없는 UTC 로 저장합니다.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# --- 재고 등록 ---
+def add_fare(db: Session, flight_id: int, fare_class: str, capacity: int):
+    """등급 정원을 등록하고 좌석을 SEAT_INVENTORY_SHARDS 개 행에 고르게 나눠 넣습니다."""
+    shards = max(1, min(settings.SEAT_INVENTORY_SHARDS, capacity))
+    per_shard, extra = divmod(capacity, shards)
+    db.add(
+        models.FlightFare(flight_id=flight_id, fare_class=fare_class, capacity=capacity)
+    )
+    db.flush()
+    db.execute(
+        insert(models.FlightSeatInventory),
+        [
+            {
+                "flight_id": flight_id,
+                "fare_class": fare_class,
+                "shard": shard,
+                "available": per_shard + (1 if shard < extra else 0),
+            }
+            for shard in range(shards)
+        ],
+    )
+
+
+# --- 좌석 꺼내기 / 돌려놓기 ---
+def _remaining(db: Session, flight_id: int) -> dict:
+    inventory = models.FlightSeatInventory
+    return dict(
+        db.execute(
+            select(inventory.fare_class, func.sum(inventory.available))
+            .where(inventory.flight_id == flight_id)
+            .group_by(inventory.fare_class)
+        ).all()
+    )
+
+
+def reserve(db: Session, flight_id: int, fare_class: str) -> Optional[Reservation]:
+    """좌석 하나를 꺼내 보류합니다. 재고를 등록하지 않은 항공편이면 None (좌석 수 제한 없음).
+
+    매진이면 SoldOut, 항공편에 없는 등급이면 UnknownFareClass 입니다.
+    """
+    inventory = models.FlightSeatInventory
+    for _ in range(RESERVE_ATTEMPTS):
+        pick = (
+            select(inventory.shard)
+            .where(
+                inventory.flight_id == flight_id,
+                inventory.fare_class == fare_class,
+                inventory.available > 0,
+            )
+            .order_by(func.random())
+            .limit(1)
+            .scalar_subquery()
+        )
+        shard = db.execute(
+            update(inventory)
+            .where(
+                inventory.flight_id == flight_id,
+                inventory.fare_class == fare_class,
+                inventory.shard == pick,
+                inventory.available > 0,
+            )
+            .values(available=inventory.available - 1)
+            .returning(inventory.shard)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if shard is not None:
+            hold = utcnow() + timedelta(minutes=settings.SEAT_HOLD_MINUTES)
+            return Reservation(fare_class, shard, hold)
+
+        # 실패했을 때만 원인을 구분합니다.
+        remaining = _remaining(db, flight_id)
+        if not remaining:
+            return None
+        if fare_class not in remaining:
+            raise UnknownFareClass(
+                f"이 항공편에는 '{fare_class}' 좌석 등급이 없습니다."
+            )
+        if not remaining[fare_class]:
+            raise SoldOut("해당 좌석 등급이 매진되었습니다.")
+        # 고른 shard 가 그 사이 비었습니다. 남은 shard 에서 다시 고릅니다.
+    raise SoldOut("해당 좌석 등급이 매진되었습니다.")
+
+
+def release(db: Session, seats: Iterable[Tuple[int, Optional[str], Optional[int]]]):
+    """(flight_id, fare_class, shard) 좌석들을 재고에 돌려놓습니다. 같은 행은 합쳐서 한 번만 갱신합니다."""
+    counts = Counter(tuple(seat) for seat in seats if seat[2] is not None)
+    if not counts:
+        return
+    table = models.FlightSeatInventory.__table__
+    db.execute(
+        update(table)
+        .where(
+            table.c.flight_id == bindparam("b_flight_id"),
+            table.c.fare_class == bindparam("b_fare_class"),
+            table.c.shard == bindparam("b_shard"),
+        )
+        .values(available=table.c.available + bindparam("b_count")),
+        [
+            {
+                "b_flight_id": flight_id,
+                "b_fare_class": fare_class,
+                "b_shard": shard,
+                "b_count": count,
+            }
+            for (flight_id, fare_class, shard), count in counts.items()
+        ],
+    )
+
+
+# --- 만료된 보류 정리 ---
+def release_expired_holds(
+    db: Session, now: Optional[datetime] = None, batch: Optional[int] = None
+) -> int:
+    """보류가 만료된 미확정 예약을 최대 batch 건 취소하고 좌석을 돌려놓습니다. 취소한 건수를 돌려줍니다."""
+    booking = models.FlightBooking
+    now = now or utcnow()
+    expired = (booking.status == "pending", booking.hold_expires_at <= now)
+    ids = db.scalars(
+        select(booking.id)
+        .where(*expired)
+        .order_by(booking.hold_expires_at)
+        .limit(batch or settings.SEAT_HOLD_SWEEP_BATCH)
+    ).all()
+    if not ids:
+        return 0
+    # 그 사이 확정·취소된 예약은 조건에서 빠집니다.
+    released: List = db.execute(
+        update(booking)
+        .where(booking.id.in_(ids), *expired)
+        .values(status=rollups.CANCELLED, hold_expires_at=None)
+        .returning(
+            booking.flight_id, booking.fare_class, booking.seat_shard, booking.price
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    release(db, [(row.flight_id, row.fare_class, row.seat_shard) for row in released])
+    rollups.record_flight_status_changes(
+        db, [(row, "pending", rollups.CANCELLED) for row in released]
+    )
+    response_cache.invalidate(db, response_cache.FLIGHTS)
+    db.commit()
+    return len(released)
+
+
+async def sweep_once(batch: Optional[int] = None) -> int:
+    return await database.run_in_write_session(release_expired_holds, batch=batch)
+
+
+async def run_sweeper(interval: Optional[float] = None, batch: Optional[int] = None):
+    """앱 수명 동안 도는 백그라운드 작업입니다. (main.py lifespan)"""
+    interval = interval or settings.SEAT_HOLD_SWEEP_SECONDS
+    batch = batch or settings.SEAT_HOLD_SWEEP_BATCH
+    while True:
+        try:
+            released = await sweep_once(batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("만료된 좌석 보류를 정리하지 못했습니다.")
+            released = 0
+        # 한 배치가 가득 찼으면 밀린 보류가 더 있으므로 쉬지 않고 이어서 처리합니다.
+        if released < batch:
+            await asyncio.sleep(interval)
@@ -1,17 +1,24 @@
 # backend/security.py (전체 수정 코드)
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+import cache
 import crud
 import models
-from database import get_db
+from config import settings
+from database import get_async_db
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
@@ -27,6 +34,82 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+# --- 비밀번호 해싱 전용 워커 풀 ---
+# argon2 는 일부러 CPU·메모리를 많이 쓰도록 설계되어 있어, 공용 스레드풀에서 돌리면 가입/로그인이
+# 몰릴 때 다른 엔드포인트까지 밀립니다. 해싱은 크기가 정해진 전용 풀에서만 수행하고,
+# 대기 중인 작업이 한도를 넘으면 큐에 쌓지 않고 바로 거절(429)합니다.
+# argon2-cffi 는 해싱 중 GIL 을 놓으므로 프로세스 풀 대신 스레드 풀로 충분히 병렬 처리됩니다.
+class HashingOverloaded(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingOverloaded("요청이 많아 잠시 후 다시 시도해 주세요.")
+            self.pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                # 실행 중인 작업을 뺀 나머지가 큐에서 기다리는 작업입니다.
+                "queued": max(self.pending - self.workers, 0),
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(pwd_context.hash, password)
+
+
+async def verify_and_update_async(
+    plain_password: str, hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """비밀번호를 확인하고, 해시 파라미터가 낡았으면 새 해시도 함께 돌려줍니다."""
+    if not hashed_password:
+        # 없는 사용자도 같은 시간이 걸리도록 더미 검증을 수행합니다.
+        await hashing_pool.run(pwd_context.dummy_verify)
+        return False, None
+    return await hashing_pool.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(
@@ -39,23 +122,106 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-def verify_token(token: str, credentials_exception):
+def create_user_access_token(user) -> str:
+    data = {"sub": user.email}
+    if settings.JWT_EMBED_PRINCIPAL:
+        data.update({"uid": user.id, "role": user.role})
+    return create_access_token(data)
+
+
+def decode_token(token: str, credentials_exception) -> dict:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        return email
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+
+def verify_token(token: str, credentials_exception):
+    return decode_token(token, credentials_exception)["sub"]
+
+
+# --- 인증 사용자 캐시 ---
+# 인증이 필요한 모든 요청이 users 를 한 번씩 조회하지 않도록, 토큰 subject(email)별로
+# 가벼운 읽기 전용 스냅샷을 캐시합니다. 라우터는 id/email/role 만 사용하므로 ORM 객체 대신
+# 스냅샷을 돌려줍니다. 사용자 수정/삭제 시 아래 이벤트 리스너가 캐시에서 지우고,
+# 다른 워커 프로세스의 변경이나 ORM 을 거치지 않는 UPDATE 는 TTL 이 지나면 반영됩니다.
+class UserSnapshot(NamedTuple):
+    id: int
+    email: str
+    role: str
+
+
+principal_cache = cache.TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def snapshot_user(user: Optional[models.User]) -> Optional[UserSnapshot]:
+    if user is None:
+        return None
+    return UserSnapshot(id=user.id, email=user.email, role=user.role)
+
+
+def _snapshot_from_claims(payload: dict) -> Optional[UserSnapshot]:
+    if not settings.JWT_EMBED_PRINCIPAL:
+        return None
+    if payload.get("uid") is None or payload.get("role") is None:
+        return None
+    return UserSnapshot(id=payload["uid"], email=payload["sub"], role=payload["role"])
+
+
+async def get_principal(db: AsyncSession, payload: dict) -> Optional[UserSnapshot]:
+    principal = _snapshot_from_claims(payload)
+    if principal is not None:
+        return principal
+    email = payload["sub"]
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = await db.run_sync(crud.get_user_by_email, email=email)
+        principal = snapshot_user(user)
+        # 없는 사용자는 캐시하지 않습니다. (가입 직후 바로 보이도록)
+        if principal is not None:
+            principal_cache.set(email, principal)
+    return principal
+
+
+def _invalidate_principals(target: models.User, *emails):
+    for email in emails:
+        principal_cache.pop(email)
+    # 커밋 전에 다른 요청이 옛 값을 다시 캐시했을 수 있으므로 커밋 후에 한 번 더 지웁니다.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_principals", set()).update(emails)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _on_user_changed(mapper, connection, target):
+    _invalidate_principals(target, target.email)
+
+
+# 이메일이 바뀌면 이전 이메일(= 기존 토큰의 subject)로 캐시된 항목도 지웁니다.
+@event.listens_for(models.User.email, "set", active_history=True)
+def _on_email_changed(target, value, oldvalue, initiator):
+    if isinstance(oldvalue, str) and oldvalue != value:
+        _invalidate_principals(target, oldvalue)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    for email in session.info.pop("invalidated_principals", ()):
+        principal_cache.pop(email)
 
 
 # --- 웹 페이지(쿠키 기반)용 인증 함수 ---
-def get_current_user_from_cookie(
-        request: Request, db: Session = Depends(get_db)
-) -> Optional[models.User]:
+async def get_current_user_from_cookie(
+        request: Request, db: AsyncSession = Depends(get_async_db)
+) -> Optional[UserSnapshot]:
     token = request.cookies.get("access_token")
     if not token:
         return None
@@ -64,35 +230,34 @@ def get_current_user_from_cookie(
         token = token.split("Bearer ")[1]
 
     try:
-        email = verify_token(
+        payload = decode_token(
             token, credentials_exception=HTTPException(status_code=401)
         )
-        user = crud.get_user_by_email(db, email=email)
-        return user
+        return await get_principal(db, payload)
     except HTTPException:
         return None
 
 
 # --- API(헤더 기반)용 인증 함수 ---
-def get_current_active_user(
-        token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> models.User:
+async def get_current_active_user(
+        token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    email = verify_token(token, credentials_exception)
-    user = crud.get_user_by_email(db, email=email)
+    payload = decode_token(token, credentials_exception)
+    user = await get_principal(db, payload)
     if user is None:
         raise credentials_exception
     return user
 
 
 # --- 쿠키 기반 관리자 확인 함수 ---
-def get_current_admin_user_from_cookie(
-        current_user: models.User = Depends(get_current_user_from_cookie),
-) -> models.User:
+async def get_current_admin_user_from_cookie(
+        current_user: UserSnapshot = Depends(get_current_user_from_cookie),
+) -> UserSnapshot:
     if not current_user or current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 없습니다."
@@ -101,9 +266,9 @@ def get_current_admin_user_from_cookie(
 
 
 # --- API 기반 관리자 확인 함수 ---
-def get_current_admin_user(
-        current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
+async def get_current_admin_user(
+        current_user: UserSnapshot = Depends(get_current_active_user),
+) -> UserSnapshot:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 없습니다."
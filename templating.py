@@ -0,0 +1,110 @@
+# backend/templating.py
+#
+# HTML 페이지(routers/pages.py, routers/admin_pages.py)가 함께 쓰는 Jinja2 환경입니다.
+#   - 앱 시작 시 precompile() 로 모든 템플릿을 미리 컴파일해 메모리에 올려 둡니다. 컴파일 결과는
+#     바이트코드 캐시(TEMPLATE_BYTECODE_CACHE_DIR)에도 저장되어, 재시작한 워커는 파싱 없이 읽어 옵니다.
+#   - TEMPLATE_AUTO_RELOAD 가 꺼져 있으면 렌더링마다 템플릿 파일의 변경 여부를 확인하지 않습니다.
+#
+# 조각 캐시: {% cache "이름" %} ... {% endcache %} 로 감싼 부분은 렌더링된 HTML 을 캐시합니다.
+# 라우트가 렌더링 전에 Fragments.load(이름, 태그...) 로 조회하고 "fragments" 로 컨텍스트에 넘깁니다.
+#
+#   fragments = templating.Fragments()
+#   if not await fragments.load("home:recommended", response_cache.ACCOMMODATIONS):
+#       accommodations = await crud_async.get_accommodation_cards(db)   # 캐시에 없을 때만 조회
+#
+# 키에는 response_cache 태그 버전이 들어갑니다. crud 가 숙소를 바꾸며 태그를 무효화하면(커밋 후)
+# 버전이 올라가 다음 요청은 새 키로 다시 렌더링하고, 이전 조각은 TTL 이 지나면 사라집니다.
+
+from typing import Callable, Dict
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+import cache
+import response_cache
+from config import settings
+
+TEMPLATE_DIRECTORY = "backend/templates"
+
+fragment_cache = cache.TTLCache(
+    maxsize=settings.FRAGMENT_CACHE_SIZE, ttl=settings.FRAGMENT_CACHE_TTL_SECONDS
+)
+
+
+# --- 조각 캐시 ---
+class Fragments:
+    """한 번의 렌더링에서 쓰는 조각 캐시 조회 결과입니다."""
+
+    def __init__(self):
+        self._keys: Dict[str, str] = {}
+        self._cached: Dict[str, str] = {}
+
+    async def load(self, name: str, *tags: str) -> bool:
+        """조각의 현재 키를 정하고 캐시를 조회합니다. 캐시에 있으면 True."""
+        versions = await response_cache.backend.versions(tags)
+        key = ":".join([name, *(f"{tag}@{v}" for tag, v in zip(tags, versions))])
+        self._keys[name] = key
+        # 조회 결과를 여기 붙잡아 두므로 렌더링 전에 항목이 만료되어도 빈 조각을 그리지 않습니다.
+        html = fragment_cache.get(key)
+        if html is not None:
+            self._cached[name] = html
+        return html is not None
+
+    def render(self, name: str, caller: Callable[[], str]) -> Markup:
+        html = self._cached.get(name)
+        if html is None:
+            html = str(caller())
+            key = self._keys.get(name)
+            # load() 하지 않은 조각은 캐시하지 않습니다. (키에 데이터 버전이 없음)
+            if key is not None:
+                fragment_cache.set(key, html)
+        return Markup(html)
+
+
+class FragmentCacheExtension(Extension):
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_render_fragment", [nodes.ContextReference(), name])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, context, name, caller):
+        fragments = context.get("fragments")
+        if fragments is None:
+            return caller()
+        return fragments.render(name, caller)
+
+
+# --- 환경 ---
+def create_environment(directory: str = TEMPLATE_DIRECTORY) -> jinja2.Environment:
+    if settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        bytecode_cache = jinja2.FileSystemBytecodeCache(
+            settings.TEMPLATE_BYTECODE_CACHE_DIR
+        )
+    else:
+        bytecode_cache = jinja2.FileSystemBytecodeCache()
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=True,
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+        extensions=[FragmentCacheExtension],
+    )
+
+
+environment = create_environment()
+templates = Jinja2Templates(env=environment)
+
+
+def precompile() -> int:
+    """모든 템플릿을 컴파일해 환경 캐시에 올려 두고 개수를 돌려줍니다."""
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+import pydantic
+import pytest
+
+import crud
+import schemas
+
+
+def test_date_search_excludes_overlapping_long_stay(db):
+    owner = crud.create_user(
+        db,
+        schemas.UserCreate(email="owner@example.com", password="pw"),
+        hashed_password="x",
+    )
+    booked, free = (
+        crud.create_accommodation(
+            db,
+            schemas.AccommodationCreate(name=name, location="서울", price=50_000),
+            user_id=owner.id,
+        )
+        for name in ("booked", "free")
+    )
+    check_in = date(2040, 3, 1)
+    # 검색 기간보다 훨씬 먼저 시작했지만 검색 기간까지 이어지는 최대 길이의 예약
+    start = check_in - timedelta(days=schemas.MAX_STAY_NIGHTS - 1)
+    crud.create_accommodation_booking(
+        db,
+        schemas.AccommodationBookingCreate(
+            start_date=start,
+            end_date=start + timedelta(days=schemas.MAX_STAY_NIGHTS),
+        ),
+        accommodation_id=booked.id,
+        user_id=owner.id,
+    )
+    # 검색 기간 전에 끝나는 예약은 영향을 주지 않습니다.
+    crud.create_accommodation_booking(
+        db,
+        schemas.AccommodationBookingCreate(
+            start_date=check_in - timedelta(days=5), end_date=check_in
+        ),
+        accommodation_id=free.id,
+        user_id=owner.id,
+    )
+
+    for search in (crud.get_accommodations, crud.get_accommodation_rows):
+        found = search(
+            db,
+            check_in=check_in,
+            check_out=check_in + timedelta(days=2),
+            include_bookings=False,
+        )
+        ids = [item.id if hasattr(item, "id") else item["id"] for item in found]
+        assert ids == [free.id]
+
+
+def test_stay_longer_than_limit_is_rejected():
+    with pytest.raises(pydantic.ValidationError):
+        schemas.AccommodationBookingCreate(
+            start_date=date(2040, 1, 1),
+            end_date=date(2040, 1, 1) + timedelta(days=schemas.MAX_STAY_NIGHTS + 1),
+        )
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+
+import crud
+import models
+import schemas
+
+
+def _book_then_reprice(db):
+    owner = crud.create_user(
+        db,
+        schemas.UserCreate(email="guest@example.com", password="pw"),
+        hashed_password="x",
+    )
+    accommodation = crud.create_accommodation(
+        db,
+        schemas.AccommodationCreate(name="stay", location="서울", price=50_000),
+        user_id=owner.id,
+    )
+    booking = crud.create_accommodation_booking(
+        db,
+        schemas.AccommodationBookingCreate(
+            start_date=date(2040, 1, 1), end_date=date(2040, 1, 3)
+        ),
+        accommodation_id=accommodation.id,
+        user_id=owner.id,
+    )
+    crud.update_accommodation(
+        db,
+        accommodation.id,
+        schemas.AccommodationCreate(name="stay", location="서울", price=90_000),
+    )
+    return owner, booking
+
+
+def test_export_uses_price_at_booking_time(db):
+    _, booking = _book_then_reprice(db)
+    rows = db.execute(crud.accommodation_bookings_export_query()).mappings().all()
+    assert [(row["id"], row["price_per_night"]) for row in rows] == [
+        (booking.id, 50_000)
+    ]
+    assert db.get(models.Accommodation, booking.accommodation_id).price == 90_000
+
+
+def test_itinerary_shows_price_at_booking_time(db):
+    owner, booking = _book_then_reprice(db)
+    flight = crud.create_flight(
+        db,
+        schemas.FlightCreate(
+            departure_airport="ICN",
+            arrival_airport="NRT",
+            departure_time=datetime(2040, 1, 3, 10),
+            arrival_time=datetime(2040, 1, 3, 12),
+            price=300_000,
+        ),
+    )
+    crud.create_flight_booking(
+        db,
+        schemas.FlightBookingCreate(booking_date=date(2039, 12, 1)),
+        flight_id=flight.id,
+        user_id=owner.id,
+    )
+    db.get(models.Flight, flight.id).price = 450_000
+    db.commit()
+
+    rows = crud.get_user_itinerary(db, owner.id)
+    assert [(row["kind"], row["price"]) for row in rows] == [
+        ("accommodation", 50_000),
+        ("flight", 300_000),
+    ]
@@ -0,0 +1,39 @@
+import bulk_import
+
+HEADER = "departure_airport,arrival_airport,price\n"
+
+
+def _parse(lines):
+    return list(bulk_import.RecordParser("csv").parse(lines))
+
+
+def test_quoted_newline_stays_in_one_record():
+    records = _parse([HEADER, 'ICN,"N\n', 'RT",100\n', "GMP,CJU,200\n"])
+    assert records == [
+        (2, {"departure_airport": "ICN", "arrival_airport": "N\nRT", "price": "100"}),
+        (4, {"departure_airport": "GMP", "arrival_airport": "CJU", "price": "200"}),
+    ]
+
+
+def test_unclosed_quote_is_reported_without_buffering_the_rest(monkeypatch):
+    monkeypatch.setattr(bulk_import, "MAX_RECORD_LINES", 3)
+    parser = bulk_import.RecordParser("csv")
+    lines = [HEADER, 'ICN,"NRT,100\n'] + [f"GMP,CJU,{i}\n" for i in range(10)]
+    records = []
+    for line in lines:
+        records.extend(parser.feed(line))
+        assert len(parser._partial) <= bulk_import.MAX_RECORD_LINES
+    records.extend(parser.close())
+
+    assert records[0] == (2, "CSV 형식 오류: 따옴표가 닫히지 않았습니다.")
+    assert [line_no for line_no, _ in records[1:]] == list(range(3, 13))
+    assert [record["price"] for _, record in records[1:]] == [str(i) for i in range(10)]
+
+
+def test_unclosed_quote_at_end_of_input():
+    records = _parse([HEADER, "GMP,CJU,1\n", 'ICN,"NRT,100\n', "PUS,KIX,2\n"])
+    assert records == [
+        (2, {"departure_airport": "GMP", "arrival_airport": "CJU", "price": "1"}),
+        (3, "CSV 형식 오류: 따옴표가 닫히지 않았습니다."),
+        (4, {"departure_airport": "PUS", "arrival_airport": "KIX", "price": "2"}),
+    ]
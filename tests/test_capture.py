@@ -0,0 +1,49 @@
+import json
+import time
+
+import capture
+
+
+def test_redacts_nested_json_fields():
+    body = json.dumps(
+        {
+            "email": "a@example.com",
+            "credentials": {"Password": "hunter2", "extra": [{"token": "t"}]},
+        }
+    )
+    redacted = json.loads(capture.redact_body(body, "application/json"))
+    assert redacted == {
+        "email": "a@example.com",
+        "credentials": {"Password": "***", "extra": [{"token": "***"}]},
+    }
+
+
+def test_leaves_bodies_without_sensitive_fields_untouched():
+    body = '{"booking_date": "2025-10-01"}'
+    assert capture.redact_body(body, "application/json") == body
+
+
+def test_record_redacts_query_and_keeps_idempotency_key():
+    middleware = capture.CaptureMiddleware(
+        app=None, writer=None, sample_rate=1.0, max_body_bytes=1024
+    )
+    scope = {
+        "method": "POST",
+        "path": "/api/bookings/flights/3",
+        "query_string": b"access_token=secret&limit=20",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"idempotency-key", b"key-1"),
+        ],
+    }
+    record = middleware._record(
+        scope,
+        time.time(),
+        time.perf_counter(),
+        bytearray(b'{"booking_date": "2025-10-01"}'),
+        False,
+        200,
+    )
+    assert record["query"] == "access_token=***&limit=20"
+    assert record["idempotency_key"] == "key-1"
+    assert "secret" not in json.dumps(record)
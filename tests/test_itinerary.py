@@ -0,0 +1,48 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import itinerary
+import models
+
+
+def test_ensure_loaded_async_rebuilds_graph_off_the_event_loop(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legs.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(models.Base.metadata.create_all)
+            await connection.execute(
+                insert(models.Flight),
+                [
+                    {
+                        "departure_airport": "ICN",
+                        "arrival_airport": "NRT",
+                        "departure_time": datetime(2040, 1, 1, 10),
+                        "arrival_time": datetime(2040, 1, 1, 12),
+                        "price": 100,
+                    }
+                ],
+            )
+
+        graph = itinerary.RouteGraph()
+        loaded_on = []
+        load = graph.load
+
+        def recording_load(legs):
+            loaded_on.append(threading.get_ident())
+            load(legs)
+
+        graph.load = recording_load
+        async with AsyncSession(engine) as db:
+            assert await itinerary.ensure_loaded_async(db, graph) is graph
+            # 방금 적재했으므로 다시 적재하지 않습니다.
+            await itinerary.ensure_loaded_async(db, graph)
+        await engine.dispose()
+        return graph, loaded_on
+
+    graph, loaded_on = asyncio.run(run())
+    assert len(graph) == 1
+    assert len(loaded_on) == 1 and loaded_on[0] != threading.get_ident()
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event, select
+
+import crud
+import models
+import rollups
+import schemas
+
+
+def _rollup_state(db):
+    # 증분 갱신은 카운터가 0 이 된 행을 남기므로 그런 행은 빼고 비교합니다.
+    state = {
+        model.__tablename__: sorted(
+            tuple(row)
+            for row in db.execute(select(*model.__table__.c))
+            if any(row[-2:])
+        )
+        for model in (models.AccommodationDailyStat, models.RouteDailyStat)
+    }
+    # 상태별 건수는 shard 를 합친 값으로 비교합니다.
+    state["booking_status_counts"] = [
+        tuple(row) for row in crud.get_booking_status_counts(db)
+    ]
+    return state
+
+
+def _owner_and_accommodation(db):
+    owner = crud.create_user(
+        db,
+        schemas.UserCreate(email="owner@example.com", password="pw"),
+        hashed_password="x",
+    )
+    accommodation = crud.create_accommodation(
+        db,
+        schemas.AccommodationCreate(name="stay", location="서울", price=50_000),
+        user_id=owner.id,
+    )
+    return owner, accommodation
+
+
+def _book(db, owner, accommodation, start_date: date, nights: int = 2):
+    return crud.create_accommodation_booking(
+        db,
+        schemas.AccommodationBookingCreate(
+            start_date=start_date, end_date=start_date + timedelta(days=nights)
+        ),
+        accommodation_id=accommodation.id,
+        user_id=owner.id,
+    )
+
+
+def test_delete_accommodation_with_bookings(db):
+    owner, accommodation = _owner_and_accommodation(db)
+    booking = _book(db, owner, accommodation, date(2040, 1, 1))
+    assert booking is not None
+
+    assert crud.delete_accommodation(db, accommodation.id) is not None
+    assert db.get(models.Accommodation, accommodation.id) is None
+    assert not db.scalars(select(models.AccommodationDailyStat)).all()
+
+    # 증분으로 갱신한 롤업이 전체 재계산 결과와 같아야 합니다.
+    incremental = _rollup_state(db)
+    rollups.rebuild(db)
+    db.commit()
+    assert _rollup_state(db) == incremental
+
+
+def test_status_counts_sum_over_shards(db, monkeypatch):
+    monkeypatch.setattr(rollups.settings, "BOOKING_STATUS_SHARDS", 4)
+    owner, accommodation = _owner_and_accommodation(db)
+    bookings = [
+        _book(db, owner, accommodation, date(2040, 1, 1) + timedelta(days=3 * i))
+        for i in range(12)
+    ]
+    crud.update_accommodation_booking_statuses(
+        db,
+        "confirmed",
+        [schemas.BookingStatusTarget(id=booking.id) for booking in bookings[:8]],
+    )
+    crud.update_accommodation_booking_statuses(
+        db,
+        "cancelled",
+        [schemas.BookingStatusTarget(id=booking.id) for booking in bookings[4:]],
+    )
+
+    assert [tuple(row) for row in crud.get_booking_status_counts(db)] == [
+        ("accommodation", "cancelled", 8),
+        ("accommodation", "confirmed", 4),
+    ]
+    incremental = _rollup_state(db)
+    rollups.rebuild(db)
+    db.commit()
+    assert _rollup_state(db) == incremental
+
+
+def test_upsert_increments_writes_rows_in_key_order(db):
+    statements = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "route_daily_stats" in statement:
+            statements.append(parameters)
+
+    rows = [
+        {"departure_airport": "PUS", "arrival_airport": "CJU", "day": date(2040, 1, 1)},
+        {"departure_airport": "ICN", "arrival_airport": "NRT", "day": date(2040, 1, 2)},
+        {"departure_airport": "ICN", "arrival_airport": "KIX", "day": date(2040, 1, 3)},
+        {"departure_airport": "ICN", "arrival_airport": "KIX", "day": date(2040, 1, 1)},
+    ]
+    rows = [{**row, "bookings": 1, "revenue": 100} for row in rows]
+    rollups.upsert_increments(
+        db,
+        models.RouteDailyStat,
+        rows,
+        ("departure_airport", "arrival_airport", "day"),
+    )
+
+    # 입력 순서와 관계없이 키 순서로 바인딩되어 항상 같은 순서로 행을 잠급니다.
+    bound = [statements[0][i : i + 5][:3] for i in range(0, 20, 5)]
+    assert bound == sorted(
+        (row["departure_airport"], row["arrival_airport"], row["day"].isoformat())
+        for row in rows
+    )